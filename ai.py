@@ -0,0 +1,402 @@
+"""
+Automatikus játékos.
+
+Minden új elemnél felsorolja az aktuális elem elérhető (forgatás, x)
+elhelyezéseit, mindegyiket leejti egy munkapéldány-játéktéren, és a
+sortörlés utáni állást heurisztikával pontozza (oszlopmagasságok összege,
+lyukak, egyenetlenség, kitörölt sorok). Előretekintéskor a legjobb néhány
+első lépés után a következő elem elhelyezéseit is kipróbálja.
+
+A lépésgenerátor a játéktér saját fits/place/clear_lines műveleteit
+használja, így a szabályok egyetlen helyen, a board.py-ban vannak. A már
+kiértékelt (játéktér hash, alakzat, forgatás, pozíció) elhelyezések
+eredménye transzpozíciós táblába kerül: a következő elemnél az
+előretekintés által már bejárt állások nem számolódnak újra.
+
+Futtatás a projekt gyökeréből (grafikus felület nélkül):
+    python ai.py --games 5 --seed 1
+"""
+import argparse
+import sys
+from time import perf_counter
+
+from config import (GRID_WIDTH, GRID_HEIGHT, AI_WEIGHTS, AI_LOOKAHEAD, AI_BEAM_WIDTH,
+                    AI_TRANSPOSITION_SIZE)
+from engine import TetrisEngine, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_HARD_DROP
+from shapes import COMPILED_SHAPES
+from zobrist import TranspositionTable
+
+# A transzpozíciós táblában ez jelzi a hiányzó bejegyzést (a None érvényes érték)
+MISSING = object()
+
+
+def placements(board, piece):
+    """
+    Az elem elérhető elhelyezései: a jelenlegi helyén forgatva (fal-rúgás
+    nélkül), majd vízszintesen tolva, amíg a játéktér engedi.
+
+    Args:
+        board: A játéktér
+        piece: Az elem a kiinduló pozíciójában
+
+    Returns:
+        list: (forgatás, x) párok
+    """
+    probe = piece.clone()
+    rotations = len(piece.shape)
+    result = []
+    for turn in range(rotations):
+        probe.rotation = (piece.rotation + turn) % rotations
+        probe.x = piece.x
+        if not board.fits(probe):
+            break
+        result.append((probe.rotation, piece.x))
+        for step in (-1, 1):
+            offset = step
+            while board.fits(probe, offset, 0):
+                result.append((probe.rotation, piece.x + offset))
+                offset += step
+    return result
+
+
+def drop_row(board, piece):
+    """
+    Az elem érkezési sora (mint TetrisEngine.landing_row(), gyorsítótár nélkül).
+
+    Args:
+        board: A játéktér
+        piece: Az elem (érvényes pozícióban)
+
+    Returns:
+        int: Az elem y koordinátája érkezéskor
+    """
+    landing = board.landing_row(piece)
+    if landing is not None:
+        return landing
+    distance = 0
+    while board.fits(piece, 0, distance + 1):
+        distance += 1
+    return piece.y + distance
+
+
+def count_cells(board):
+    """
+    A játéktér foglalt celláinak száma.
+
+    Args:
+        board: A játéktér
+
+    Returns:
+        int: A foglalt cellák száma
+    """
+    return sum(bin(board.row_mask(y)).count('1') for y in range(GRID_HEIGHT))
+
+
+def features(board, cells):
+    """
+    A heurisztika jellemzői egy álláshoz.
+
+    Lyuk az az üres cella, amely felett ugyanabban az oszlopban foglalt cella
+    van. Mivel minden foglalt cella az oszlopa teteje alatt van, a lyukak
+    száma az oszlopmagasságok összegének és a foglalt cellák számának
+    különbsége, így a rácsot nem kell bejárni.
+
+    Args:
+        board: A játéktér
+        cells: A foglalt cellák száma
+
+    Returns:
+        tuple: (oszlopmagasságok összege, lyukak száma, egyenetlenség)
+    """
+    heights = board.column_heights
+    height = sum(heights)
+    bumpiness = 0
+    previous = heights[0]
+    for current in heights[1:]:
+        bumpiness += abs(previous - current)
+        previous = current
+    return height, height - cells, bumpiness
+
+
+class AutoPlayer:
+    """
+    Heurisztikus automatikus játékos. A next_action() tickenként egy akciót ad
+    (forgatás, mozgatás, végül azonnali ejtés); új elemnél előbb dönt.
+    """
+    def __init__(self, weights=None, lookahead=AI_LOOKAHEAD, beam_width=AI_BEAM_WIDTH,
+                 table_size=AI_TRANSPOSITION_SIZE):
+        """
+        Args:
+            weights: A heurisztika súlyai (lásd config.AI_WEIGHTS)
+            lookahead: A következő elem elhelyezését is figyelembe vegye-e
+            beam_width: Előretekintéskor ennyi legjobb első lépést vizsgál tovább
+            table_size: A transzpozíciós tábla mérete (0 esetén nincs tábla)
+        """
+        weights = AI_WEIGHTS if weights is None else weights
+        self.height_weight = weights['aggregate_height']
+        self.lines_weight = weights['lines']
+        self.holes_weight = weights['holes']
+        self.bumpiness_weight = weights['bumpiness']
+        self.lookahead = lookahead
+        self.beam_width = beam_width
+        self.table = TranspositionTable(table_size) if table_size else None
+
+        # Munkapéldányok a próbalépésekhez (az első használatkor, a motor háttértárával)
+        self.scratch = None
+
+        # Az éppen végrehajtott terv
+        self.piece = None
+        self.target = None
+        self.budget = 0
+
+        # Statisztika
+        self.evaluated = 0
+        self.decisions = 0
+        self.think_time = 0.0
+        self.worst_decision = 0.0
+
+    def evaluate(self, board, cells, lines):
+        """
+        Egy állás pontszáma.
+
+        Args:
+            board: A játéktér a sortörlés után
+            cells: A játéktér foglalt celláinak száma
+            lines: Az álláshoz vezető lépés(ek)ben kitörölt sorok
+
+        Returns:
+            float: A pontszám (nagyobb a jobb)
+        """
+        height, holes, bumpiness = features(board, cells)
+        return (self.height_weight * height + self.lines_weight * lines
+                + self.holes_weight * holes + self.bumpiness_weight * bumpiness)
+
+    def simulate(self, source, probe, target):
+        """
+        Az elem leejtése és rögzítése a forrás játéktér másolatán.
+
+        Args:
+            source: A kiinduló játéktér (nem változik)
+            probe: Az elem a kívánt forgatással és x pozícióval
+            target: A munkapéldány, amelybe az eredmény kerül
+
+        Returns:
+            int: A kitörölt sorok száma, vagy None ha a rögzítés a játék végét jelentené
+        """
+        probe.y = drop_row(source, probe)
+        target.copy_from(source)
+        self.evaluated += 1
+        if not target.place(probe):
+            return None
+        return target.clear_lines()
+
+    def score_placement(self, board, cells, probe, target):
+        """
+        Egy elhelyezés pontszáma (a transzpozíciós táblából, ha már ismert).
+
+        A pontszám a korábbi lépések sorai nélkül értendő; ezek súlyozva
+        hozzáadhatók, mert a heurisztika a sorok számában lineáris.
+
+        Args:
+            board: A kiinduló játéktér
+            cells: A kiinduló játéktér foglalt celláinak száma
+            probe: Az elem a kívánt forgatással és pozícióval (a kezdősorban)
+            target: A munkapéldány (csak táblahiánykor íródik felül)
+
+        Returns:
+            tuple: (pontszám, kitörölt sorok), vagy None ha az elhelyezés a játék végét jelentené
+        """
+        table = self.table
+        if table is not None:
+            key = (board.hash, probe.shape_index, probe.rotation, probe.x, probe.y)
+            result = table.lookup(key, MISSING)
+            if result is not MISSING:
+                return result
+
+        cleared = self.simulate(board, probe, target)
+        if cleared is None:
+            result = None
+        else:
+            added = len(COMPILED_SHAPES[probe.shape_index][probe.rotation].cells)
+            result = (self.evaluate(target, cells + added - cleared * GRID_WIDTH, cleared), cleared)
+        if table is not None:
+            table.store(key, result)
+        return result
+
+    def best_followup(self, board, cells, piece, lines):
+        """
+        A következő elem legjobb elhelyezésének pontszáma egy álláson.
+
+        Args:
+            board: Az első lépés utáni játéktér
+            cells: A játéktér foglalt celláinak száma
+            piece: A következő elem a kezdőpozíciójában
+            lines: Az első lépésben kitörölt sorok
+
+        Returns:
+            float: A legjobb pontszám, vagy None ha az elem nem helyezhető el
+        """
+        scratch = self.scratch[1]
+        probe = piece.clone()
+        best = None
+        for rotation, x in placements(board, piece):
+            probe.rotation, probe.x, probe.y = rotation, x, piece.y
+            result = self.score_placement(board, cells, probe, scratch)
+            if result is None:
+                continue
+            score = result[0] + self.lines_weight * lines
+            if best is None or score > best:
+                best = score
+        return best
+
+    def choose(self, engine):
+        """
+        A legjobb elhelyezés kiválasztása az aktuális elemhez.
+
+        Args:
+            engine: A játékmotor
+
+        Returns:
+            tuple: (forgatás, x), vagy None ha nincs érvényes elhelyezés
+        """
+        start = perf_counter()
+        if self.scratch is None:
+            self.scratch = (engine.board_class(), engine.board_class())
+        board = engine.board
+        piece = engine.current_piece
+        scratch = self.scratch[0]
+        probe = piece.clone()
+        # A foglalt cellák száma lépésenként számolható: +4 az elem, -10 soronként
+        cells = count_cells(board)
+        added = len(piece.get_cells())
+
+        candidates = []
+        for rotation, x in placements(board, piece):
+            probe.rotation, probe.x, probe.y = rotation, x, piece.y
+            result = self.score_placement(board, cells, probe, scratch)
+            if result is not None:
+                score, cleared = result
+                candidates.append((score, cells + added - cleared * GRID_WIDTH, cleared, rotation, x))
+        candidates.sort(reverse=True)
+
+        best = candidates[0][3:] if candidates else None
+        if self.lookahead and len(candidates) > 1:
+            # A legjobb első lépések újrajátszása, majd a következő elem kipróbálása rajtuk
+            best_score = None
+            for _, after, cleared, rotation, x in candidates[:self.beam_width]:
+                probe.rotation, probe.x, probe.y = rotation, x, piece.y
+                self.simulate(board, probe, scratch)
+                score = self.best_followup(scratch, after, engine.next_piece, cleared)
+                if score is not None and (best_score is None or score > best_score):
+                    best_score = score
+                    best = (rotation, x)
+
+        elapsed = perf_counter() - start
+        self.think_time += elapsed
+        self.worst_decision = max(self.worst_decision, elapsed)
+        self.decisions += 1
+        return best
+
+    def next_action(self, engine):
+        """
+        A következő akció az aktuális elem kiválasztott helyre juttatásához.
+
+        Args:
+            engine: A játékmotor
+
+        Returns:
+            int: Az ACTION_* akció
+        """
+        piece = engine.current_piece
+        if piece is not self.piece:
+            self.piece = piece
+            self.target = self.choose(engine)
+            # Ha egy lépés mégsem sikerül (pl. a gravitáció közbeszól), nem próbálkozunk vég nélkül
+            self.budget = len(piece.shape) + GRID_WIDTH
+
+        self.budget -= 1
+        if self.target is None or self.budget < 0:
+            return ACTION_HARD_DROP
+        rotation, x = self.target
+        if piece.rotation != rotation:
+            return ACTION_ROTATE
+        if piece.x < x:
+            return ACTION_RIGHT
+        if piece.x > x:
+            return ACTION_LEFT
+        return ACTION_HARD_DROP
+
+    def stats(self):
+        """
+        A döntések statisztikája.
+
+        Returns:
+            dict: döntések és kiértékelt elhelyezések száma, elhelyezés/másodperc,
+                  átlagos és leghosszabb döntési idő (ms), a transzpozíciós tábla
+                  találati aránya
+        """
+        table = self.table.stats() if self.table is not None else {}
+        return {
+            'decisions': self.decisions,
+            'placements': self.evaluated,
+            'placements_per_s': self.evaluated / self.think_time if self.think_time else 0.0,
+            'decision_ms': self.think_time / max(self.decisions, 1) * 1000,
+            'worst_decision_ms': self.worst_decision * 1000,
+            'table_entries': table.get('entries', 0),
+            'table_hit_rate': table.get('hit_rate', 0.0),
+        }
+
+
+def play(engine, player, max_pieces=None):
+    """
+    Egy játék lejátszása grafikus felület és gravitáció nélkül.
+
+    Args:
+        engine: A játékmotor (az aktuális állásból indul)
+        player: Az automatikus játékos
+        max_pieces: Legfeljebb ennyi elem (None esetén a játék végéig)
+
+    Returns:
+        TetrisEngine: A motor a játék végén
+    """
+    step = engine.step
+    next_action = player.next_action
+    while not engine.game_over and (max_pieces is None or engine.pieces < max_pieces):
+        step(next_action(engine))
+    return engine
+
+
+def main(argv=None):
+    """
+    Parancssori belépési pont: játékok az automatikus játékossal.
+
+    Returns:
+        int: Kilépési kód
+    """
+    parser = argparse.ArgumentParser(prog='python ai.py', description='Automatikus játékos')
+    parser.add_argument('--games', type=int, default=1, help='a játékok száma')
+    parser.add_argument('--seed', type=int, default=1, help='az első játék kezdőértéke')
+    parser.add_argument('--max-pieces', type=int, default=1000, help='legfeljebb ennyi elem játékonként')
+    parser.add_argument('--no-lookahead', action='store_true', help='a következő elem figyelmen kívül hagyása')
+    parser.add_argument('--table-size', type=int, default=AI_TRANSPOSITION_SIZE,
+                        help='a transzpozíciós tábla mérete (0: nincs tábla)')
+    args = parser.parse_args(argv)
+
+    player = AutoPlayer(lookahead=not args.no_lookahead, table_size=args.table_size)
+    engine = TetrisEngine()
+    for seed in range(args.seed, args.seed + args.games):
+        engine.reset(seed)
+        play(engine, player, args.max_pieces)
+        print(f"seed {seed}: {engine.pieces} elem, {engine.lines_cleared} sor, "
+              f"{engine.score} pont, szint {engine.level}"
+              f"{', vége' if engine.game_over else ''}")
+
+    stats = player.stats()
+    print(f"{stats['placements']} elhelyezés, {stats['placements_per_s']:,.0f} elhelyezés/s, "
+          f"döntés átlag {stats['decision_ms']:.2f} ms, max {stats['worst_decision_ms']:.2f} ms, "
+          f"tábla találat {stats['table_hit_rate']:.1%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Animációs segédeszközök a felhasználói felülethez.
+
+A pulzáló feliratokat nem képkockánként új betűtípussal rendereljük: a
+pulzálás méreteit egész betűméretekre kvantáljuk, méretenként egyszer
+renderelünk (a betűtípusokat a config.get_font tölti be és tartja meg), és
+képkockánként csak a megfelelő kész felületet rajzoljuk ki. A fedőképernyők sötétítő rétege is
+egyetlen, újrahasznált felület.
+"""
+import math
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, get_font
+
+# A fedőképernyők sötétítésének színe (félig átlátszó fekete)
+DIM_COLOR = (0, 0, 0, 180)
+
+# Legfeljebb ennyi pulzáló feliratot tartunk meg (pl. különböző combo értékek)
+MAX_PULSE_TEXTS = 32
+
+
+class PulseText:
+    """
+    Egy pulzáló felirat előre renderelt képkockái.
+
+    A méret base_size * (1 + |sin(t * speed)| * amplitude), egészre kerekítve,
+    így a lehetséges méretek száma kicsi, és mindegyikhez egy kész
+    (szöveg, árnyék) felületpár tartozik.
+    """
+    def __init__(self, text_cache, text, base_size, amplitude, speed, color):
+        """
+        Args:
+            text_cache: A renderelt feliratok gyorsítótára (TextCache)
+            text: A megjelenítendő szöveg
+            base_size: A betűméret nyugalmi állapotban
+            amplitude: A legnagyobb relatív méretnövekedés (pl. 0.1 = 10%)
+            speed: A pulzálás szögsebessége (radián / másodperc)
+            color: A szöveg színe
+        """
+        self.base_size = base_size
+        self.amplitude = amplitude
+        self.speed = speed
+        max_size = int(base_size * (1 + amplitude))
+        self.frames = [text_cache.get(text, get_font(size), color)
+                       for size in range(base_size, max_size + 1)]
+
+    def frame_at(self, now):
+        """
+        Az adott időponthoz tartozó képkocka.
+
+        Args:
+            now: Az idő másodpercben
+
+        Returns:
+            tuple: (szövegfelület, árnyékfelület)
+        """
+        pulse = abs(math.sin(now * self.speed))
+        size = int(self.base_size * (1 + pulse * self.amplitude))
+        return self.frames[size - self.base_size]
+
+    def draw(self, surface, x, y, now):
+        """
+        A felirat kirajzolása árnyékkal, (x, y) középponttal.
+
+        Args:
+            surface: A cél felület
+            x, y: A felirat középpontja
+            now: Az idő másodpercben
+        """
+        text_surface, shadow_surface = self.frame_at(now)
+        x -= text_surface.get_width() // 2
+        y -= text_surface.get_height() // 2
+        surface.blit(shadow_surface, (x + 2, y + 2))
+        surface.blit(text_surface, (x, y))
+
+    def bounds(self, x, y):
+        """
+        Az összes képkockát (árnyékkal együtt) lefedő terület.
+
+        Args:
+            x, y: A felirat középpontja
+
+        Returns:
+            Rect: A felirat által valaha érintett terület
+        """
+        rects = [pygame.Rect(x - surface.get_width() // 2, y - surface.get_height() // 2,
+                             surface.get_width() + 2, surface.get_height() + 2)
+                 for surface, _ in self.frames]
+        return rects[0].unionall(rects[1:])
+
+
+class Animations:
+    """
+    A felület animációinak közös erőforrásai: a pulzáló feliratok és a
+    fedőképernyők sötétítő rétege.
+    """
+    def __init__(self, text_cache):
+        """
+        Args:
+            text_cache: A renderelt feliratok gyorsítótára (TextCache)
+        """
+        self.text_cache = text_cache
+        self.pulse_texts = {}
+        self.dim_surface = None
+
+    def pulse_text(self, text, base_size, amplitude, speed, color):
+        """
+        Egy pulzáló felirat (első kéréskor elkészítve).
+
+        Args:
+            text: A megjelenítendő szöveg
+            base_size: A betűméret nyugalmi állapotban
+            amplitude: A legnagyobb relatív méretnövekedés
+            speed: A pulzálás szögsebessége (radián / másodperc)
+            color: A szöveg színe
+
+        Returns:
+            PulseText: A felirat előre renderelt képkockái
+        """
+        key = (text, base_size, amplitude, speed, color)
+        pulse = self.pulse_texts.get(key)
+        if pulse is None:
+            if len(self.pulse_texts) >= MAX_PULSE_TEXTS:
+                self.pulse_texts.clear()
+            pulse = PulseText(self.text_cache, text, base_size, amplitude, speed, color)
+            self.pulse_texts[key] = pulse
+        return pulse
+
+    def dim_overlay(self):
+        """
+        A teljes képernyős, félig átlátszó sötétítő réteg (egyszer elkészítve).
+
+        Returns:
+            Surface: A sötétítő réteg
+        """
+        if self.dim_surface is None:
+            self.dim_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            self.dim_surface.fill(DIM_COLOR)
+            self.dim_surface = self.dim_surface.convert_alpha()
+        return self.dim_surface
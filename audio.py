@@ -0,0 +1,141 @@
+"""
+Hangeffektek lejátszása.
+
+A mixer kis pufferrel indul (AUDIO_BUFFER minta; a pygame alapértéke 512),
+ehhez a mixer.pre_init()-nek a pygame.init() előtt kell lefutnia. A
+hangfájlok egy háttérszálon töltődnek be; amíg ez nem készül el, a
+lejátszás néma.
+
+Minden hangeseménynek saját, lefoglalt csatornája van: a Channel.play() egy
+még szóló hangot az elejéről újraindít, így a gyorsan ismétlődő mozgáshang
+ugyanazt az egy csatornát használja, és nem foglalja el a többi hang elől
+a csatornákat.
+
+Hang nélküli futáshoz (grafikus felület nélküli mérések, --no-sound, vagy ha
+nincs hangeszköz) a NullAudio ugyanezt a felületet adja; a pygame.init()
+által elindított mixert leállítja, így hangeszközt sem foglal.
+"""
+import threading
+
+import pygame
+from pygame import mixer
+
+from config import (AUDIO_FREQUENCY, AUDIO_BUFFER,
+                    SOUND_ROTATE, SOUND_CLEAR, SOUND_FALL, SOUND_GAME_OVER, SOUND_MOVE,
+                    VOLUME_ROTATE, VOLUME_CLEAR, VOLUME_FALL, VOLUME_GAME_OVER, VOLUME_MOVE)
+
+# Hangesemények: név -> (fájl, hangerő); mindegyik saját csatornát kap
+SOUNDS = {
+    'move': (SOUND_MOVE, VOLUME_MOVE),
+    'rotate': (SOUND_ROTATE, VOLUME_ROTATE),
+    'clear': (SOUND_CLEAR, VOLUME_CLEAR),
+    'fall': (SOUND_FALL, VOLUME_FALL),
+    'game_over': (SOUND_GAME_OVER, VOLUME_GAME_OVER),
+}
+
+
+class NullAudio:
+    """Néma háttértár: a MixerAudio felülete, mixer nélkül."""
+    def start(self):
+        if mixer.get_init():
+            mixer.quit()
+
+    def play(self, name):
+        pass
+
+    def wait_loaded(self, timeout=None):
+        return True
+
+
+class MixerAudio:
+    """
+    Hangeffektek a pygame mixerrel: kis puffer, háttérbetöltés és
+    hangeseményenként lefoglalt csatorna.
+    """
+    def __init__(self, frequency=AUDIO_FREQUENCY, buffer=AUDIO_BUFFER):
+        """
+        A mixer paramétereinek beállítása (a pygame.init() előtt kell létrehozni).
+
+        Args:
+            frequency: Mintavételi frekvencia (Hz)
+            buffer: A mixer pufferének mérete mintákban (kisebb: kisebb késleltetés)
+        """
+        mixer.pre_init(frequency, -16, 2, buffer)
+        self.channels = {}
+        self.sounds = {}
+        self.loader = None
+
+    def start(self):
+        """
+        A mixer indítása, a csatornák lefoglalása és a hangok háttérbetöltésének
+        elindítása. Ha nincs hangeszköz, a lejátszás néma marad.
+        """
+        try:
+            if not mixer.get_init():
+                mixer.init()
+        except pygame.error as e:
+            print(f"A hang nem indítható ({e}). Folytatás hang nélkül.")
+            return
+
+        # Az első csatornák az eseményeké; a mixer szabad csatornát kereső Sound.play()-e ezeket nem használja
+        mixer.set_num_channels(max(mixer.get_num_channels(), len(SOUNDS)))
+        mixer.set_reserved(len(SOUNDS))
+        self.channels = {name: mixer.Channel(i) for i, name in enumerate(SOUNDS)}
+
+        self.loader = threading.Thread(target=self.load_sounds, daemon=True)
+        self.loader.start()
+
+    def load_sounds(self):
+        """Hangok betöltése és beállítása (a háttérszálon fut)."""
+        sounds = {}
+        try:
+            for name, (path, volume) in SOUNDS.items():
+                sound = mixer.Sound(path)
+                sound.set_volume(volume)
+                sounds[name] = sound
+        except Exception:
+            # Ha nem sikerül a betöltés, a hangok némák maradnak
+            print("Nem sikerült a hangfájlokat betölteni. Folytatás hang nélkül.")
+            return
+        # Egyetlen hozzárendelés: a főszál vagy mind, vagy egyik hangot sem látja
+        self.sounds = sounds
+
+    def wait_loaded(self, timeout=None):
+        """
+        Várakozás a háttérbetöltés végéig.
+
+        Args:
+            timeout: Legfeljebb ennyi másodperc (None: korlát nélkül)
+
+        Returns:
+            bool: True ha a betöltés befejeződött (vagy el sem indult)
+        """
+        if self.loader is None:
+            return True
+        self.loader.join(timeout)
+        return not self.loader.is_alive()
+
+    def play(self, name):
+        """
+        Egy hangesemény lejátszása a saját csatornáján (a még szóló
+        ugyanilyen hangot újraindítja).
+
+        Args:
+            name: A hangesemény neve (lásd SOUNDS)
+        """
+        sound = self.sounds.get(name)
+        if sound is not None:
+            self.channels[name].play(sound)
+
+
+def create_audio(enabled=True):
+    """
+    A hang háttértárának létrehozása (a pygame.init() előtt kell hívni).
+
+    Args:
+        enabled: False esetén néma háttértár (mixer nélkül)
+
+    Returns:
+        MixerAudio vagy NullAudio
+    """
+    return MixerAudio() if enabled else NullAudio()
@@ -0,0 +1,455 @@
+"""
+Sok független játék léptetése egyszerre NumPy tömbökkel (önjátékhoz,
+heurisztikák hangolásához).
+
+A játékterek egy (N, sorok) alakú uint16 tömbben vannak, soronként egy
+10 bites maszkkal, mint a BitBoard-ban. Egy lépés minden még futó játékban
+egy elhelyezés: az aktuális elem a megadott forgatással és x pozícióval a
+kezdősorba kerül, majd azonnal leesik. Az ütközésvizsgálat, a rögzítés, a
+teli sorok keresése és a sorok tömörítése a teljes kötegre egyszerre,
+vektorizáltan fut; játékonként csak az elemsor (a motoréval azonos
+véletlenszám-sorozat) készül Pythonban, előre, darabokban.
+
+A szabályok (esési pontok, sortörlés, combo, szint, a játék vége) pontosan
+a TetrisEngine hard_drop()/lock_piece()/add_line_score() szabályai; ezt a
+cross_check() véletlen kezdőértékeken összeveti a motorral.
+
+NumPy szükséges hozzá (pip install numpy). Futtatás a projekt gyökeréből:
+    python batch.py --games 4096 --steps 200   # sebességmérés véletlen lépésekkel
+    python batch.py --check                    # összevetés a motorral
+"""
+import argparse
+import random
+import sys
+from time import perf_counter
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import (SHAPES, GRID_WIDTH, GRID_HEIGHT, INITIAL_Y_OFFSET,
+                    HARD_DROP_POINTS, COMBO_POINTS)
+from engine import (TetrisEngine, LINE_POINTS, ACTION_LEFT, ACTION_RIGHT,
+                    ACTION_ROTATE, ACTION_HARD_DROP)
+from shapes import COMPILED_SHAPES, X_OFFSET
+from board import FULL_ROW
+
+SHAPE_SIZE = 5                 # az alakzatmátrixok mérete
+MAX_ROTATIONS = max(len(shape) for shape in SHAPES)
+SPAWN_X = 5                    # az új elemek x pozíciója (mint TetrisEngine.get_new_piece())
+SPAWN_Y = INITIAL_Y_OFFSET
+QUEUE_CHUNK = 64               # ennyi elemet sorsolunk előre játékonként
+
+# A statisztikák oszlopai a stats tömbben
+STAT_FIELDS = ('score', 'lines_cleared', 'level', 'combo', 'pieces')
+
+# A játéktér fölötti (a kezdősorig) és alatti (padló) kiegészítő sorok
+PAD_TOP = max(0, -SPAWN_Y)
+PAD_BOTTOM = SHAPE_SIZE
+
+
+def compile_tables():
+    """
+    Az alakzattáblák tömbösítése.
+
+    Returns:
+        tuple: (forgatások száma alakzatonként, sormaszkok [alakzat, forgatás, x + X_OFFSET, sor],
+                érvényes x pozíciók, legfelső foglalt sor)
+    """
+    shape_count = len(SHAPES)
+    positions = X_OFFSET + GRID_WIDTH
+    rotations = np.array([len(shape) for shape in SHAPES], dtype=np.int64)
+    masks = np.zeros((shape_count, MAX_ROTATIONS, positions, SHAPE_SIZE), dtype=np.uint16)
+    valid = np.zeros((shape_count, MAX_ROTATIONS, positions), dtype=bool)
+    min_y = np.zeros((shape_count, MAX_ROTATIONS), dtype=np.int64)
+    for s, compiled in enumerate(COMPILED_SHAPES):
+        for r, shape in enumerate(compiled):
+            min_y[s, r] = shape.min_y
+            for xi, fit_masks in enumerate(shape.fit_masks):
+                if fit_masks is None:
+                    continue
+                valid[s, r, xi] = True
+                for i, mask in fit_masks:
+                    masks[s, r, xi, i] = mask
+    return rotations, masks, valid, min_y
+
+
+ROTATIONS, ROW_MASKS, VALID_X, MIN_Y = compile_tables()
+LINE_POINTS_ARRAY = np.array(LINE_POINTS, dtype=np.int64)
+
+
+class BatchEngine:
+    """
+    N független játék, lépésenként egy-egy elhelyezéssel.
+
+    Attribútumok (mind N hosszú tömbök, a board (N, 20) alakú):
+        board, score, lines_cleared, level, combo, pieces, game_over,
+        current (az aktuális elem alakzata), next (a következő elem alakzata)
+
+    A statisztikák egyetlen (N, 5) alakú stats tömb oszlopai (STAT_FIELDS
+    sorrendben), a score és társai ennek nézetei; a board a kiegészített
+    játéktér nézete. Így a tömbök másolás nélkül átadhatók (lásd env.py).
+    """
+    def __init__(self, seeds):
+        """
+        Args:
+            seeds: A játékok kezdőértékei (a TetrisEngine(seed) játékaival egyeznek meg)
+        """
+        self.seeds = list(seeds)
+        n = len(self.seeds)
+        self.size = n
+        self.rngs = [None] * n
+
+        # A kiegészített játéktér: felül üres sorok, alul teli padló
+        self.padded = np.zeros((n, PAD_TOP + GRID_HEIGHT + PAD_BOTTOM), dtype=np.uint16)
+        self.padded[:, PAD_TOP + GRID_HEIGHT:] = 0xFFFF
+        self.board = self.padded[:, PAD_TOP:PAD_TOP + GRID_HEIGHT]
+        self.windows = sliding_window_view(self.padded, SHAPE_SIZE, axis=1)
+
+        self.stats = np.zeros((n, len(STAT_FIELDS)), dtype=np.int64)
+        self.score, self.lines_cleared, self.level, self.combo, self.pieces = self.stats.T
+        self.game_over = np.zeros(n, dtype=bool)
+
+        # Elemsorok: játékonként QUEUE_CHUNK előre sorsolt alakzat
+        self.queue = np.zeros((n, QUEUE_CHUNK), dtype=np.int64)
+        self.queue_pos = np.zeros(n, dtype=np.int64)
+        self.current = np.zeros(n, dtype=np.int64)
+        self.next = np.zeros(n, dtype=np.int64)
+        self.index = np.arange(n)
+        self.reset(self.index, self.seeds)
+
+    def reset(self, games, seeds):
+        """
+        Játékok újraindítása (a TetrisEngine.reset(seed) megfelelője).
+
+        Args:
+            games: A játékok indexei
+            seeds: Játékonként az új kezdőérték
+        """
+        for g, seed in zip(games, seeds):
+            self.seeds[g] = seed
+            self.rngs[g] = random.Random(seed)
+        self.board[games] = 0
+        self.stats[games] = 0
+        self.level[games] = 1
+        self.game_over[games] = False
+        self.refill(games)
+        self.current[games] = self.draw(games)
+        self.next[games] = self.draw(games)
+
+    def refill(self, games):
+        """
+        Az elemsorok újratöltése a játékok saját véletlenszám-generátorából.
+
+        Args:
+            games: A feltöltendő játékok indexei
+        """
+        last = len(SHAPES) - 1
+        for g in games:
+            randint = self.rngs[g].randint
+            self.queue[g] = [randint(0, last) for _ in range(QUEUE_CHUNK)]
+        self.queue_pos[games] = 0
+
+    def draw(self, games):
+        """
+        A következő alakzat kivétele a játékok elemsorából.
+
+        Args:
+            games: A játékok indexei
+
+        Returns:
+            ndarray: Az alakzatok indexei
+        """
+        empty = games[self.queue_pos[games] >= QUEUE_CHUNK]
+        if len(empty):
+            self.refill(empty)
+        shapes = self.queue[games, self.queue_pos[games]]
+        self.queue_pos[games] += 1
+        return shapes
+
+    def collisions(self, games, masks):
+        """
+        Ütközés minden lehetséges y pozícióban a kezdősortól lefelé.
+
+        Args:
+            games: A játékok indexei
+            masks: Játékonként az elem SHAPE_SIZE sormaszkja
+
+        Returns:
+            ndarray: (játék, y pozíció) logikai tömb, a 0. oszlop a kezdősor
+        """
+        windows = self.windows[games]
+        return (windows & masks[:, None, :]).any(axis=2)
+
+    def placement(self, games, rotations, xs):
+        """
+        Az elhelyezések táblaindexei és érvényessége.
+
+        Args:
+            games: A játékok indexei
+            rotations: Játékonként a forgatás
+            xs: Játékonként az x pozíció
+
+        Returns:
+            tuple: (forgatások, x + X_OFFSET indexek, sormaszkok, érvényes-e: a
+                   játéktéren belül van és a kezdősorban nem ütközik)
+        """
+        shapes = self.current[games]
+        rotations = rotations % ROTATIONS[shapes]
+        xi = xs + X_OFFSET
+        inside = (xi >= 0) & (xi < X_OFFSET + GRID_WIDTH)
+        xi = np.minimum(np.maximum(xi, 0), X_OFFSET + GRID_WIDTH - 1)
+        masks = ROW_MASKS[shapes, rotations, xi]
+        spawn = (self.windows[games, 0, :] & masks).any(axis=1)
+        return rotations, xi, masks, inside & VALID_X[shapes, rotations, xi] & ~spawn
+
+    def fits(self, rotations, xs):
+        """
+        Elfér-e az aktuális elem a kezdősorban az adott forgatással és pozícióval.
+
+        Args:
+            rotations: Játékonként a forgatás
+            xs: Játékonként az x pozíció
+
+        Returns:
+            ndarray: Játékonként logikai érték (a véget ért játékokban False)
+        """
+        valid = self.placement(self.index, np.asarray(rotations), np.asarray(xs))[3]
+        return valid & ~self.game_over
+
+    def step(self, rotations, xs):
+        """
+        Egy elhelyezés minden még futó játékban: az elem a kezdősorba kerül a
+        megadott forgatással és x pozícióval, majd azonnal leesik. Érvénytelen
+        elhelyezésnél az elem forgatás nélkül, a kezdőpozícióból esik le (mint
+        amikor a motor csak azonnali ejtést kap).
+
+        Args:
+            rotations: Játékonként a forgatás (az alakzat forgatásainak számával vett maradék számít)
+            xs: Játékonként az x pozíció
+
+        Returns:
+            ndarray: Játékonként a kitörölt sorok száma
+        """
+        cleared = np.zeros(self.size, dtype=np.int64)
+        rotations = np.asarray(rotations)
+        xs = np.asarray(xs)
+        if self.game_over.any():
+            active = ~self.game_over
+            games = self.index[active]
+            if not len(games):
+                return cleared
+            rotations, xs = rotations[active], xs[active]
+        else:
+            games = self.index
+
+        shapes = self.current[games]
+        rotations, xi, masks, valid = self.placement(games, rotations, xs)
+
+        # Érvénytelen elhelyezés: az elem a kezdőpozícióban marad
+        rotations = np.where(valid, rotations, 0)
+        xi = np.where(valid, xi, SPAWN_X + X_OFFSET)
+        masks = ROW_MASKS[shapes, rotations, xi]
+
+        # Esési távolság: az első ütköző pozíció a kezdősor alatt (a padló miatt mindig
+        # van ilyen). A kezdősort nem vizsgáljuk: a motor sem ellenőrzi újra az elemet,
+        # amikor a következőből aktuális lesz, így az a kezdőpozícióban átfedhet is.
+        distance = self.collisions(games, masks)[:, 1:].argmax(axis=1)
+        self.score[games] += HARD_DROP_POINTS * distance
+
+        # Ha az elem egy része a játéktér felett marad, vége a játéknak
+        y = SPAWN_Y + distance
+        over = y + MIN_Y[shapes, rotations] < 0
+        self.game_over[games[over]] = True
+        placed = ~over
+        games = games[placed]
+        if not len(games):
+            return cleared
+        masks = masks[placed]
+        rows = (distance[placed])[:, None] + np.arange(SHAPE_SIZE)
+        self.padded[games[:, None], rows] |= masks
+        self.pieces[games] += 1
+
+        lines = self.clear_lines(games)
+        cleared[games] = lines
+        self.add_line_score(games, lines)
+
+        # Új elem; ha a következő nem fér el a kezdőpozícióban, vége a játéknak
+        self.current[games] = self.next[games]
+        self.next[games] = self.draw(games)
+        spawn_masks = ROW_MASKS[self.next[games], 0, SPAWN_X + X_OFFSET]
+        blocked = (self.windows[games, 0, :] & spawn_masks).any(axis=1)
+        self.game_over[games[blocked]] = True
+        return cleared
+
+    def clear_lines(self, games):
+        """
+        Teli sorok törlése: a megmaradó sorok sorrendtartó tömörítése lefelé.
+
+        Args:
+            games: A játékok indexei
+
+        Returns:
+            ndarray: Játékonként a kitörölt sorok száma
+        """
+        board = self.board[games]
+        full = board == FULL_ROW
+        lines = full.sum(axis=1)
+        hit = lines > 0
+        if hit.any():
+            # Stabil rendezés: a teli sorok kerülnek felülre, a többi sorrendje megmarad
+            board = board[hit]
+            order = np.argsort(~full[hit], axis=1, kind='stable')
+            board = np.take_along_axis(board, order, axis=1)
+            board[np.arange(GRID_HEIGHT) < lines[hit][:, None]] = 0
+            self.board[games[hit]] = board
+        return lines
+
+    def add_line_score(self, games, lines):
+        """
+        Combo, pontszám és szint frissítése (mint TetrisEngine.add_line_score()).
+
+        Args:
+            games: A játékok indexei
+            lines: Játékonként a kitörölt sorok száma
+        """
+        scoring = lines > 0
+        if not scoring.any():
+            # Sortörlés nélkül csak a combo nullázódik
+            self.combo[games] = 0
+            return
+        level = self.level[games]
+        combo = np.where(scoring, self.combo[games] + 1, 0)
+        points = LINE_POINTS_ARRAY[lines] * level
+        points += np.where(scoring & (combo > 1), COMBO_POINTS * combo * level, 0)
+        self.combo[games] = combo
+        self.score[games] += points
+        self.lines_cleared[games] += lines
+        self.level[games] = self.lines_cleared[games] // 10 + 1
+
+    def random_placements(self, generator):
+        """
+        Véletlen elhelyezések (önjátékhoz, méréshez); az érvénytelenek a kezdőpozícióból esnek.
+
+        Args:
+            generator: numpy.random.Generator
+
+        Returns:
+            tuple: (forgatások, x pozíciók)
+        """
+        rotations = generator.integers(0, MAX_ROTATIONS, self.size)
+        xs = generator.integers(-2, GRID_WIDTH, self.size)
+        return rotations, xs
+
+
+def engine_placement(engine, rotation, x):
+    """
+    Egy elhelyezés végrehajtása a motorban akciókkal (forgatás a helyén, tolás, azonnali ejtés).
+
+    Args:
+        engine: A játékmotor
+        rotation: A cél forgatás
+        x: A cél x pozíció
+    """
+    piece = engine.current_piece
+    for _ in range((rotation - piece.rotation) % len(piece.shape)):
+        engine.step(ACTION_ROTATE)
+    while piece.x < x and engine.step(ACTION_RIGHT):
+        pass
+    while piece.x > x and engine.step(ACTION_LEFT):
+        pass
+    engine.step(ACTION_HARD_DROP)
+
+
+def cross_check(seeds, steps=300, policy_seed=0):
+    """
+    A köteg összevetése a motorral: ugyanazokkal az elhelyezésekkel mindkettő
+    lép, és minden lépés után a játékterek és a statisztikák egyezését nézzük.
+
+    A játékok fele véletlen elhelyezésekkel, a másik fele az automatikus
+    játékos döntéseivel halad (hosszú játékok, sok sortörlés és combo);
+    lépésenként 5% eséllyel érvénytelen elhelyezés is előfordul.
+
+    Args:
+        seeds: A játékok kezdőértékei
+        steps: A lépések száma
+        policy_seed: Az elhelyezéseket választó véletlenszám-generátor kezdőértéke
+
+    Returns:
+        list: (lépés, kezdőérték, mező) eltérések; üres lista ha minden egyezik
+    """
+    from ai import AutoPlayer, placements
+
+    rng = random.Random(policy_seed)
+    player = AutoPlayer(lookahead=False)
+    batch = BatchEngine(seeds)
+    engines = [TetrisEngine(seed) for seed in seeds]
+    fields = ('score', 'lines_cleared', 'level', 'combo', 'pieces', 'game_over')
+    mismatches = []
+    for step in range(steps):
+        rotations = np.zeros(len(engines), dtype=np.int64)
+        xs = np.zeros(len(engines), dtype=np.int64)
+        for g, engine in enumerate(engines):
+            if engine.game_over:
+                continue
+            options = placements(engine.board, engine.current_piece)
+            if rng.random() < 0.05 or not options:
+                # Érvénytelen elhelyezés: a motorban csak azonnali ejtés
+                rotations[g], xs[g] = 0, -X_OFFSET
+                engine.step(ACTION_HARD_DROP)
+                continue
+            target = player.choose(engine) if g % 2 else None
+            rotations[g], xs[g] = target if target is not None else rng.choice(options)
+            engine_placement(engine, rotations[g], xs[g])
+        batch.step(rotations, xs)
+
+        for g, engine in enumerate(engines):
+            for field in fields:
+                if getattr(engine, field) != getattr(batch, field)[g]:
+                    mismatches.append((step, seeds[g], field))
+            rows = [engine.board.row_mask(y) for y in range(GRID_HEIGHT)]
+            if rows != batch.board[g].tolist():
+                mismatches.append((step, seeds[g], 'board'))
+            if not engine.game_over and (engine.current_piece.shape_index != batch.current[g]
+                                         or engine.next_piece.shape_index != batch.next[g]):
+                mismatches.append((step, seeds[g], 'pieces'))
+        if batch.game_over.all():
+            break
+    return mismatches
+
+
+def main(argv=None):
+    """
+    Parancssori belépési pont: sebességmérés vagy összevetés a motorral.
+
+    Returns:
+        int: Kilépési kód (1 ha az összevetés eltérést talált)
+    """
+    parser = argparse.ArgumentParser(prog='python batch.py', description='Kötegelt játékszimuláció')
+    parser.add_argument('--games', type=int, default=4096, help='a játékok száma a kötegben')
+    parser.add_argument('--steps', type=int, default=200, help='lépések (elhelyezések) száma')
+    parser.add_argument('--seed', type=int, default=1, help='az első játék kezdőértéke')
+    parser.add_argument('--check', action='store_true', help='összevetés a motorral véletlen kezdőértékeken')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        seeds = random.Random(args.seed).sample(range(1 << 32), 64)
+        mismatches = cross_check(seeds, args.steps, args.seed)
+        for step, seed, field in mismatches[:20]:
+            print(f"eltérés: lépés {step}, seed {seed}, {field}")
+        print(f"{len(seeds)} játék, {args.steps} lépés: {'OK' if not mismatches else 'ELTÉRÉS'}")
+        return 1 if mismatches else 0
+
+    batch = BatchEngine(range(args.seed, args.seed + args.games))
+    generator = np.random.default_rng(args.seed)
+    start = perf_counter()
+    for _ in range(args.steps):
+        batch.step(*batch.random_placements(generator))
+    elapsed = perf_counter() - start
+    placed = int(batch.pieces.sum())
+    print(f"{args.games} játék, {args.steps} lépés: {placed} elhelyezés {elapsed:.2f} s alatt "
+          f"({placed / elapsed:,.0f} elhelyezés/s), még fut: {int((~batch.game_over).sum())}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
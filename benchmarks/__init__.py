@@ -0,0 +1,6 @@
+"""
+Teljesítménymérések a játékmotor és a megjelenítés kritikus útvonalaihoz.
+
+Futtatás a projekt gyökeréből: python -m benchmarks (lásd runner.py), a
+háttértárak összehasonlítása: python -m benchmarks.bench_board
+"""
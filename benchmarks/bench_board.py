@@ -0,0 +1,164 @@
+"""
+A játéktér háttértárainak (GridBoard, BitBoard) összehasonlító mérése.
+
+Futtatás: python -m benchmarks.bench_board
+"""
+import random
+import time
+
+from board import BOARD_BACKENDS, FULL_ROW
+from config import GRID_HEIGHT, SHAPES
+from engine import (TetrisEngine, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE,
+                    ACTION_GRAVITY, EVENT_LOCK)
+from piece import Piece
+
+I_PIECE = 6  # Az I elem indexe a SHAPES listában
+REPEAT = 5   # ismétlések száma, a legjobb eredmény számít
+
+
+def random_stack(rng, height):
+    """
+    Véletlen, lyukas sorokból álló torony bitmaszkjai.
+
+    Args:
+        rng: Véletlenszám-generátor
+        height: A torony magassága sorokban
+
+    Returns:
+        list: 20 sormaszk (a felső sorok üresek, egyik sor sem teli)
+    """
+    rows = [0] * GRID_HEIGHT
+    for y in range(GRID_HEIGHT - height, GRID_HEIGHT):
+        rows[y] = rng.randrange(FULL_ROW)
+    return rows
+
+
+def clear_stack_rows(stack_height, lines):
+    """
+    Torony, amelyben egy függőleges I elem a 0. oszlopba ejtve pontosan
+    `lines` sort tölt ki.
+
+    Args:
+        stack_height: A torony magassága sorokban (legalább 4)
+        lines: A rögzítéskor teli sorok száma (1-4)
+
+    Returns:
+        list: 20 sormaszk
+    """
+    # A legalsó `lines` sorból csak a 0. oszlop hiányzik, a többiből a 0. és 1.
+    rows = [0] * (GRID_HEIGHT - stack_height) + [FULL_ROW & ~3] * stack_height
+    for y in range(GRID_HEIGHT - lines, GRID_HEIGHT):
+        rows[y] = FULL_ROW & ~1
+    return rows
+
+
+def vertical_i_piece():
+    """
+    Függőleges I elem, amely a 0. oszlopban a játéktér aljáig ér.
+
+    Returns:
+        Piece: Az elem
+    """
+    piece = Piece(-2, 0, I_PIECE)
+    piece.rotation = 1
+    piece.y = GRID_HEIGHT - 4
+    return piece
+
+
+def bench_valid_move(backend, count=20000, seed=1):
+    """
+    Ütközésvizsgálat egy félmagas torony feletti, szabad pozíciókban,
+    ahogy a játék közben a zuhanó elemeknél a leggyakoribb.
+    """
+    rng = random.Random(seed)
+    board = BOARD_BACKENDS[backend]()
+    board.load_rows(random_stack(rng, GRID_HEIGHT // 2))
+    pieces = []
+    for _ in range(count):
+        piece = Piece(rng.randint(-1, 8), 0, rng.randrange(len(SHAPES)))
+        piece.rotation = rng.randrange(len(piece.shape))
+        piece.y = rng.randint(-2, GRID_HEIGHT // 2 - 6)
+        if board.fits(piece, 0, 1):
+            pieces.append(piece)
+
+    fits = board.fits
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for piece in pieces:
+            fits(piece, 0, 1)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pieces)
+
+
+def bench_lock_clear(backend, count=2000, stack_height=12, lines=4):
+    """
+    Egy függőleges I elem rögzítése és a keletkező teli sorok törlése.
+    Csak a place() + clear_lines() hívások ideje számít, az állás
+    előkészítése nem.
+
+    Args:
+        backend: A játéktér háttértára ('grid' vagy 'bitboard')
+        count: Ismétlések száma
+        stack_height: A torony magassága sorokban (legalább 4)
+        lines: A rögzítéskor teli sorok száma (1-4)
+    """
+    rows = clear_stack_rows(stack_height, lines)
+    board_class = BOARD_BACKENDS[backend]
+    piece = vertical_i_piece()
+    best = float('inf')
+    for _ in range(REPEAT):
+        elapsed = 0.0
+        for _ in range(count):
+            board = board_class()
+            board.load_rows(rows)
+
+            start = time.perf_counter()
+            board.place(piece)
+            cleared = board.clear_lines()
+            elapsed += time.perf_counter() - start
+            assert cleared == lines
+        best = min(best, elapsed)
+    return best / count
+
+
+def bench_engine(backend, count=2000, seed=1):
+    """
+    Teljes motorlépések: véletlen mozgatás és forgatás után gravitációs
+    ejtés a rögzítésig. Az eredmény egy elemre jutó idő.
+    """
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed, board_backend=backend)
+    actions = [rng.choice((ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE)) for _ in range(count)]
+    best = float('inf')
+    for _ in range(REPEAT):
+        engine.reset(seed)
+        pieces = 0
+        start = time.perf_counter()
+        for action in actions:
+            engine.step(action)
+            while not engine.step(ACTION_GRAVITY) & EVENT_LOCK:
+                if engine.game_over:
+                    pieces += engine.pieces
+                    engine.reset()
+        pieces += engine.pieces
+        best = min(best, (time.perf_counter() - start) / pieces)
+    return best
+
+
+def main():
+    """A mérések futtatása és az eredmények kiírása."""
+    results = {}
+    for name, bench, count in (('valid_move', bench_valid_move, 20000),
+                               ('lock+clear (Tetris)', bench_lock_clear, 2000),
+                               ('engine (per piece)', bench_engine, 2000)):
+        per_op = {backend: bench(backend, count) for backend in BOARD_BACKENDS}
+        results[name] = per_op
+        speedup = per_op['grid'] / per_op['bitboard']
+        print(f"{name:22s} grid: {per_op['grid'] * 1e6:8.2f} µs  "
+              f"bitboard: {per_op['bitboard'] * 1e6:8.2f} µs  ({speedup:.1f}x)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
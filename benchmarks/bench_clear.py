@@ -0,0 +1,37 @@
+"""
+Rögzítés és sortörlés költsége a torony magasságának függvényében.
+
+A helyben frissített rács és az egymenetes sortömörítés miatt a költségnek
+a torony magasságától függetlenül közel állandónak kell lennie.
+
+Futtatás: python -m benchmarks.bench_clear
+"""
+from board import BOARD_BACKENDS
+from benchmarks.bench_board import bench_lock_clear
+
+STACK_HEIGHTS = (4, 8, 12, 16, 19)
+LINE_COUNTS = ((1, 'single'), (2, 'double'), (4, 'tetris'))
+
+
+def main(count=1000):
+    """
+    A mérések futtatása és táblázatos kiírása.
+
+    Returns:
+        dict: (háttértár, sortörlés, toronymagasság) -> egy műveletre jutó idő (s)
+    """
+    results = {}
+    print(f"{'backend':10s}{'clear':8s}" + ''.join(f"{'h=' + str(h):>10s}" for h in STACK_HEIGHTS))
+    for backend in BOARD_BACKENDS:
+        for lines, name in LINE_COUNTS:
+            row = []
+            for height in STACK_HEIGHTS:
+                per_op = bench_lock_clear(backend, count, height, lines)
+                results[(backend, name, height)] = per_op
+                row.append(f"{per_op * 1e6:8.2f}µs")
+            print(f"{backend:10s}{name:8s}" + ''.join(row))
+    return results
+
+
+if __name__ == "__main__":
+    main()
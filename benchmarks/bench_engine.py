@@ -0,0 +1,192 @@
+"""
+A játékmotor kritikus útvonalainak mérései a mérésfuttatóhoz (python -m benchmarks).
+
+Minden mérőfüggvény a kért számú mintát adja vissza, mintánként egy
+műveletre jutó időt másodpercben. A nagyon gyors műveleteknél egy minta
+BATCH hívás átlaga, a többinél egyetlen hívásé; az állás előkészítése
+nem számít bele.
+"""
+import random
+from functools import partial
+from time import perf_counter
+
+from config import GRID_HEIGHT, SHAPES
+from engine import TetrisEngine
+from piece import Piece
+from ai import AutoPlayer
+from benchmarks.bench_board import clear_stack_rows, random_stack
+
+BATCH = 200  # ennyi hívás átlaga egy minta a mikroszekundum alatti műveleteknél
+
+STACK_HEIGHTS = (4, 8, 12, 16)
+LINE_COUNTS = ((1, 'single'), (2, 'double'), (4, 'tetris'))
+
+
+def random_piece(engine, rng):
+    """
+    Véletlen elem véletlen forgatással, érvényes helyen a játéktér tetején.
+
+    Args:
+        engine: A játékmotor
+        rng: Véletlenszám-generátor
+
+    Returns:
+        Piece: Az elem
+    """
+    while True:
+        piece = Piece(rng.randint(-1, 8), 0, rng.randrange(len(SHAPES)))
+        piece.rotation = rng.randrange(len(piece.shape))
+        if engine.valid_move(piece):
+            return piece
+
+
+def prepare(engine, rng, height):
+    """
+    Véletlen torony és egy új aktuális elem beállítása a motorban.
+
+    Args:
+        engine: A játékmotor
+        rng: Véletlenszám-generátor
+        height: A torony magassága sorokban
+    """
+    engine.board.load_rows(random_stack(rng, height))
+    engine.game_over = False
+    engine.current_piece = random_piece(engine, rng)
+
+
+def bench_valid_move(samples, seed=1):
+    """Ütközésvizsgálat zuhanó elemekre egy félmagas torony felett."""
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed)
+    engine.board.load_rows(random_stack(rng, GRID_HEIGHT // 2))
+    pieces = []
+    while len(pieces) < BATCH:
+        piece = random_piece(engine, rng)
+        piece.y = rng.randint(0, GRID_HEIGHT // 2 - 6)
+        if engine.valid_move(piece, 0, 1):
+            pieces.append(piece)
+
+    valid_move = engine.valid_move
+    result = []
+    for _ in range(samples):
+        start = perf_counter()
+        for piece in pieces:
+            valid_move(piece, 0, 1)
+        result.append((perf_counter() - start) / BATCH)
+    return result
+
+
+def bench_lock_piece(samples, seed=1, height=8):
+    """Az érkezési sorba helyezett elem rögzítése (sortörléssel, új elemmel együtt)."""
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed)
+    result = []
+    for _ in range(samples):
+        prepare(engine, rng, height)
+        engine.current_piece.y = engine.landing_row(engine.current_piece)
+        start = perf_counter()
+        engine.lock_piece()
+        result.append(perf_counter() - start)
+    return result
+
+
+def bench_clear_lines(samples, stack_height, lines, seed=1):
+    """
+    Sortörlés egy `stack_height` magas toronyban, amelynek alsó `lines` sora teli.
+    """
+    rows = clear_stack_rows(stack_height, lines)
+    # A függőleges I elem celláinak beírása a 0. oszlopba
+    for y in range(GRID_HEIGHT - 4, GRID_HEIGHT):
+        rows[y] |= 1
+    engine = TetrisEngine(seed)
+    result = []
+    for _ in range(samples):
+        engine.board.load_rows(rows)
+        start = perf_counter()
+        cleared = engine.clear_lines()
+        result.append(perf_counter() - start)
+        assert cleared == lines
+    return result
+
+
+def bench_ghost_cold(samples, seed=1):
+    """Szellem elem számolása új játéktér-állapotban (üres gyorsítótárral)."""
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed)
+    result = []
+    for _ in range(samples):
+        prepare(engine, rng, rng.randint(4, 12))
+        start = perf_counter()
+        engine.update_ghost_piece()
+        result.append(perf_counter() - start)
+    return result
+
+
+def bench_ghost_warm(samples, seed=1):
+    """Szellem elem lekérése változatlan állapotban (a képkockák többsége ilyen)."""
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed)
+    prepare(engine, rng, 8)
+    update_ghost_piece = engine.update_ghost_piece
+    update_ghost_piece()
+    result = []
+    for _ in range(samples):
+        start = perf_counter()
+        for _ in range(BATCH):
+            update_ghost_piece()
+        result.append((perf_counter() - start) / BATCH)
+    return result
+
+
+def bench_hard_drop(samples, seed=1):
+    """Azonnali ejtés: esési távolság, rögzítés, sortörlés és új elem."""
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed)
+    result = []
+    for _ in range(samples):
+        prepare(engine, rng, rng.randint(4, 12))
+        start = perf_counter()
+        engine.hard_drop()
+        result.append(perf_counter() - start)
+    return result
+
+
+def bench_tick(samples, seed=1):
+    """Akció nélküli tickek (gravitáció a virtuális órán), ahogy a gyorsított mód futtatja."""
+    engine = TetrisEngine(seed)
+    result = []
+    for _ in range(samples):
+        if engine.game_over:
+            engine.reset(seed)
+        start = perf_counter()
+        ticks = engine.ticks
+        engine.advance(BATCH)
+        result.append((perf_counter() - start) / max(engine.ticks - ticks, 1))
+    return result
+
+
+def bench_ai_decision(samples, seed=1, height=8):
+    """Az automatikus játékos egy döntése (előretekintéssel) véletlen tornyon."""
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed)
+    player = AutoPlayer()
+    result = []
+    for _ in range(samples):
+        prepare(engine, rng, height)
+        start = perf_counter()
+        player.choose(engine)
+        result.append(perf_counter() - start)
+    return result
+
+
+BENCHMARKS = {
+    'engine.valid_move': bench_valid_move,
+    'engine.lock_piece': bench_lock_piece,
+    **{f'engine.clear_lines.{name}.h{height}': partial(bench_clear_lines, stack_height=height, lines=lines)
+       for lines, name in LINE_COUNTS for height in STACK_HEIGHTS},
+    'engine.update_ghost_piece.cold': bench_ghost_cold,
+    'engine.update_ghost_piece.warm': bench_ghost_warm,
+    'engine.hard_drop': bench_hard_drop,
+    'engine.tick': bench_tick,
+    'ai.decision': bench_ai_decision,
+}
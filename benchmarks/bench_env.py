@@ -0,0 +1,84 @@
+"""
+A gym-stílusú környezet (env.py) lépéseinek mérése a mérésfuttatóhoz.
+
+Összehasonlításként egy egyszerű Python-ciklusos csomagoló is szerepel,
+amely a TetrisEngine akcióival hajtja végre az elhelyezést, és minden
+lépésben a grid listából új NumPy megfigyelést épít. Egy minta egy
+környezet-lépés ideje másodpercben (a vektorizált változatnál a hívás ideje
+osztva a környezetek számával).
+"""
+import random
+from time import perf_counter
+
+import numpy as np
+
+from board import EMPTY
+from engine import TetrisEngine
+from env import TetrisEnv, VectorTetrisEnv, ONE_HOT, ACTION_COUNT, decode_actions
+from batch import engine_placement
+from benchmarks.bench_engine import BATCH
+
+VECTOR_ENVS = 256
+
+
+def bench_env_step(samples, seed=1):
+    """Egyetlen környezet lépése véletlen akciókkal."""
+    env = TetrisEnv()
+    env.reset(seed)
+    generator = np.random.default_rng(seed)
+    actions = env.action_space.sample(generator, BATCH)
+    result = []
+    for _ in range(samples):
+        start = perf_counter()
+        for action in actions:
+            _, _, terminated, _, _ = env.step(action)
+            if terminated:
+                env.reset(seed)
+        result.append((perf_counter() - start) / BATCH)
+    return result
+
+
+def bench_vector_step(samples, seed=1):
+    """VECTOR_ENVS környezet léptetése egy hívással (automatikus újraindítással)."""
+    env = VectorTetrisEnv(VECTOR_ENVS)
+    env.reset(seed)
+    generator = np.random.default_rng(seed)
+    result = []
+    for _ in range(samples):
+        actions = env.action_space.sample(generator, VECTOR_ENVS)
+        start = perf_counter()
+        env.step(actions)
+        result.append((perf_counter() - start) / VECTOR_ENVS)
+    return result
+
+
+def grid_observation(engine):
+    """A Python-ciklusos csomagoló megfigyelése: új tömbök a grid listából."""
+    board = np.array([[cell != EMPTY for cell in row] for row in engine.grid], dtype=np.uint8)
+    stats = np.array([engine.score, engine.lines_cleared, engine.level, engine.combo, engine.pieces])
+    return board, ONE_HOT[engine.current_piece.shape_index].copy(), stats
+
+
+def bench_grid_loop(samples, seed=1):
+    """Viszonyítás: TetrisEngine akciókkal és a grid listából másolt megfigyeléssel."""
+    engine = TetrisEngine(seed)
+    rng = random.Random(seed)
+    rotations, xs = decode_actions(np.arange(ACTION_COUNT))
+    result = []
+    for _ in range(samples):
+        start = perf_counter()
+        for _ in range(BATCH):
+            action = rng.randrange(len(rotations))
+            engine_placement(engine, rotations[action], xs[action])
+            grid_observation(engine)
+            if engine.game_over:
+                engine.reset(seed)
+        result.append((perf_counter() - start) / BATCH)
+    return result
+
+
+BENCHMARKS = {
+    'env.step': bench_env_step,
+    f'env.vector.step.{VECTOR_ENVS}': bench_vector_step,
+    'env.baseline.grid_loop': bench_grid_loop,
+}
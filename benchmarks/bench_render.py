@@ -0,0 +1,125 @@
+"""
+Teljes képkockák (TetrisGame.draw) mérése képernyő nélkül.
+
+Az SDL a dummy videó- és hangmeghajtóval fut (hacsak a környezet mást nem
+ír elő), így a mérés grafikus felület nélküli gépen is működik. Egy minta
+egyetlen képkocka ideje a kirajzolástól a pygame.display.update()-ig.
+"""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import random
+from time import perf_counter
+
+from engine import ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_HARD_DROP
+from game import TetrisGame
+from benchmarks.bench_board import random_stack
+
+WARMUP_FRAMES = 10
+
+_game = None
+
+
+def get_game():
+    """
+    A közös, képernyő nélküli játékpéldány (egyszer létrehozva).
+
+    Returns:
+        TetrisGame: A játék
+    """
+    global _game
+    if _game is None:
+        _game = TetrisGame(sound=False)
+    return _game
+
+
+def setup(background_quality, seed=1, stack_height=8):
+    """
+    A játék előkészítése egy méréshez: új játék, félmagas torony, bemelegítés.
+
+    Args:
+        background_quality: 'high' (animált) vagy 'low' (álló háttér)
+        seed: A motor véletlenszám-generátorának kezdőértéke
+        stack_height: A kezdő torony magassága sorokban
+
+    Returns:
+        TetrisGame: Az előkészített játék
+    """
+    game = get_game()
+    game.reset_game(seed)
+    game.engine.board.load_rows(random_stack(random.Random(seed), stack_height), 3)
+    game.ui.set_background_quality(background_quality)
+    for _ in range(WARMUP_FRAMES):
+        game.draw()
+    return game
+
+
+def measure_frames(game, samples, before_frame=None):
+    """
+    Képkockák idejének mérése.
+
+    Args:
+        game: A játék
+        samples: A mért képkockák száma
+        before_frame: Minden képkocka előtt hívott függvény (a képkocka indexével),
+                      az ideje nem számít bele
+
+    Returns:
+        list: Képkockánkénti idők másodpercben
+    """
+    result = []
+    for i in range(samples):
+        if before_frame is not None:
+            before_frame(i)
+        start = perf_counter()
+        game.draw()
+        result.append(perf_counter() - start)
+    return result
+
+
+def bench_idle(samples, quality='low'):
+    """Változatlan állapot: csak a képkocka alapköltsége."""
+    return measure_frames(setup(quality), samples)
+
+
+def bench_moving(samples, quality='low', seed=1):
+    """Az aktuális elem minden képkockában mozog vagy forog."""
+    game = setup(quality, seed)
+    rng = random.Random(seed)
+    actions = (ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE)
+    return measure_frames(game, samples, lambda i: game.engine.step(rng.choice(actions)))
+
+
+def bench_lock(samples, quality='low', seed=1):
+    """Minden képkockában azonnali ejtés: a játéktér réteg is újrarajzolódik."""
+    game = setup(quality, seed)
+
+    def drop(i):
+        if game.engine.game_over:
+            game.reset_game(seed)
+        game.engine.step(ACTION_HARD_DROP)
+
+    return measure_frames(game, samples, drop)
+
+
+def bench_pause(samples):
+    """A szünet képernyő kitartása."""
+    game = setup('high')
+    game.paused = True
+    game.draw()
+    try:
+        return measure_frames(game, samples)
+    finally:
+        game.paused = False
+
+
+BENCHMARKS = {
+    'render.frame.idle': bench_idle,
+    'render.frame.moving': bench_moving,
+    'render.frame.lock': bench_lock,
+    'render.frame.animated.idle': lambda samples: bench_idle(samples, 'high'),
+    'render.frame.animated.moving': lambda samples: bench_moving(samples, 'high'),
+    'render.frame.pause': bench_pause,
+}
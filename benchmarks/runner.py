@@ -0,0 +1,182 @@
+"""
+Mérésfuttató: a motor és a megjelenítés méréseinek futtatása, JSON kimenet
+és összevetés egy eltárolt alapméréssel.
+
+Futtatás a projekt gyökeréből:
+    python -m benchmarks                          # minden mérés, táblázat
+    python -m benchmarks --output eredmeny.json   # JSON kimenet
+    python -m benchmarks --compare alap.json      # regressziók jelzése
+    python -m benchmarks --filter engine --quick  # részhalmaz, kevesebb minta
+"""
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+
+from metrics import percentile
+
+# Ennyivel lassabb medián már regressziónak számít (10%)
+DEFAULT_THRESHOLD = 0.10
+
+
+def summarize(samples):
+    """
+    Minták összesítése.
+
+    Args:
+        samples: Egy műveletre jutó idők másodpercben
+
+    Returns:
+        dict: medián, p95, p99, átlag és minimum mikroszekundumban, valamint a mintaszám
+    """
+    ordered = sorted(samples)
+    return {
+        'median_us': percentile(ordered, 0.5) * 1e6,
+        'p95_us': percentile(ordered, 0.95) * 1e6,
+        'p99_us': percentile(ordered, 0.99) * 1e6,
+        'mean_us': sum(ordered) / len(ordered) * 1e6,
+        'min_us': ordered[0] * 1e6,
+        'samples': len(ordered),
+    }
+
+
+def load_benchmarks(include_render=True):
+    """
+    Az elérhető mérések összegyűjtése.
+
+    A megjelenítés mérései pygame-et, a környezet mérései NumPy-t igényelnek;
+    ha ezek nincsenek telepítve, a hozzájuk tartozó mérések kimaradnak.
+
+    Args:
+        include_render: A képkocka-mérések is kellenek-e
+
+    Returns:
+        dict: név -> mérőfüggvény (paramétere a mintaszám, eredménye a minták listája)
+    """
+    from benchmarks import bench_engine
+    benchmarks = dict(bench_engine.BENCHMARKS)
+    optional = [('bench_env', 'A környezet')]
+    if include_render:
+        optional.insert(0, ('bench_render', 'A megjelenítés'))
+    for module_name, label in optional:
+        try:
+            module = importlib.import_module(f'benchmarks.{module_name}')
+        except ImportError as e:
+            print(f"{label} mérései kimaradnak: {e}", file=sys.stderr)
+        else:
+            benchmarks.update(module.BENCHMARKS)
+    return benchmarks
+
+
+def run(name_filter=None, samples=200, include_render=True):
+    """
+    A mérések futtatása.
+
+    Args:
+        name_filter: Csak azok a mérések futnak, amelyek neve tartalmazza
+        samples: Mintaszám mérésenként
+        include_render: A képkocka-mérések is fussanak-e
+
+    Returns:
+        dict: név -> összesítés (lásd summarize())
+    """
+    results = {}
+    for name, bench in load_benchmarks(include_render).items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = summarize(bench(samples))
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, min_delta_us=0.0):
+    """
+    Eredmények összevetése az alapméréssel.
+
+    Args:
+        results: Az aktuális eredmények (név -> összesítés)
+        baseline: Az alapmérés eredményei (név -> összesítés)
+        threshold: Ennyivel nagyobb relatív medián már regresszió
+        min_delta_us: Az ennél kisebb abszolút növekedés (µs) nem regresszió
+                      (a néhány mikroszekundumos mérések zajának kiszűrésére)
+
+    Returns:
+        list: (név, medián arány, p95 arány, regresszió-e) sorok a közös mérésekre
+    """
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        median_ratio = current['median_us'] / base['median_us']
+        p95_ratio = current['p95_us'] / base['p95_us']
+        regression = (median_ratio > 1 + threshold
+                      and current['median_us'] - base['median_us'] > min_delta_us)
+        rows.append((name, median_ratio, p95_ratio, regression))
+    return rows
+
+
+def print_results(results):
+    """Az eredmények táblázatos kiírása."""
+    print(f"{'mérés':40s}{'medián':>12s}{'p95':>12s}{'p99':>12s}")
+    for name, summary in results.items():
+        print(f"{name:40s}{summary['median_us']:10.2f}µs{summary['p95_us']:10.2f}µs"
+              f"{summary['p99_us']:10.2f}µs")
+
+
+def print_comparison(rows):
+    """Az összevetés táblázatos kiírása."""
+    print(f"{'mérés':40s}{'medián':>10s}{'p95':>10s}")
+    for name, median_ratio, p95_ratio, regression in rows:
+        flag = '  REGRESSZIÓ' if regression else ''
+        print(f"{name:40s}{median_ratio:9.2f}x{p95_ratio:9.2f}x{flag}")
+
+
+def main(argv=None):
+    """
+    Parancssori belépési pont.
+
+    Returns:
+        int: Kilépési kód (1 ha az összevetés regressziót talált)
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='A motor és a megjelenítés mérései')
+    parser.add_argument('--filter', help='csak a nevükben ezt tartalmazó mérések')
+    parser.add_argument('--samples', type=int, default=200, help='mintaszám mérésenként')
+    parser.add_argument('--quick', action='store_true', help='gyors futás (50 minta)')
+    parser.add_argument('--no-render', action='store_true', help='a képkocka-mérések kihagyása')
+    parser.add_argument('--output', help='az eredmények mentése JSON fájlba')
+    parser.add_argument('--compare', metavar='BASELINE', help='összevetés egy korábbi JSON eredménnyel')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='regressziós küszöb a medián relatív növekedésére (alapérték: 0.10)')
+    parser.add_argument('--min-delta', type=float, default=0.0,
+                        help='az ennél kisebb abszolút növekedés (µs) nem regresszió')
+    args = parser.parse_args(argv)
+
+    samples = 50 if args.quick else args.samples
+    results = run(args.filter, samples, include_render=not args.no_render)
+    print_results(results)
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'samples': samples,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        rows = compare(results, baseline, args.threshold, args.min_delta)
+        print()
+        print_comparison(rows)
+        if any(regression for *_, regression in rows):
+            return 1
+    return 0
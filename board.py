@@ -0,0 +1,575 @@
+"""
+A játéktér tárolását megvalósító osztályok.
+
+Két, azonos felületű háttértár közül lehet választani:
+- GridBoard: az eredeti ábrázolás (20x10-es RGB rács), soronkénti kitöltöttség-számlálóval
+- BitBoard: soronként egy 10 bites egész maszk, mellette egy tömör színsík,
+  amelyet csak a kirajzolás használ
+
+Az ütközésvizsgálat, a teli sorok keresése és a sorok törlése a BitBoard
+esetén egész számokon végzett bitműveletekké egyszerűsödik.
+"""
+from abc import ABC, abstractmethod
+
+from config import SHAPE_COLORS, GRID_WIDTH, GRID_HEIGHT, GARBAGE_COLOR_INDEX
+from shapes import COMPILED_SHAPES, X_OFFSET
+from zobrist import CELL_KEYS, ROW_KEYS, board_hash
+
+EMPTY = (0, 0, 0)
+FULL_ROW = (1 << GRID_WIDTH) - 1
+
+# RGB szín -> színindex (alakzat indexe + 1, üres cellánál 0)
+COLOR_INDICES = {color: index for index, color in enumerate((EMPTY,) + tuple(SHAPE_COLORS))}
+
+
+class Board(ABC):
+    """
+    A háttértárak közös része: oszlopmagasságok, verziószámláló és hash.
+    Absztrakt osztály: a háttértárfüggő műveleteket a leszármazottak valósítják meg.
+
+    A column_heights[x] az x. oszlop legfelső foglalt cellájának magassága a
+    játéktér aljától (üres oszlopnál 0), rögzítéskor helyben frissül. A
+    version minden tartalmi változáskor nő, így a belőle számolt értékek
+    (pl. esési távolság) a verzió alapján gyorsítótárazhatók. A hash a
+    foglaltság Zobrist hash-e (lásd zobrist.py), amelyet a rögzítés és a
+    sortörlés csak a megváltozott cellákkal frissít; azonos állásoknak
+    azonos a hash-e, így keresésben kulcsként használható.
+    """
+    def __init__(self):
+        """Közös állapot inicializálása üres játéktérhez."""
+        self.column_heights = [0] * GRID_WIDTH
+        self.version = 0
+        self.hash = 0
+
+    @abstractmethod
+    def row_mask(self, y):
+        """
+        Egy sor foglaltsága bitmaszkként.
+
+        Args:
+            y: A sor indexe
+
+        Returns:
+            int: A j. bit jelzi, hogy a (j, y) cella foglalt
+        """
+
+    @abstractmethod
+    def row_colors(self, y):
+        """
+        Egy sor celláinak színindexei.
+
+        Args:
+            y: A sor indexe
+
+        Returns:
+            bytes: Cellánként a színindex (alakzat indexe + 1, üres cellánál 0)
+        """
+
+    @abstractmethod
+    def copy_from(self, other):
+        """
+        Egy azonos háttértárú játéktér tartalmának átmásolása (pl. próbalépésekhez
+        egy újrahasznált munkapéldányba, új objektum létrehozása nélkül).
+
+        Args:
+            other: A másolandó játéktér
+        """
+
+    @abstractmethod
+    def add_garbage(self, count, hole):
+        """
+        Szemétsorok beszúrása alulra (többjátékos módban); a meglévő sorok
+        felfelé tolódnak.
+
+        Args:
+            count: A beszúrt sorok száma
+            hole: Az üres oszlop indexe a beszúrt sorokban
+
+        Returns:
+            bool: False ha foglalt cella tolódott a játéktér fölé (játék vége)
+        """
+
+    def recompute_heights(self):
+        """Oszlopmagasságok újraszámolása (sortörlés vagy betöltés után)."""
+        heights = [0] * GRID_WIDTH
+        remaining = FULL_ROW
+        for y in range(GRID_HEIGHT):
+            found = self.row_mask(y) & remaining
+            while found:
+                low = found & -found
+                heights[low.bit_length() - 1] = GRID_HEIGHT - y
+                found ^= low
+                remaining ^= low
+            if not remaining:
+                break
+        self.column_heights = heights
+
+    def raise_heights(self, piece):
+        """
+        Oszlopmagasságok frissítése egy elem rögzítése után.
+
+        Args:
+            piece: A rögzített elem
+        """
+        heights = self.column_heights
+        shape = COMPILED_SHAPES[piece.shape_index][piece.rotation]
+        for j, i in shape.cells:
+            height = GRID_HEIGHT - piece.y - i
+            if height > heights[piece.x + j]:
+                heights[piece.x + j] = height
+
+    def landing_row(self, piece):
+        """
+        Az elem érkezési sora az oszlopmagasságok és az alsó profil alapján.
+
+        Csak akkor számolható így, ha az elem minden oszlopában a felszín
+        felett van; alámetszés alá csúsztatott elemnél None a visszatérési érték.
+
+        Args:
+            piece: Az elem (az aktuális pozíciójának érvényesnek kell lennie)
+
+        Returns:
+            int: Az elem y koordinátája érkezéskor, vagy None
+        """
+        heights = self.column_heights
+        x, y = piece.x, piece.y
+        landing = GRID_HEIGHT
+        for j, bottom in COMPILED_SHAPES[piece.shape_index][piece.rotation].bottom:
+            surface = GRID_HEIGHT - heights[x + j]
+            if y + bottom >= surface:
+                return None
+            if surface - 1 - bottom < landing:
+                landing = surface - 1 - bottom
+        return landing
+
+
+class GridBoard(Board):
+    """
+    Játéktér a klasszikus ábrázolással: 20x10-es RGB rács, soronkénti
+    kitöltöttség-számlálóval. A rácsot rögzítéskor helyben frissítjük, a teli
+    sorokat a számlálók alapján, a rács bejárása nélkül találjuk meg.
+    """
+    def __init__(self):
+        """Üres játéktér létrehozása."""
+        super().__init__()
+        self.grid = self.create_grid()
+        self.row_counts = [0] * GRID_HEIGHT
+
+    def create_grid(self):
+        """
+        Üres rács létrehozása.
+
+        Returns:
+            list: 20x10-es mátrix, amely a játékteret reprezentálja
+        """
+        return [[EMPTY] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
+
+    def fits(self, piece, x_offset=0, y_offset=0):
+        """
+        Ellenőrzi, hogy az elem elfér-e az eltolt pozícióban.
+
+        Args:
+            piece: Az ellenőrizendő elem
+            x_offset: X irányú elmozdulás
+            y_offset: Y irányú elmozdulás
+
+        Returns:
+            bool: True ha a pozíció érvényes
+        """
+        grid = self.grid
+        x = piece.x + x_offset
+        y = piece.y + y_offset
+        for j, i in COMPILED_SHAPES[piece.shape_index][piece.rotation].cells:
+            new_x = x + j
+            new_y = y + i
+
+            if new_x < 0 or new_x >= GRID_WIDTH:
+                return False
+
+            if new_y >= GRID_HEIGHT:
+                return False
+
+            # Csak a látható rácson belül (y >= 0) vizsgálunk ütközést
+            if new_y >= 0 and grid[new_y][new_x] != EMPTY:
+                return False
+
+        return True
+
+    def place(self, piece):
+        """
+        Az elem celláinak zárolása (a rács helyben frissül).
+
+        Args:
+            piece: A rögzítendő elem
+
+        Returns:
+            bool: False ha az elem egy része a játéktér felett van (játék vége)
+        """
+        shape = COMPILED_SHAPES[piece.shape_index][piece.rotation]
+        x, y = piece.x, piece.y
+        if y + shape.min_y < 0:
+            return False
+
+        grid = self.grid
+        row_counts = self.row_counts
+        value = self.hash
+        for j, i in shape.cells:
+            grid[y + i][x + j] = piece.color
+            row_counts[y + i] += 1
+            value ^= CELL_KEYS[y + i][x + j]
+        self.hash = value
+
+        self.raise_heights(piece)
+        self.version += 1
+        return True
+
+    def clear_lines(self):
+        """
+        Befejezett sorok törlése egyetlen, alulról felfelé haladó tömörítéssel.
+
+        Returns:
+            int: A kitörölt sorok száma
+        """
+        row_counts = self.row_counts
+        if GRID_WIDTH not in row_counts:
+            return 0
+
+        grid = self.grid
+        value = self.hash
+        write = GRID_HEIGHT - 1
+        for read in range(GRID_HEIGHT - 1, -1, -1):
+            if row_counts[read] != GRID_WIDTH:
+                if write != read:
+                    # Az elmozduló sor cellái a régi helyükről az újra kerülnek
+                    mask = self.row_mask(read)
+                    value ^= ROW_KEYS[read][mask] ^ ROW_KEYS[write][mask]
+                    grid[write] = grid[read]
+                    row_counts[write] = row_counts[read]
+                write -= 1
+            else:
+                value ^= ROW_KEYS[read][FULL_ROW]
+        self.hash = value
+
+        # A felül felszabadult sorok kiürítése
+        cleared = write + 1
+        for y in range(cleared):
+            grid[y] = [EMPTY] * GRID_WIDTH
+            row_counts[y] = 0
+
+        self.recompute_heights()
+        self.version += 1
+        return cleared
+
+    def copy_from(self, other):
+        """
+        Egy másik GridBoard tartalmának átmásolása.
+
+        Args:
+            other: A másolandó játéktér
+        """
+        self.grid = [row[:] for row in other.grid]
+        self.row_counts[:] = other.row_counts
+        self.column_heights[:] = other.column_heights
+        self.hash = other.hash
+        self.version += 1
+
+    def add_garbage(self, count, hole):
+        """
+        Szemétsorok beszúrása alulra (lásd Board.add_garbage()).
+
+        Args:
+            count: A beszúrt sorok száma
+            hole: Az üres oszlop indexe a beszúrt sorokban
+
+        Returns:
+            bool: False ha foglalt cella tolódott a játéktér fölé (játék vége)
+        """
+        overflow = any(self.row_counts[:count])
+        color = SHAPE_COLORS[GARBAGE_COLOR_INDEX - 1]
+        garbage = [[EMPTY if x == hole else color for x in range(GRID_WIDTH)] for _ in range(count)]
+        self.grid = self.grid[count:] + garbage
+        self.row_counts = self.row_counts[count:] + [GRID_WIDTH - 1] * count
+        self.recompute_heights()
+        self.hash = board_hash(self)
+        self.version += 1
+        return not overflow
+
+    def load_rows(self, row_masks, color_index=1):
+        """
+        A játéktér feltöltése soronkénti bitmaszkokból (pl. tesztálláshoz).
+
+        Args:
+            row_masks: 20 egész szám, a j. bit a sor j. celláját jelöli
+            color_index: A kitöltött cellák színindexe (alakzat indexe + 1)
+        """
+        color = SHAPE_COLORS[color_index - 1]
+        self.grid = [[color if mask >> x & 1 else EMPTY for x in range(GRID_WIDTH)]
+                     for mask in row_masks]
+        self.row_counts = [bin(mask).count('1') for mask in row_masks]
+        self.recompute_heights()
+        self.hash = board_hash(self)
+        self.version += 1
+
+    def row_mask(self, y):
+        """
+        Egy sor foglaltsága bitmaszkként.
+
+        Args:
+            y: A sor indexe
+
+        Returns:
+            int: A j. bit jelzi, hogy a (j, y) cella foglalt
+        """
+        mask = 0
+        for x, color in enumerate(self.grid[y]):
+            if color != EMPTY:
+                mask |= 1 << x
+        return mask
+
+    def row_colors(self, y):
+        """
+        Egy sor celláinak színindexei.
+
+        Args:
+            y: A sor indexe
+
+        Returns:
+            bytes: Cellánként a színindex (alakzat indexe + 1, üres cellánál 0)
+        """
+        return bytes(COLOR_INDICES[color] for color in self.grid[y])
+
+    def occupancy(self):
+        """
+        A rács foglaltsága.
+
+        Returns:
+            list: 20x10-es mátrix, 1 a foglalt, 0 az üres cellákra
+        """
+        return [[0 if color == EMPTY else 1 for color in row] for row in self.grid]
+
+
+class BitBoard(Board):
+    """
+    Játéktér soronkénti bitmaszkokkal.
+    A rows[y] egész j. bitje jelzi, hogy az (j, y) cella foglalt. A cellák
+    színindexét (alakzat indexe + 1, üres cellánál 0) a soronkénti colors[y]
+    bytearray-ek tárolják, ebből csak a kirajzoláshoz készül RGB rács.
+    """
+    def __init__(self):
+        """Üres játéktér létrehozása."""
+        super().__init__()
+        self.rows = [0] * GRID_HEIGHT
+        self.colors = [bytearray(GRID_WIDTH) for _ in range(GRID_HEIGHT)]
+        self._grid = None
+
+    @property
+    def grid(self):
+        """
+        A kirajzoláshoz használt 20x10-es RGB rács (változásig gyorsítótárazva).
+
+        Returns:
+            list: Soronként a cellák színei, üres cellánál (0, 0, 0)
+        """
+        if self._grid is None:
+            palette = (EMPTY,) + tuple(SHAPE_COLORS)
+            self._grid = [[palette[index] for index in row] for row in self.colors]
+        return self._grid
+
+    def fits(self, piece, x_offset=0, y_offset=0):
+        """
+        Ellenőrzi, hogy az elem elfér-e az eltolt pozícióban.
+
+        Args:
+            piece: Az ellenőrizendő elem
+            x_offset: X irányú elmozdulás
+            y_offset: Y irányú elmozdulás
+
+        Returns:
+            bool: True ha a pozíció érvényes
+        """
+        x = piece.x + x_offset + X_OFFSET
+        if not 0 <= x < X_OFFSET + GRID_WIDTH:
+            return False
+        shape = COMPILED_SHAPES[piece.shape_index][piece.rotation]
+        masks = shape.fit_masks[x]
+        if masks is None:
+            return False
+
+        y = piece.y + y_offset
+        if y + shape.max_y >= GRID_HEIGHT:
+            return False
+
+        rows = self.rows
+        if y >= 0:
+            for i, mask in masks:
+                if rows[y + i] & mask:
+                    return False
+        else:
+            # A játéktér feletti cellák nem ütközhetnek
+            for i, mask in masks:
+                if y + i >= 0 and rows[y + i] & mask:
+                    return False
+        return True
+
+    def place(self, piece):
+        """
+        Az elem celláinak zárolása.
+
+        Args:
+            piece: A rögzítendő elem
+
+        Returns:
+            bool: False ha az elem egy része a játéktér felett van (játék vége)
+        """
+        shape = COMPILED_SHAPES[piece.shape_index][piece.rotation]
+        x, y = piece.x, piece.y
+        if y + shape.min_y < 0:
+            return False
+
+        color = piece.shape_index + 1
+        rows = self.rows
+        value = self.hash
+        for i, mask in shape.fit_masks[x + X_OFFSET]:
+            rows[y + i] |= mask
+            value ^= ROW_KEYS[y + i][mask]
+        self.hash = value
+
+        colors = self.colors
+        for j, i in shape.cells:
+            colors[y + i][x + j] = color
+
+        self.raise_heights(piece)
+        self.version += 1
+        self._grid = None
+        return True
+
+    def clear_lines(self):
+        """
+        Befejezett sorok törlése egyetlen, alulról felfelé haladó tömörítéssel.
+
+        Returns:
+            int: A kitörölt sorok száma
+        """
+        rows = self.rows
+        if FULL_ROW not in rows:
+            return 0
+
+        colors = self.colors
+        value = self.hash
+        write = GRID_HEIGHT - 1
+        for read in range(GRID_HEIGHT - 1, -1, -1):
+            row = rows[read]
+            if row != FULL_ROW:
+                if write != read:
+                    # Az elmozduló sor cellái a régi helyükről az újra kerülnek
+                    value ^= ROW_KEYS[read][row] ^ ROW_KEYS[write][row]
+                    rows[write] = row
+                    colors[write] = colors[read]
+                write -= 1
+            else:
+                value ^= ROW_KEYS[read][FULL_ROW]
+        self.hash = value
+
+        # A felül felszabadult sorok kiürítése
+        cleared = write + 1
+        for y in range(cleared):
+            rows[y] = 0
+            colors[y] = bytearray(GRID_WIDTH)
+
+        self.recompute_heights()
+        self.version += 1
+        self._grid = None
+        return cleared
+
+    def copy_from(self, other):
+        """
+        Egy másik BitBoard tartalmának átmásolása.
+
+        Args:
+            other: A másolandó játéktér
+        """
+        self.rows[:] = other.rows
+        self.colors = [bytearray(row) for row in other.colors]
+        self.column_heights[:] = other.column_heights
+        self.hash = other.hash
+        self.version += 1
+        self._grid = None
+
+    def add_garbage(self, count, hole):
+        """
+        Szemétsorok beszúrása alulra (lásd Board.add_garbage()).
+
+        Args:
+            count: A beszúrt sorok száma
+            hole: Az üres oszlop indexe a beszúrt sorokban
+
+        Returns:
+            bool: False ha foglalt cella tolódott a játéktér fölé (játék vége)
+        """
+        rows = self.rows
+        overflow = any(rows[:count])
+        mask = FULL_ROW ^ (1 << hole)
+        rows[:] = rows[count:] + [mask] * count
+        colors = bytes(0 if x == hole else GARBAGE_COLOR_INDEX for x in range(GRID_WIDTH))
+        self.colors = self.colors[count:] + [bytearray(colors) for _ in range(count)]
+        self.recompute_heights()
+        self.hash = board_hash(self)
+        self.version += 1
+        self._grid = None
+        return not overflow
+
+    def load_rows(self, row_masks, color_index=1):
+        """
+        A játéktér feltöltése soronkénti bitmaszkokból (pl. tesztálláshoz).
+
+        Args:
+            row_masks: 20 egész szám, a j. bit a sor j. celláját jelöli
+            color_index: A kitöltött cellák színindexe (alakzat indexe + 1)
+        """
+        self.rows = list(row_masks)
+        self.colors = [bytearray(color_index if mask >> x & 1 else 0 for x in range(GRID_WIDTH))
+                       for mask in row_masks]
+        self.recompute_heights()
+        self.hash = board_hash(self)
+        self.version += 1
+        self._grid = None
+
+    def row_mask(self, y):
+        """
+        Egy sor foglaltsága bitmaszkként.
+
+        Args:
+            y: A sor indexe
+
+        Returns:
+            int: A j. bit jelzi, hogy a (j, y) cella foglalt
+        """
+        return self.rows[y]
+
+    def row_colors(self, y):
+        """
+        Egy sor celláinak színindexei.
+
+        Args:
+            y: A sor indexe
+
+        Returns:
+            bytes: Cellánként a színindex (alakzat indexe + 1, üres cellánál 0)
+        """
+        return bytes(self.colors[y])
+
+    def occupancy(self):
+        """
+        A rács foglaltsága.
+
+        Returns:
+            list: 20x10-es mátrix, 1 a foglalt, 0 az üres cellákra
+        """
+        return [[(row >> x) & 1 for x in range(GRID_WIDTH)] for row in self.rows]
+
+
+# A config.BOARD_BACKEND értékei és a hozzájuk tartozó osztályok
+BOARD_BACKENDS = {
+    'grid': GridBoard,
+    'bitboard': BitBoard,
+}
@@ -1,8 +1,6 @@
-import pygame
-
-# Initialize pygame before trying to use fonts
-pygame.init()
-pygame.font.init()  # Explicitly initialize the font module
+# A config nem importálja a pygame-et: a fej nélküli motor (szimuláció,
+# mérések) így pygame nélkül és a betöltési ideje nélkül is használható.
+# A pygame-et igénylő részek (get_font) csak híváskor importálják.
 
 # Játék alapbeállítások
 SCREEN_WIDTH = 800
@@ -10,6 +8,9 @@ SCREEN_HEIGHT = 700
 PLAY_WIDTH = 300  # játéktér szélessége (10 blokk, egyenként 30 pixel)
 PLAY_HEIGHT = 600  # játéktér magassága (20 blokk, egyenként 30 pixel)
 BLOCK_SIZE = 30
+GRID_WIDTH = 10   # játéktér szélessége cellákban
+GRID_HEIGHT = 20  # játéktér magassága cellákban
+BOARD_BACKEND = 'bitboard'  # játéktér háttértára: 'bitboard' vagy 'grid'
 PREVIEW_SIZE = 4 * BLOCK_SIZE
 INITIAL_Y_OFFSET = -2  # Kezdő Y pozíció az elemeknek
 
@@ -25,6 +26,20 @@ DARK_GRAY = (40, 40, 40)
 LIGHT_GRAY = (200, 200, 200)
 BG_COLOR_1 = (25, 25, 40)  # Sötét kék/lila háttér
 BG_COLOR_2 = (45, 45, 80)  # Világosabb kék/lila átmenethez
+BOARD_LAYER_KEY = (255, 0, 255)  # a játéktér réteg átlátszó kulcsszíne
+
+# Háttér
+BACKGROUND_QUALITY = 'high'  # 'high': animált hullámzás, 'low': álló háttér (gyengébb gépekre)
+BACKGROUND_FRAMES = 64       # előre kiszámolt hullámfázisok száma egy perióduson
+BACKGROUND_GRID_ALPHA = 10   # a háttér rácsmintájának átlátszatlansága (0-255)
+
+# Teljesítménymérés (profiler.py)
+PROFILER_SAMPLES = 8192  # a körpufferben tartott minták száma (fázisok és UI hívások)
+PROFILER_FRAMES = 240    # a statisztikához megtartott utolsó képkockák száma
+PROFILER_TRACE_FILE = 'frame_trace.json'  # a Chrome trace export alapértelmezett fájlja
+
+# Szöveg
+TEXT_CACHE_SIZE = 256  # a gyorsítótárban tartott előre renderelt feliratok legnagyobb száma
 
 # Modern színpaletta
 MODERN_RED = (231, 76, 60)
@@ -155,7 +170,56 @@ SHAPE_COLORS = [
 INITIAL_SPEED = 500  # kezdeti esési sebesség (ms)
 MIN_SPEED = 100      # minimális esési sebesség (ms)
 SPEED_FACTOR = 20    # gyorsulás mértéke szintenként
-MOVE_REPEAT_DELAY = 100  # gombok ismétlési ideje (ms)
+DAS_DELAY = 170         # a lenyomva tartott mozgás első ismétléséig eltelt idő (ms, DAS)
+ARR_DELAY = 50          # ezután a mozgás ismétlési ideje (ms, ARR)
+SOFT_DROP_DELAY = 50    # a lenyomva tartott gyors esés ismétlési ideje (ms)
+
+# Időzítés: a játéklogika rögzített lépésközű virtuális órán fut, a kirajzolástól függetlenül
+TICK_RATE = 200                 # logikai lépések (tick) másodpercenként
+TICK_MS = 1000 // TICK_RATE     # egy tick hossza (ms); a fenti ms értékek ennek többszörösei
+RENDER_FPS = 60                 # a kirajzolás felső korlátja normál módban
+MAX_FRAME_MS = 250              # egy képkocka alatt legfeljebb ennyi időnyi tick fut (lefagyás után)
+FAST_FORWARD_TICKS = 2000       # gyorsított módban képkockánként futtatott tickek
+FAST_FORWARD_DRAW_MS = 100      # gyorsított módban ennyi időnként rajzolunk
+DAS_TICKS = DAS_DELAY // TICK_MS              # a billentyűismétlés idői tickekben
+ARR_TICKS = ARR_DELAY // TICK_MS
+SOFT_DROP_TICKS = SOFT_DROP_DELAY // TICK_MS
+
+# Bemenet (input_handler.py)
+INPUT_POLL_MS = 1               # a képkockák közötti várakozás alatt ennyi időnként olvassuk az eseményeket
+INPUT_LATENCY_SAMPLES = 1024    # a bemenet-megjelenítés késleltetésmérés körpufferének mérete
+
+# Többjátékos mód (server.py): a többsoros törlések szemétsorokat küldenek az ellenfélnek
+GARBAGE_LINES = (0, 0, 1, 2, 4)  # kitörölt sorok száma -> küldött szemétsorok
+GARBAGE_COLOR_INDEX = 1          # a szemétsorok színindexe (alakzat indexe + 1, a kirajzolás ezeket ismeri)
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 7474
+SERVER_STATE_INTERVAL = 10       # ennyi tickenként megy állapotüzenet a klienseknek (20/s)
+SERVER_MAX_INPUTS_PER_TICK = 4   # játékosonként tickenként legfeljebb ennyi akció (a többi a következő tickre marad)
+SERVER_MAX_QUEUED_INPUTS = 64    # ennél több várakozó akció esetén a további bemenet eldobódik
+SERVER_MAX_CATCHUP_TICKS = 20    # lemaradáskor egyszerre legfeljebb ennyi tick fut, a többi kimarad
+SERVER_STATS_INTERVAL = 5        # a szerver statisztikájának kiírási ideje (s)
+
+# Nézők (spectator.py)
+SPECTATOR_KEYFRAME_INTERVAL = 1000  # ennyi tickenként teljes állapot (kulcsképkocka) megy a nézőknek (5 s)
+
+# Játékstatisztikák (stats_store.py)
+STATS_DIR = 'stats'           # a lezárt játékok (és rögzítések) oszlopos tárolójának könyvtára
+STATS_RECORD_LOCKS = False    # minden elemrögzítés naplózása is (nem csak a játékok végeredménye)
+STATS_FLUSH_ROWS = 4096       # ennyi sor gyűlik a memóriában, mielőtt a háttérszál kiírja
+STATS_FLUSH_INTERVAL = 60     # legkésőbb ennyi másodpercenként kiíródnak a gyűjtött sorok
+STATS_COMPACT_SEGMENTS = 64   # ennél több szegmensnél a háttérszál összefűzi a táblát
+
+# Automatikus játékos (ai.py): a heurisztika súlyai és az előretekintés
+AI_WEIGHTS = {
+    'aggregate_height': -0.510066,  # az oszlopmagasságok összege
+    'lines': 0.760666,              # a lépéssel kitörölt sorok
+    'holes': -0.35663,              # fedett üres cellák
+    'bumpiness': -0.184483,         # szomszédos oszlopok magasságkülönbségeinek összege
+}
+AI_LOOKAHEAD = True   # a következő elem elhelyezését is figyelembe veszi
+AI_BEAM_WIDTH = 4     # előretekintéskor ennyi legjobb első lépést vizsgál tovább
+AI_TRANSPOSITION_SIZE = 50000  # a már kiértékelt elhelyezések táblájának mérete (0: kikapcsolva)
 
 # Pontrendszer
 SOFT_DROP_POINTS = 1    # pontok gyors ejtésért (le nyíl)
@@ -166,24 +230,53 @@ TRIPLE_LINE_POINTS = 500  # 3 sor kitörlése
 TETRIS_POINTS = 800       # 4 sor kitörlése
 COMBO_POINTS = 50         # combo bónusz pontonként
 
-# Betűtípusok
-try:
-    # Initialize fonts after pygame is initialized
-    FONT_LARGE = pygame.font.Font(None, 60)
-    FONT_MEDIUM = pygame.font.Font(None, 36)
-    FONT_SMALL = pygame.font.Font(None, 24)
-except pygame.error:
-    print("Warning: Failed to load system font, falling back to default")
-    FONT_LARGE = pygame.font.SysFont('arial', 60)
-    FONT_MEDIUM = pygame.font.SysFont('arial', 36)
-    FONT_SMALL = pygame.font.SysFont('arial', 24)
-except Exception as e:
-    print(f"Warning: Font initialization failed: {e}")
-    # Last resort - if all font initialization fails, create dummy font objects
-    class DummyFont:
-        def render(self, *args, **kwargs):
-            return pygame.Surface((1, 1))
-    FONT_LARGE = FONT_MEDIUM = FONT_SMALL = DummyFont()
+# Betűtípusok (méretek; a betűtípusokat a get_font tölti be első használatkor)
+FONT_SIZE_LARGE = 60
+FONT_SIZE_MEDIUM = 36
+FONT_SIZE_SMALL = 24
+
+_fonts = {}
+
+
+class DummyFont:
+    """Végső tartalék, ha semmilyen betűtípus nem tölthető be."""
+    def render(self, *args, **kwargs):
+        import pygame
+        return pygame.Surface((1, 1))
+
+
+def get_font(size):
+    """
+    Az alapértelmezett betűtípus adott méretben (méretenként egyszer betöltve).
+
+    Az importálás így nem inicializálja a pygame-et és nem tölt be
+    betűtípusokat; ez csak az első kirajzoláskor történik meg.
+
+    Args:
+        size: A betűméret pixelben
+
+    Returns:
+        Font: A betűtípus
+    """
+    font = _fonts.get(size)
+    if font is None:
+        import pygame
+        if not pygame.font.get_init():
+            pygame.font.init()
+        try:
+            font = pygame.font.Font(None, size)
+        except pygame.error:
+            print("Warning: Failed to load system font, falling back to default")
+            font = pygame.font.SysFont('arial', size)
+        except Exception as e:
+            print(f"Warning: Font initialization failed: {e}")
+            font = DummyFont()
+        _fonts[size] = font
+    return font
+
+# Hang (audio.py)
+AUDIO_FREQUENCY = 44100  # mintavételi frekvencia (Hz)
+AUDIO_BUFFER = 256       # a mixer pufferének mérete mintákban (a késleltetés ~ puffer / frekvencia)
 
 # Hangfájlok útvonalai
 SOUND_ROTATE = 'sounds/rotate.wav'
@@ -0,0 +1,440 @@
+"""
+Fej nélküli Tetris játékmotor.
+
+A játékszabályokat (ütközésvizsgálat, elemek rögzítése, sortörlés, pontozás
+és szintlépés) tartalmazza pygame, ablak és hang nélkül, így a játék
+szimulálható grafikus felület nélküli gépeken is. A TetrisGame ennek a
+motornak egy vékony grafikus felülete.
+
+Az idő a motorban virtuális: a gravitációt a tick() lépteti rögzített
+TICK_MS lépésközzel, így a játék sebessége nem függ a képkockaszámtól, és
+szimulációban a valós időnél tetszőlegesen gyorsabban futtatható.
+"""
+import random
+from config import (SHAPES, INITIAL_Y_OFFSET, BOARD_BACKEND, TICK_MS,
+                    INITIAL_SPEED, MIN_SPEED, SPEED_FACTOR,
+                    SOFT_DROP_POINTS, HARD_DROP_POINTS, SINGLE_LINE_POINTS,
+                    DOUBLE_LINE_POINTS, TRIPLE_LINE_POINTS, TETRIS_POINTS,
+                    COMBO_POINTS)
+from piece import Piece
+from board import BOARD_BACKENDS
+
+# Akciók (a step() bemenete)
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_ROTATE = 3
+ACTION_SOFT_DROP = 4
+ACTION_HARD_DROP = 5
+ACTION_GRAVITY = 6
+ACTIONS = (ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE,
+           ACTION_SOFT_DROP, ACTION_HARD_DROP, ACTION_GRAVITY)
+
+# Események bitjelzői (a step() visszatérési értéke)
+EVENT_MOVE = 1
+EVENT_ROTATE = 2
+EVENT_LOCK = 4
+EVENT_CLEAR = 8
+EVENT_HARD_DROP = 16
+EVENT_GAME_OVER = 32
+
+# Kitörölt sorok számához tartozó alappontszámok
+LINE_POINTS = (0, SINGLE_LINE_POINTS, DOUBLE_LINE_POINTS, TRIPLE_LINE_POINTS, TETRIS_POINTS)
+
+
+class TetrisEngine:
+    """
+    A Tetris játékszabályait megvalósító, megjelenítéstől független osztály.
+    Az állapotot a step() metódus lépteti egy-egy akcióval, a visszaadott
+    eseményjelzők alapján a felület hangot játszhat le vagy animálhat.
+    """
+    def __init__(self, seed=None, board_backend=BOARD_BACKEND):
+        """
+        Inicializálja a motort.
+
+        Args:
+            seed: A véletlenszám-generátor kezdőértéke (None esetén véletlen)
+            board_backend: A játéktér háttértára ('bitboard' vagy 'grid')
+        """
+        self.board_class = BOARD_BACKENDS[board_backend]
+        self.events = 0
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """
+        Játék visszaállítása alapállapotba.
+
+        Args:
+            seed: A véletlenszám-generátor kezdőértéke (None esetén véletlen)
+
+        Returns:
+            dict: A kezdőállapot (lásd get_state())
+        """
+        # A véletlen kezdőértéket is megjegyezzük, így minden játék visszajátszható
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.board = self.board_class()
+        self.game_over = False
+
+        # Esési távolság gyorsítótár: (alakzat, forgatás, x) -> érkezési sor,
+        # csak az aktuális board.version-re érvényes
+        self._landing_cache = {}
+        self._landing_cache_version = -1
+        self._ghost = None
+
+        # Játék statisztikák
+        self.score = 0
+        self.lines_cleared = 0
+        self.level = 1
+        self.combo = 0
+        self.pieces = 0
+        # Az utoljára rögzített elem (a helyzetével együtt), pl. a statisztikához
+        self.locked_piece = None
+
+        # Játék sebesség (milliszekundum / leejtés)
+        self.drop_speed = INITIAL_SPEED
+
+        # Virtuális óra: a reset óta eltelt tickek és az utolsó gravitációs ejtés óta eltelt idő (ms)
+        self.ticks = 0
+        self.drop_timer = 0
+
+        self.current_piece = self.get_new_piece()
+        self.next_piece = self.get_new_piece()
+        return self.get_state()
+
+    @property
+    def grid(self):
+        """A játéktér 20x10-es RGB rácsa (a kirajzoláshoz)."""
+        return self.board.grid
+
+    def get_new_piece(self):
+        """
+        Új véletlen elemet hoz létre.
+
+        Returns:
+            Piece: Az új elem
+        """
+        piece = Piece(5, INITIAL_Y_OFFSET, self.rng.randint(0, len(SHAPES) - 1))
+
+        # Ha az új elem nem helyezhető el, vége a játéknak
+        if not self.valid_move(piece):
+            self.game_over = True
+            self.events |= EVENT_GAME_OVER
+        return piece
+
+    def valid_move(self, piece, x_offset=0, y_offset=0):
+        """
+        Ellenőrzi, hogy egy lépés érvényes-e (határon belül és nem ütközik más elemekkel).
+
+        Args:
+            piece: Az ellenőrizendő elem
+            x_offset: X irányú elmozdulás
+            y_offset: Y irányú elmozdulás
+
+        Returns:
+            bool: True ha a lépés érvényes, False ha nem
+        """
+        return self.board.fits(piece, x_offset, y_offset)
+
+    def lock_piece(self):
+        """
+        Az aktuális elem rögzítése, sortörlés, pontozás és új elem létrehozása.
+
+        Returns:
+            int: A kitörölt sorok száma
+        """
+        # Ha az elem bármely része a játéktér felett van, vége a játéknak
+        if not self.board.place(self.current_piece):
+            self.game_over = True
+            self.events |= EVENT_GAME_OVER
+            return 0
+
+        self.pieces += 1
+        self.events |= EVENT_LOCK
+        self.locked_piece = self.current_piece
+
+        cleared_lines = self.clear_lines()
+        self.add_line_score(cleared_lines)
+
+        self.current_piece = self.next_piece
+        self.next_piece = self.get_new_piece()
+        return cleared_lines
+
+    def add_line_score(self, cleared_lines):
+        """
+        Combo, pontszám, szint és esési sebesség frissítése egy rögzítés után.
+
+        Args:
+            cleared_lines: A rögzítéskor kitörölt sorok száma
+        """
+        if cleared_lines > 0:
+            self.combo += 1
+            self.score += LINE_POINTS[cleared_lines] * self.level
+            # Combo bónusz
+            if self.combo > 1:
+                self.score += COMBO_POINTS * self.combo * self.level
+            self.events |= EVENT_CLEAR
+        else:
+            self.combo = 0
+
+        self.lines_cleared += cleared_lines
+        self.level = (self.lines_cleared // 10) + 1
+
+        # Magasabb szinten gyorsabb esés
+        self.drop_speed = max(MIN_SPEED, INITIAL_SPEED - (self.level - 1) * SPEED_FACTOR)
+
+    def clear_lines(self):
+        """
+        Befejezett sorok ellenőrzése és törlése.
+
+        Returns:
+            int: A kitörölt sorok száma
+        """
+        return self.board.clear_lines()
+
+    def add_garbage(self, lines, hole):
+        """
+        Szemétsorok fogadása (többjátékos módban): a sorok alulra kerülnek, a
+        játéktér és vele az aktuális elem felfelé tolódik.
+
+        Args:
+            lines: A szemétsorok száma
+            hole: Az üres oszlop indexe a szemétsorokban
+
+        Returns:
+            int: EVENT_GAME_OVER, ha a játéktér kitolódott a tetején, egyébként 0
+        """
+        if self.game_over or lines <= 0:
+            return 0
+        piece = self.current_piece
+        overflow = not self.board.add_garbage(lines, hole)
+        # Az elem a toronnyal együtt emelkedik, amíg újra el nem fér
+        lift = 0
+        while not self.valid_move(piece, 0, -lift) and lift < lines:
+            lift += 1
+        piece.y -= lift
+        if overflow or not self.valid_move(piece):
+            self.game_over = True
+            return EVENT_GAME_OVER
+        return 0
+
+    def landing_row(self, piece):
+        """
+        Az elem érkezési sora (ahová leejtve kerülne).
+
+        Ha az elem a felszín felett van, az érkezési sor az oszlopmagasságokból
+        számolható, és (alakzat, forgatás, x) szerint gyorsítótárazzuk a
+        játéktér verziójáig. Egyébként soronként lefelé léptetve keressük.
+
+        Args:
+            piece: Az elem (érvényes pozícióban)
+
+        Returns:
+            int: Az elem y koordinátája érkezéskor
+        """
+        board = self.board
+        if board.version != self._landing_cache_version:
+            self._landing_cache.clear()
+            self._landing_cache_version = board.version
+
+        key = (piece.shape_index, piece.rotation, piece.x)
+        landing = self._landing_cache.get(key)
+        if landing is not None and landing >= piece.y:
+            return landing
+
+        landing = board.landing_row(piece)
+        if landing is not None:
+            self._landing_cache[key] = landing
+            return landing
+
+        # Alámetszés alatt: lépésenkénti keresés
+        distance = 0
+        while board.fits(piece, 0, distance + 1):
+            distance += 1
+        return piece.y + distance
+
+    def drop_distance(self, piece=None):
+        """
+        Hány sort eshet még az elem.
+
+        Args:
+            piece: Az elem (alapértelmezés szerint az aktuális elem)
+
+        Returns:
+            int: Az esési távolság sorokban
+        """
+        if piece is None:
+            piece = self.current_piece
+        return self.landing_row(piece) - piece.y
+
+    def hard_drop(self):
+        """Az elem azonnali leejtése a legalsó lehetséges pozícióba és rögzítése."""
+        distance = self.drop_distance()
+        self.current_piece.y += distance
+
+        # Pontok az azonnali ejtésért (cellánként)
+        self.score += HARD_DROP_POINTS * distance
+
+        self.lock_piece()
+        self.events |= EVENT_HARD_DROP
+
+    def rotate(self):
+        """
+        Az aktuális elem forgatása egyszerű fal-rúgásokkal.
+
+        Returns:
+            bool: True ha a forgatás sikerült
+        """
+        piece = self.current_piece
+        old_rotation = piece.rotation
+        piece.rotate()
+
+        if not self.valid_move(piece):
+            # Jobbra, balra, majd felfelé próbáljuk kimozdítani
+            if self.valid_move(piece, 1, 0):
+                piece.move_right()
+            elif self.valid_move(piece, -1, 0):
+                piece.move_left()
+            elif self.valid_move(piece, 0, -1):
+                piece.y -= 1
+            else:
+                piece.rotation = old_rotation
+
+        return piece.rotation != old_rotation
+
+    def update_ghost_piece(self):
+        """
+        Kiszámolja a "szellem" elem pozícióját, amely megmutatja, hová fog esni az aktuális elem.
+
+        Amíg az elem pozíciója és a játéktér nem változik, ugyanazt a
+        (gyorsítótárazott) szellem elemet adja vissza, új számolás nélkül.
+
+        Returns:
+            Piece: A szellem elem, vagy None ha az elem már a helyén van
+        """
+        piece = self.current_piece
+        key = (piece.shape_index, piece.rotation, piece.x, piece.y, self.board.version)
+        if self._ghost is not None and self._ghost[0] == key:
+            return self._ghost[1]
+
+        landing = self.landing_row(piece)
+        ghost_piece = None
+        if landing > piece.y:
+            ghost_piece = piece.clone()
+            ghost_piece.y = landing
+
+        self._ghost = (key, ghost_piece)
+        return ghost_piece
+
+    def step(self, action):
+        """
+        Egy akció végrehajtása.
+
+        Args:
+            action: Az ACTION_* konstansok egyike
+
+        Returns:
+            int: A lépés során bekövetkezett EVENT_* jelzők bitenkénti VAGY kapcsolata
+        """
+        self.events = 0
+        if self.game_over:
+            return self.events
+
+        piece = self.current_piece
+
+        if action == ACTION_LEFT:
+            if self.valid_move(piece, -1, 0):
+                piece.move_left()
+                self.events |= EVENT_MOVE
+
+        elif action == ACTION_RIGHT:
+            if self.valid_move(piece, 1, 0):
+                piece.move_right()
+                self.events |= EVENT_MOVE
+
+        elif action == ACTION_ROTATE:
+            if self.rotate():
+                self.events |= EVENT_ROTATE
+
+        elif action == ACTION_SOFT_DROP:
+            if self.valid_move(piece, 0, 1):
+                piece.move_down()
+                self.score += SOFT_DROP_POINTS
+                self.events |= EVENT_MOVE
+
+        elif action == ACTION_HARD_DROP:
+            self.hard_drop()
+
+        elif action == ACTION_GRAVITY:
+            if self.valid_move(piece, 0, 1):
+                piece.move_down()
+            else:
+                self.lock_piece()
+
+        return self.events
+
+    def tick(self, action=ACTION_NONE):
+        """
+        A virtuális óra léptetése egy tickkel: az akció végrehajtása, majd
+        gravitációs ejtés, ha az utolsó óta több mint drop_speed idő telt el.
+
+        Args:
+            action: Az ebben a tickben végrehajtandó ACTION_* akció
+
+        Returns:
+            int: A tick során bekövetkezett EVENT_* jelzők bitenkénti VAGY kapcsolata
+        """
+        if self.game_over:
+            self.events = 0
+            return 0
+
+        events = self.step(action)
+        self.ticks += 1
+        if not self.game_over:
+            self.drop_timer += TICK_MS
+            if self.drop_timer > self.drop_speed:
+                self.drop_timer = 0
+                events |= self.step(ACTION_GRAVITY)
+        self.events = events
+        return events
+
+    def advance(self, ticks):
+        """
+        Több tick futtatása akció nélkül (pl. szimulációhoz, a valós időnél gyorsabban).
+
+        Args:
+            ticks: A futtatandó tickek száma
+
+        Returns:
+            int: A tickek során bekövetkezett EVENT_* jelzők bitenkénti VAGY kapcsolata
+        """
+        events = 0
+        for _ in range(ticks):
+            events |= self.tick()
+            if self.game_over:
+                break
+        return events
+
+    def get_state(self):
+        """
+        A játék aktuális állapotának pillanatképe (megfigyelés).
+
+        Returns:
+            dict: A rács foglaltsága (20x10, 0/1), az aktuális elem helyzete
+                  (alakzat, x, y, forgatás), a következő elem alakzata és a statisztikák
+        """
+        piece = self.current_piece
+        return {
+            'board': self.board.occupancy(),
+            'piece': (piece.shape_index, piece.x, piece.y, piece.rotation),
+            'next_piece': self.next_piece.shape_index,
+            'score': self.score,
+            'lines_cleared': self.lines_cleared,
+            'level': self.level,
+            'combo': self.combo,
+            'pieces': self.pieces,
+            'ticks': self.ticks,
+            'game_over': self.game_over,
+        }
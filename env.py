@@ -0,0 +1,342 @@
+"""
+Megerősítéses tanuláshoz használható, gym-stílusú környezet a játékszabályok köré.
+
+Egy lépés egy elhelyezés: az akció a forgatást és az x pozíciót kódolja
+(akció = forgatás * X_POSITIONS + x - X_MIN), az elem a kezdősorból azonnal
+leesik. A vektoros környezetben a szabályokat a batch.BatchEngine hajtja
+végre, amely pontosan a TetrisEngine szabályait követi; az egyetlen
+környezet (TetrisEnv) közvetlenül a TetrisEngine-t lépteti.
+
+A megfigyelések a motor saját tömbjeinek nézetei, nem lépésenkénti
+másolatok: a 'board' a játéktér soronkénti bitmaszkja, a 'stats' a
+pontszám, sorok, szint, combo és elemszám tömbje, a 'piece' és a
+'next_piece' egy-egy helyben frissített one-hot puffer (az egyetlen
+környezetnél mind előre lefoglalt, lépésenként helyben frissített tömb). A nézetek a
+környezet teljes élettartama alatt érvényesek, és minden lépés után az
+aktuális állapotot mutatják; ha egy régebbi megfigyelésre van szükség, azt le kell másolni.
+
+NumPy szükséges hozzá (pip install numpy).
+"""
+import random
+
+import numpy as np
+
+from config import SHAPES, GRID_WIDTH, GRID_HEIGHT
+from shapes import COMPILED_SHAPES
+from engine import TetrisEngine
+from batch import BatchEngine, MAX_ROTATIONS, STAT_FIELDS, SPAWN_X
+
+# Az akciókhoz tartozó x tartomány: ahol legalább egy alakzat valamelyik forgatása elfér
+X_MIN = -min(shape.min_x for compiled in COMPILED_SHAPES for shape in compiled)
+X_MAX = GRID_WIDTH - 1 - min(shape.max_x for compiled in COMPILED_SHAPES for shape in compiled)
+X_POSITIONS = X_MAX - X_MIN + 1
+ACTION_COUNT = MAX_ROTATIONS * X_POSITIONS
+
+SHAPE_COUNT = len(SHAPES)
+ONE_HOT = np.eye(SHAPE_COUNT, dtype=np.uint8)
+
+
+class Discrete:
+    """Diszkrét tér: a 0..n-1 egészek."""
+    def __init__(self, n):
+        self.n = n
+        self.shape = ()
+        self.dtype = np.int64
+
+    def sample(self, generator=None, size=None):
+        """
+        Véletlen elem(ek) a térből.
+
+        Args:
+            generator: numpy.random.Generator (alapértelmezés szerint új)
+            size: A minták száma (None esetén egyetlen egész)
+
+        Returns:
+            Az elem vagy elemek tömbje
+        """
+        generator = generator or np.random.default_rng()
+        return generator.integers(0, self.n, size)
+
+    def contains(self, value):
+        return 0 <= int(value) < self.n
+
+
+class Box:
+    """Korlátos tömbtér adott alakkal és típussal."""
+    def __init__(self, low, high, shape, dtype):
+        self.low = low
+        self.high = high
+        self.shape = shape
+        self.dtype = dtype
+
+    def contains(self, value):
+        value = np.asarray(value)
+        return value.shape == self.shape and bool(((value >= self.low) & (value <= self.high)).all())
+
+
+def decode_actions(actions):
+    """
+    Akciók felbontása forgatásra és x pozícióra.
+
+    Args:
+        actions: Akció vagy akciók tömbje
+
+    Returns:
+        tuple: (forgatások, x pozíciók)
+    """
+    rotations, offsets = np.divmod(np.asarray(actions), X_POSITIONS)
+    return rotations, offsets + X_MIN
+
+
+def encode_action(rotation, x):
+    """
+    Egy elhelyezés akcióvá alakítása.
+
+    Args:
+        rotation: A forgatás
+        x: Az x pozíció
+
+    Returns:
+        int: Az akció
+    """
+    return rotation * X_POSITIONS + x - X_MIN
+
+
+def observation_space(num_envs=None):
+    """
+    A megfigyelések tere.
+
+    Args:
+        num_envs: A környezetek száma (None esetén egyetlen környezet)
+
+    Returns:
+        dict: név -> Box
+    """
+    lead = () if num_envs is None else (num_envs,)
+    return {
+        'board': Box(0, (1 << GRID_WIDTH) - 1, lead + (GRID_HEIGHT,), np.uint16),
+        'piece': Box(0, 1, lead + (SHAPE_COUNT,), np.uint8),
+        'next_piece': Box(0, 1, lead + (SHAPE_COUNT,), np.uint8),
+        'stats': Box(0, np.iinfo(np.int64).max, lead + (len(STAT_FIELDS),), np.int64),
+    }
+
+
+class VectorTetrisEnv:
+    """
+    Sok környezet léptetése egyetlen hívással. A véget ért játékok
+    automatikusan újraindulnak (új kezdőértékkel); a záró pontszámuk az info
+    'final_score' elemében van.
+    """
+    def __init__(self, num_envs, max_pieces=None, autoreset=True):
+        """
+        Args:
+            num_envs: A környezetek száma
+            max_pieces: Ennyi elem után a játék csonkolva véget ér (None: nincs korlát)
+            autoreset: A véget ért játékok automatikusan újrainduljanak-e
+        """
+        self.num_envs = num_envs
+        self.max_pieces = max_pieces
+        self.autoreset = autoreset
+        self.action_space = Discrete(ACTION_COUNT)
+        self.observation_space = observation_space(num_envs)
+        self.batch = None
+        self.observation = None
+        self.next_seed = 0
+        self.piece = np.zeros((num_envs, SHAPE_COUNT), dtype=np.uint8)
+        self.next_piece = np.zeros((num_envs, SHAPE_COUNT), dtype=np.uint8)
+
+    def reset(self, seed=None):
+        """
+        Minden környezet újraindítása.
+
+        Args:
+            seed: Az első környezet kezdőértéke, a többié egyesével nő (None esetén véletlen)
+
+        Returns:
+            tuple: (megfigyelés, info)
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        seeds = range(seed, seed + self.num_envs)
+        self.next_seed = seed + self.num_envs
+        if self.batch is None:
+            self.batch = BatchEngine(seeds)
+        else:
+            # A tömbök (és így a korábban kiadott nézetek) megmaradnak
+            self.batch.reset(self.batch.index, seeds)
+        self.update_pieces()
+        self.observation = {
+            'board': self.batch.board,
+            'piece': self.piece,
+            'next_piece': self.next_piece,
+            'stats': self.batch.stats,
+        }
+        return self.observation, {}
+
+    def update_pieces(self):
+        """A one-hot pufferek helyben frissítése az aktuális és a következő elemből."""
+        np.take(ONE_HOT, self.batch.current, axis=0, out=self.piece)
+        np.take(ONE_HOT, self.batch.next, axis=0, out=self.next_piece)
+
+    def step(self, actions):
+        """
+        Egy lépés minden környezetben.
+
+        Args:
+            actions: Környezetenként az akció
+
+        Returns:
+            tuple: (megfigyelés, jutalom (a pontszám változása), véget ért, csonkolva, info)
+        """
+        batch = self.batch
+        rotations, xs = decode_actions(actions)
+        before = batch.score.copy()
+        batch.step(rotations, xs)
+        reward = (batch.score - before).astype(np.float32)
+        terminated = batch.game_over.copy()
+        if self.max_pieces is not None:
+            truncated = ~terminated & (batch.pieces >= self.max_pieces)
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+
+        info = {}
+        done = np.flatnonzero(terminated | truncated)
+        if self.autoreset and len(done):
+            info['final_score'] = np.where(terminated | truncated, batch.score, 0)
+            seeds = range(self.next_seed, self.next_seed + len(done))
+            self.next_seed += len(done)
+            batch.reset(done, seeds)
+        self.update_pieces()
+        return self.observation, reward, terminated, truncated, info
+
+    def action_masks(self):
+        """
+        Az érvényes akciók (ahol az elem a kezdősorban elfér).
+
+        Returns:
+            ndarray: (környezet, akció) logikai tömb
+        """
+        masks = np.zeros((self.num_envs, ACTION_COUNT), dtype=bool)
+        rotations, xs = decode_actions(np.arange(ACTION_COUNT))
+        for action in range(ACTION_COUNT):
+            masks[:, action] = self.batch.fits(np.full(self.num_envs, rotations[action]),
+                                               np.full(self.num_envs, xs[action]))
+        return masks
+
+
+class TetrisEnv:
+    """
+    Egyetlen környezet. A NumPy hívások fix költsége miatt nem a
+    VectorTetrisEnv egy soraként fut, hanem a TetrisEngine bitmaszkos
+    játékterén (ugyanazokkal az elhelyezési szabályokkal, mint a BatchEngine);
+    a motor állapota lépésenként előre lefoglalt tömbökbe íródik, a
+    megfigyelések ezek nézetei.
+    """
+    def __init__(self, max_pieces=None):
+        """
+        Args:
+            max_pieces: Ennyi elem után a játék csonkolva véget ér (None: nincs korlát)
+        """
+        self.max_pieces = max_pieces
+        self.action_space = Discrete(ACTION_COUNT)
+        self.observation_space = observation_space()
+        self.engine = None
+        self.board = np.zeros(GRID_HEIGHT, dtype=np.uint16)
+        self.piece = np.zeros(SHAPE_COUNT, dtype=np.uint8)
+        self.next_piece = np.zeros(SHAPE_COUNT, dtype=np.uint8)
+        self.stats = np.zeros(len(STAT_FIELDS), dtype=np.int64)
+        self.observation = {
+            'board': self.board,
+            'piece': self.piece,
+            'next_piece': self.next_piece,
+            'stats': self.stats,
+        }
+
+    def reset(self, seed=None):
+        """
+        Új játék.
+
+        Args:
+            seed: A játék kezdőértéke (None esetén véletlen)
+
+        Returns:
+            tuple: (megfigyelés, info)
+        """
+        if self.engine is None:
+            self.engine = TetrisEngine(seed, board_backend='bitboard')
+        else:
+            self.engine.reset(seed)
+        self.update_observation()
+        return self.observation, {}
+
+    def update_observation(self):
+        """A megfigyelés tömbjeinek helyben frissítése a motor állapotából."""
+        engine = self.engine
+        self.board[:] = engine.board.rows
+        self.stats[:] = (engine.score, engine.lines_cleared, engine.level,
+                         engine.combo, engine.pieces)
+        self.piece.fill(0)
+        self.piece[engine.current_piece.shape_index] = 1
+        self.next_piece.fill(0)
+        self.next_piece[engine.next_piece.shape_index] = 1
+
+    def place(self, action):
+        """
+        Az aktuális elem áthelyezése a kezdősorban az akció szerinti forgatásba
+        és x pozícióba (mint BatchEngine.placement()).
+
+        Args:
+            action: Az akció
+
+        Returns:
+            bool: True ha az elhelyezés érvényes (különben az elem a kezdőpozícióban marad)
+        """
+        piece = self.engine.current_piece
+        rotation, offset = divmod(int(action), X_POSITIONS)
+        piece.rotation = rotation % len(piece.shape)
+        piece.x = offset + X_MIN
+        if self.engine.valid_move(piece):
+            return True
+        piece.rotation = 0
+        piece.x = SPAWN_X
+        return False
+
+    def step(self, action):
+        """
+        Egy lépés.
+
+        Args:
+            action: Az akció (lásd encode_action())
+
+        Returns:
+            tuple: (megfigyelés, jutalom, véget ért, csonkolva, info)
+        """
+        engine = self.engine
+        if engine.game_over:
+            return self.observation, 0.0, True, False, {}
+        before = engine.score
+        self.place(action)
+        engine.hard_drop()
+        self.update_observation()
+        terminated = engine.game_over
+        truncated = (not terminated and self.max_pieces is not None
+                     and engine.pieces >= self.max_pieces)
+        return self.observation, float(engine.score - before), terminated, truncated, {}
+
+    def action_mask(self):
+        """
+        Az érvényes akciók (ahol az elem a kezdősorban elfér).
+
+        Returns:
+            ndarray: Akciónként logikai érték
+        """
+        mask = np.zeros(ACTION_COUNT, dtype=bool)
+        engine = self.engine
+        if engine.game_over:
+            return mask
+        piece = engine.current_piece
+        rotation, x = piece.rotation, piece.x
+        for action in range(ACTION_COUNT):
+            mask[action] = self.place(action)
+        piece.rotation, piece.x = rotation, x
+        return mask
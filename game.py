@@ -1,448 +1,430 @@
 import pygame
-import random
 import time
-from pygame import mixer
 from config import *
-from piece import Piece
+from engine import (TetrisEngine, EVENT_MOVE, EVENT_ROTATE, EVENT_LOCK, EVENT_CLEAR,
+                    EVENT_HARD_DROP, EVENT_GAME_OVER)
 from ui import UI
+from input_handler import InputHandler
+from audio import create_audio
+from profiler import FrameProfiler
+from replay import Recording, ReplayCursor
+from ai import AutoPlayer
+from stats_store import StatsWriter
+
 
 class TetrisGame:
     """
-    A Tetris játék fő logikáját kezelő osztály.
-    Ez az osztály felelős a játék állapotának kezeléséért, elemek mozgatásáért,
-    játéktér frissítéséért és játékmenet irányításáért.
+    A Tetris játék grafikus felülete.
+    A játékszabályokat a TetrisEngine valósítja meg, ez az osztály a bemenetet
+    akciókká alakítja, időzíti a gravitációt, lejátssza a hangokat és kirajzolja
+    a motor állapotát.
     """
-    def __init__(self):
-        """Inicializálja a játékot."""
-        # Pygame inicializálása
+    def __init__(self, profile=None, sound=True):
+        """
+        Inicializálja a játékot.
+
+        Args:
+            profile: Opcionális indulási mérő (mark(név) metódussal), lásd main.py
+            sound: False esetén néma futás (mixer nélkül, pl. mérésekhez)
+        """
+        mark = profile.mark if profile is not None else lambda name: None
+
+        # Pygame inicializálása (a mixer beállításai előtte, lásd audio.py)
+        self.audio = create_audio(sound)
         pygame.init()
-        mixer.init()
+        mark('pygame.init')
+        
+        # Hangok betöltése a háttérben, amíg a felület elkészül
+        self.audio.start()
         
         # Képernyő létrehozása
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption('Modern Tetris - Készítette: GitHub Copilot')
-        self.clock = pygame.time.Clock()
+        self.input = InputHandler()
+        self.profiler = FrameProfiler()
+        self.fast_forward = False
+        
+        # Felvétel (a játék akciói) és visszajátszás
+        self.record_path = None
+        self.recording = None
+        self.replay = None
+        
+        # Rögzített kezdőérték (--seed): minden új játék ugyanazzal indul
+        self.seed = None
+        
+        # Automatikus játékos (A billentyű vagy --autoplay)
+        self.autoplayer = None
+        
+        # Játékstatisztikák tárolója (enable_stats())
+        self.stats = None
+        mark('display')
         
         # UI inicializálása
         self.ui = UI(self.screen)
+        mark('ui')
+        
+        # Játékmotor (a szabályok pygame nélkül futnak)
+        self.engine = TetrisEngine()
         
         # Játék alapállapotba állítása
         self.reset_game()
-        
-        # Hangok betöltése
-        self._load_sounds()
+        mark('engine')
     
-    def _load_sounds(self):
-        """Hangok betöltése és beállítása."""
-        try:
-            self.rotate_sound = mixer.Sound(SOUND_ROTATE)
-            self.clear_sound = mixer.Sound(SOUND_CLEAR)
-            self.fall_sound = mixer.Sound(SOUND_FALL)
-            self.game_over_sound = mixer.Sound(SOUND_GAME_OVER)
-            self.move_sound = mixer.Sound(SOUND_MOVE)
-            
-            # Hangerő beállítása
-            self.rotate_sound.set_volume(VOLUME_ROTATE)
-            self.clear_sound.set_volume(VOLUME_CLEAR)
-            self.fall_sound.set_volume(VOLUME_FALL)
-            self.game_over_sound.set_volume(VOLUME_GAME_OVER)
-            self.move_sound.set_volume(VOLUME_MOVE)
-        except:
-            # Ha nem sikerül a betöltés, akkor dummy függvények létrehozása
-            self.rotate_sound = self.move_sound = self.clear_sound = self.fall_sound = self.game_over_sound = type('obj', (object,), {
-                'play': lambda: None
-            })
-            print("Nem sikerült a hangfájlokat betölteni. Folytatás hang nélkül.")
-    
-    def reset_game(self):
-        """Játék visszaállítása alapállapotba."""
-        self.locked_positions = {}
-        self.grid = self.create_grid()
-        self.current_piece = self.get_new_piece()
-        self.next_piece = self.get_new_piece()
-        self.game_over = False
+    def reset_game(self, seed=None):
+        """
+        Játék visszaállítása alapállapotba.
+
+        Args:
+            seed: A motor véletlenszám-generátorának kezdőértéke
+                (None esetén a rögzített self.seed, ha az sincs, véletlen)
+        """
+        # Az előző játék felvételét és eredményét új játék előtt mentjük
+        self.save_recording()
+        self.save_game_stats()
+        self.replay = None
+        
+        if seed is None:
+            seed = self.seed
+        self.engine.reset(seed)
+        self.game_recorded = False
+        if self.stats is not None:
+            self.stats.start_game(self.engine)
+        if self.record_path is not None:
+            self.recording = Recording(self.engine.seed)
+        self.ui.invalidate()
         self.paused = False
-        
-        # Játék statisztikák
-        self.score = 0
-        self.lines_cleared = 0
-        self.level = 1
         self.last_score_increase = 0
-        self.combo = 0
         
-        # Játék sebesség (milliszekundum / leejtés)
-        self.drop_speed = INITIAL_SPEED
-        self.last_drop_time = time.time() * 1000
+        # Virtuális óra: a valós időből gyűlő, még le nem futtatott idő (ms)
+        self.tick_accumulator = 0.0
         
-        # Irányítás
-        self.down_pressed = False
-        self.last_move_time = {
-            pygame.K_LEFT: 0,
-            pygame.K_RIGHT: 0,
-            pygame.K_DOWN: 0
-        }
+        # Irányítás: a billentyűk akciói a lenyomás idejének megfelelő tickben hajtódnak végre
+        self.input.reset()
         
-    def create_grid(self):
+    def apply_action(self, action, play_move_sound=True):
         """
-        Üres játéktér létrehozása.
+        Akció továbbítása a motornak és a keletkezett események kezelése.
         
+        Args:
+            action: Az engine.ACTION_* konstansok egyike
+            play_move_sound: Mozgáskor lejátssza-e a mozgás hangját
+            
         Returns:
-            list: 20x10-es mátrix, amely a játékteret reprezentálja
+            int: A motor által visszaadott eseményjelzők
         """
-        return [[(0, 0, 0) for _ in range(10)] for _ in range(20)]
-        
-    def update_grid(self):
-        """Játéktér frissítése a zárolt elemek alapján."""
-        # Először üres rácsot hozunk létre
-        self.grid = self.create_grid()
-        
-        # Hozzáadjuk a zárolt elemeket
-        for (j, i), color in self.locked_positions.items():
-            if i < 20:  # Ellenőrizzük, hogy a rácsmagasságon belül van-e
-                self.grid[i][j] = color
-                
-    def get_new_piece(self):
+        if self.recording is not None:
+            self.recording.record(self.engine.ticks, action)
+        return self.handle_events(self.engine.step(action), play_move_sound)
+
+    def start_recording(self, path):
         """
-        Új véletlen elemet hoz létre.
+        Az akciók rögzítésének bekapcsolása. A felvétel új játék kezdetekor
+        és kilépéskor kerül a fájlba (mindig az utolsó játéké).
         
-        Returns:
-            Piece: Az új elem
+        Args:
+            path: A felvétel fájl útvonala
         """
-        piece = Piece(5, INITIAL_Y_OFFSET, random.randint(0, len(SHAPES) - 1))
-        
-        # Ellenőrizzük, hogy az új elem elhelyezhető-e - ha nem, játék vége
-        if not self.valid_move(piece, self.grid):
-            self.game_over = True
-            self.game_over_sound.play()
-        return piece
-        
-    def valid_move(self, piece, grid, x_offset=0, y_offset=0):
+        self.record_path = path
+        self.reset_game()
+    
+    def save_recording(self):
+        """Az aktuális felvétel lezárása és mentése (ha van)."""
+        if self.recording is None:
+            return
+        self.recording.finish(self.engine)
+        size = self.recording.save(self.record_path)
+        print(f"Felvétel mentve: {self.record_path} ({len(self.recording)} akció, {size} bájt)")
+        self.recording = None
+    
+    def enable_stats(self, directory=STATS_DIR, record_locks=STATS_RECORD_LOCKS):
         """
-        Ellenőrzi, hogy egy lépés érvényes-e (határon belül és nem ütközik más elemekkel).
+        A játékok eredményének (és opcionálisan a rögzítéseknek) mentése a
+        statisztika-tárolóba (stats_store.py). Az írás háttérszálon történik.
         
         Args:
-            piece: Az ellenőrizendő elem
-            grid: A játéktér rácsa
-            x_offset: X irányú elmozdulás
-            y_offset: Y irányú elmozdulás
-            
-        Returns:
-            bool: True ha a lépés érvényes, False ha nem
+            directory: A tároló könyvtára
+            record_locks: Minden elemrögzítés naplózása is
         """
-        for i, row in enumerate(piece.get_shape()):
-            for j, cell in enumerate(row):
-                if cell == '0':
-                    new_x = piece.x + j + x_offset
-                    new_y = piece.y + i + y_offset
-                    
-                    # Ellenőrizzük, hogy vízszintesen érvényes-e a pozíció
-                    if new_x < 0 or new_x >= 10:
-                        return False
-                    
-                    # Ellenőrizzük, hogy az elem nem ütközik-e meglévő elemekkel
-                    # Csak akkor ellenőrizzük, ha a látható rácson belül van (y >= 0)
-                    if new_y >= 0 and new_y < 20 and grid[new_y][new_x] != (0, 0, 0):
-                        return False
-                    
-                    # Ellenőrizzük, hogy az elem elérte-e a játéktér alját
-                    if new_y >= 20:
-                        return False
-                    
-        return True
-        
-    def lock_piece(self):
-        """Az aktuális elem rögzítése és új elem létrehozása."""
-        shape = self.current_piece.get_shape()
-        
-        for i, row in enumerate(shape):
-            for j, cell in enumerate(row):
-                if cell == '0':
-                    # Ellenőrizzük, hogy az elem bármely része a játéktér felett van-e (játék vége)
-                    if self.current_piece.y + i < 0:
-                        self.game_over = True
-                        self.game_over_sound.play()
-                        return
-                    
-                    # Pozíció hozzáadása a zárolt pozíciókhoz
-                    self.locked_positions[(self.current_piece.x + j, self.current_piece.y + i)] = self.current_piece.color
-        
-        # Rács frissítése a zárolt pozíciókkal
-        self.update_grid()
-        
-        # Kitörölt sorok ellenőrzése
-        cleared_lines = self.clear_lines()
-        
-        # Combo számláló frissítése
-        if cleared_lines > 0:
-            self.combo += 1
-        else:
-            self.combo = 0
-            
-        # Pontszám frissítése a kitörölt sorok alapján
-        if cleared_lines == 1:
-            self.score += SINGLE_LINE_POINTS * self.level
-            self.last_score_increase = time.time() * 1000
-            self.clear_sound.play()
-        elif cleared_lines == 2:
-            self.score += DOUBLE_LINE_POINTS * self.level
-            self.last_score_increase = time.time() * 1000
-            self.clear_sound.play()
-        elif cleared_lines == 3:
-            self.score += TRIPLE_LINE_POINTS * self.level
-            self.last_score_increase = time.time() * 1000
-            self.clear_sound.play()
-        elif cleared_lines == 4:  # Tetris!
-            self.score += TETRIS_POINTS * self.level
-            self.last_score_increase = time.time() * 1000
-            self.clear_sound.play()
-        
-        # Combo bónusz hozzáadása
-        if self.combo > 1 and cleared_lines > 0:
-            self.score += COMBO_POINTS * self.combo * self.level
-            self.last_score_increase = time.time() * 1000
-        
-        # Kitörölt sorok és szint frissítése
-        self.lines_cleared += cleared_lines
-        self.level = (self.lines_cleared // 10) + 1
-        
-        # Esési sebesség frissítése a szint alapján (gyorsabb magasabb szinten)
-        self.drop_speed = max(MIN_SPEED, INITIAL_SPEED - (self.level - 1) * SPEED_FACTOR)
-        
-        # Következő elem létrehozása
-        self.current_piece = self.next_piece
-        self.next_piece = self.get_new_piece()
-        
-    def clear_lines(self):
+        self.stats = StatsWriter(directory, record_locks)
+        self.stats.start_game(self.engine)
+    
+    def save_game_stats(self):
+        """Az aktuális játék eredményének rögzítése (egyszer; visszajátszás és üres játék nem számít)."""
+        if (self.stats is None or self.game_recorded or self.replay is not None
+                or not self.engine.pieces):
+            return
+        self.stats.finish_game(self.engine, autoplay=self.autoplayer is not None)
+        self.game_recorded = True
+    
+    def start_replay(self, recording):
         """
-        Befejezett sorok ellenőrzése és törlése.
+        Egy felvétel lejátszása a játékban (a billentyűzet játékirányítása ilyenkor nem hat).
         
-        Returns:
-            int: A kitörölt sorok száma
+        Args:
+            recording: A lejátszandó felvétel (replay.Recording)
         """
-        lines_to_clear = []
-        
-        for i, row in enumerate(self.grid):
-            if all(color != (0, 0, 0) for color in row):
-                lines_to_clear.append(i)
-        
-        if not lines_to_clear:
-            return 0
-            
-        # Teljes sorok eltávolítása és üres sorok hozzáadása felülre
-        for line in sorted(lines_to_clear, reverse=True):
-            # Sor eltávolítása
-            for key in sorted(list(self.locked_positions.keys()), key=lambda x: x[1], reverse=True):
-                x, y = key
-                
-                if y < line:
-                    # A törölt sor feletti blokkok mozgatása lefelé
-                    new_key = (x, y + 1)
-                    self.locked_positions[new_key] = self.locked_positions[key]
-                    del self.locked_positions[key]
-                elif y == line:
-                    # Blokkok eltávolítása a törölt sorból
-                    del self.locked_positions[key]
-        
-        # Rács frissítése
-        self.update_grid()
-        
-        return len(lines_to_clear)
-        
-    def hard_drop(self):
-        """Az elem azonnali leejtése a legalsó lehetséges pozícióba."""
-        # Az elem lefelé mozgatása amíg lehet
-        initial_y = self.current_piece.y
-        while self.valid_move(self.current_piece, self.grid, 0, 1):
-            self.current_piece.y += 1
-        
-        # Pontok hozzáadása az azonnali ejtésért (2 pont celláként)
-        drop_points = HARD_DROP_POINTS * (self.current_piece.y - initial_y)
-        self.score += drop_points
-        
-        # Elem rögzítése és új elem létrehozása
-        self.lock_piece()
-        self.fall_sound.play()
-        
-    def update_ghost_piece(self):
+        self.reset_game(recording.seed)
+        self.replay = ReplayCursor(recording)
+    
+    def handle_events(self, events, play_move_sound=True):
         """
-        Frissíti a "szellem" elem pozícióját, amely megmutatja, hová fog esni az aktuális elem.
+        A motor eseményeinek kezelése (hangok, pontszám-animáció).
         
+        Args:
+            events: A motor EVENT_* jelzői
+            play_move_sound: Mozgáskor lejátssza-e a mozgás hangját
+            
         Returns:
-            Piece: A szellem elem
+            int: Ugyanazok az eseményjelzők
         """
-        ghost_piece = self.current_piece.clone()
-        
-        # A szellem elem lefelé mozgatása amíg lehet
-        while self.valid_move(ghost_piece, self.grid, 0, 1):
-            ghost_piece.y += 1
-        
-        return ghost_piece if ghost_piece.y > self.current_piece.y else None
-        
+        if events & EVENT_MOVE and play_move_sound:
+            self.audio.play('move')
+        if events & EVENT_ROTATE:
+            self.audio.play('rotate')
+        if events & EVENT_CLEAR:
+            self.last_score_increase = time.time() * 1000
+            self.audio.play('clear')
+        if events & EVENT_HARD_DROP:
+            self.audio.play('fall')
+        if events & EVENT_LOCK and self.stats is not None and self.replay is None:
+            self.stats.record_lock(self.engine)
+        if events & EVENT_GAME_OVER:
+            self.audio.play('game_over')
+            self.save_game_stats()
+        return events
+    
     def handle_input(self):
         """
-        Felhasználói bemenet kezelése.
+        Felhasználói bemenet kezelése. A játékirányító billentyűk eseményei
+        időbélyeggel az InputHandler sorába kerülnek, és a lenyomás idejének
+        megfelelő tickben hajtódnak végre (lásd run_tick()); itt a kilépés és
+        a vezérlőbillentyűk feldolgozása történik.
         
         Returns:
             bool: False ha a felhasználó kilépett, egyébként True
         """
-        current_time = time.time() * 1000
-        
-        for event in pygame.event.get():
+        for event in self.input.take_events():
             if event.type == pygame.QUIT:
                 return False
             
             # Billentyű lenyomás események
             if event.type == pygame.KEYDOWN:
-                # Játékirányítás billentyűk
                 if event.key == pygame.K_p:  # Szünet
                     self.paused = not self.paused
                 
                 if event.key == pygame.K_r:  # Újraindítás
                     self.reset_game()
                 
-                # Csak akkor kezeljük a mozgást, ha nincs szüneteltetve és nincs vége a játéknak
-                if not self.paused and not self.game_over:
-                    if event.key == pygame.K_LEFT:
-                        if self.valid_move(self.current_piece, self.grid, -1, 0):
-                            self.current_piece.move_left()
-                            self.move_sound.play()
-                        self.last_move_time[pygame.K_LEFT] = current_time
-                        
-                    elif event.key == pygame.K_RIGHT:
-                        if self.valid_move(self.current_piece, self.grid, 1, 0):
-                            self.current_piece.move_right()
-                            self.move_sound.play()
-                        self.last_move_time[pygame.K_RIGHT] = current_time
-                        
-                    elif event.key == pygame.K_DOWN:
-                        self.down_pressed = True
-                        self.last_move_time[pygame.K_DOWN] = current_time
-                        
-                    elif event.key == pygame.K_UP:  # Forgatás
-                        # Aktuális forgatás mentése
-                        old_rotation = self.current_piece.rotation
-                        
-                        # Forgatás
-                        self.current_piece.rotate()
-                        
-                        # Ha a forgatás nem érvényes, próbáljunk fal-rúgásokat
-                        if not self.valid_move(self.current_piece, self.grid):
-                            # Próbáljunk jobbra mozgatni, ha balra blokkolva van
-                            if self.valid_move(self.current_piece, self.grid, 1, 0):
-                                self.current_piece.move_right()
-                            # Próbáljunk balra mozgatni, ha jobbra blokkolva van
-                            elif self.valid_move(self.current_piece, self.grid, -1, 0):
-                                self.current_piece.move_left()
-                            # Próbáljunk felfelé mozgatni, ha lent blokkolva van
-                            elif self.valid_move(self.current_piece, self.grid, 0, -1):
-                                self.current_piece.y -= 1
-                            else:
-                                # Ha minden sikertelen, visszaállítjuk a forgatást
-                                self.current_piece.rotation = old_rotation
-                        
-                        if self.current_piece.rotation != old_rotation:
-                            self.rotate_sound.play()
-                        
-                    elif event.key == pygame.K_SPACE:  # Azonnali ejtés
-                        self.hard_drop()
-            
-            # Billentyű felengedés események
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_DOWN:
-                    self.down_pressed = False
-        
-        # Lenyomva tartott billentyűk kezelése (folyamatos mozgás)
-        keys = pygame.key.get_pressed()
-        
-        if not self.paused and not self.game_over:
-            # Bal/jobb mozgás ismétlési késleltetéssel
-            if keys[pygame.K_LEFT] and current_time - self.last_move_time[pygame.K_LEFT] > MOVE_REPEAT_DELAY:
-                if self.valid_move(self.current_piece, self.grid, -1, 0):
-                    self.current_piece.move_left()
-                    self.last_move_time[pygame.K_LEFT] = current_time
-            
-            if keys[pygame.K_RIGHT] and current_time - self.last_move_time[pygame.K_RIGHT] > MOVE_REPEAT_DELAY:
-                if self.valid_move(self.current_piece, self.grid, 1, 0):
-                    self.current_piece.move_right()
-                    self.last_move_time[pygame.K_RIGHT] = current_time
-            
-            # Gyors ejtés (gyorsabb esés amikor a le nyíl lenyomva van)
-            if self.down_pressed and current_time - self.last_move_time[pygame.K_DOWN] > MOVE_REPEAT_DELAY / 2:
-                if self.valid_move(self.current_piece, self.grid, 0, 1):
-                    self.current_piece.move_down()
-                    self.score += SOFT_DROP_POINTS  # Kis pontbónusz a gyors ejtésért
-                    self.last_move_time[pygame.K_DOWN] = current_time
+                if event.key == pygame.K_f:  # Gyorsított mód
+                    self.fast_forward = not self.fast_forward
+                
+                if event.key == pygame.K_a:  # Automatikus játékos
+                    self.toggle_autoplayer()
+                
+                if event.key == pygame.K_F3:  # Teljesítménymérés megjelenítése
+                    self.toggle_profiler_overlay()
+                
+                if event.key == pygame.K_F4 and self.profiler.enabled:  # Mérés mentése
+                    count = self.profiler.export_trace(PROFILER_TRACE_FILE)
+                    print(f"{count} mérési esemény mentve: {PROFILER_TRACE_FILE}")
                     
         return True
     
-    def update(self):
-        """Játék állapot frissítése."""
-        current_time = time.time() * 1000
-        
-        # Normál gravitációs ejtés, ha nincs szüneteltetve vagy vége a játéknak
-        if not self.paused and not self.game_over:
-            if current_time - self.last_drop_time > self.drop_speed:
-                self.last_drop_time = current_time
-                
-                if self.valid_move(self.current_piece, self.grid, 0, 1):
-                    self.current_piece.move_down()
-                else:
-                    self.lock_piece()
-                
-    def draw(self):
-        """Játékállapot kirajzolása a képernyőre."""
-        # Háttér rajzolása
-        self.ui.draw_background()
-        
-        # Cím rajzolása
-        self.ui.draw_title()
+    def run_tick(self, tick_time):
+        """
+        Egy logikai tick: az addig lenyomott billentyűk és az esedékes
+        ismétlések akciói, majd a motor virtuális órájának léptetése (gravitáció).
         
-        # Játéktér háttér rajzolása
-        self.screen.blit(self.ui.panel_main, (TOP_LEFT_X - 20, TOP_LEFT_Y - 20))
+        Args:
+            tick_time: A tick időpontja (perf_counter_ns); a később lenyomott billentyűk
+                       a következő tickekre maradnak
+        """
+        if self.replay is not None:
+            # Visszajátszáskor a felvétel adja az akciókat
+            self.input.discard()
+            for action in self.replay.actions_for(self.engine.ticks):
+                self.apply_action(action)
+        elif self.autoplayer is not None:
+            # Az automatikus játékos tickenként egy akciót ad
+            self.input.discard()
+            self.apply_action(self.autoplayer.next_action(self.engine))
+        else:
+            for action, pressed in self.input.actions_for_tick(self.engine.ticks, tick_time):
+                # Az ismétlések (lenyomva tartott billentyű) némák
+                self.apply_action(action, play_move_sound=pressed)
+        self.handle_events(self.engine.tick())
+    
+    def update(self, elapsed_ms, now=None):
+        """
+        Játék állapot frissítése: az eltelt valós időnek megfelelő számú tick futtatása.
         
-        # Rács, elemek és UI elemek rajzolása ha nincs vége a játéknak
-        self.ui.draw_grid_blocks(self.grid)
-        self.ui.draw_grid_lines()
+        Normál módban a képkockák között eltelt idő gyűlik, és minden teljes
+        TICK_MS egy tick (egy képkockára legfeljebb MAX_FRAME_MS-nyi). A tickek
+        a valós időben visszafelé, TICK_MS-onként kapnak időpontot (az utolsó a
+        fel nem használt maradékkal a képkocka előtt van), így a bemenet a
+        lenyomás idejének megfelelő tickben érvényesül.
+        Gyorsított módban képkockánként FAST_FORWARD_TICKS tick fut.
         
-        if not self.game_over:
-            # Szellem elem rajzolása
-            ghost_piece = self.update_ghost_piece()
-            if ghost_piece:
-                self.ui.draw_piece(ghost_piece, ghost=True)
-                
-            # Aktuális elem rajzolása
-            self.ui.draw_piece(self.current_piece)
+        Args:
+            elapsed_ms: Az előző képkocka óta eltelt valós idő (ms)
+            now: A képkocka időpontja (perf_counter_ns, alapértelmezés szerint most)
+            
+        Returns:
+            int: A lefuttatott tickek száma
+        """
+        # Szünetben, a játék és a visszajátszott felvétel végén a virtuális óra áll
+        if (self.paused or self.engine.game_over
+                or (self.replay is not None and self.replay.finished(self.engine.ticks))):
+            self.tick_accumulator = 0.0
+            self.input.discard()
+            return 0
         
-        # UI elemek rajzolása
-        self.ui.draw_next_piece(self.next_piece)
-        self.ui.draw_score(self.score, self.level, self.lines_cleared, self.combo, self.last_score_increase)
-        self.ui.draw_controls()
+        if now is None:
+            now = time.perf_counter_ns()
+        if self.fast_forward:
+            ticks = FAST_FORWARD_TICKS
+            tick_ns = 0
+            last_tick_time = now
+        else:
+            self.tick_accumulator = min(self.tick_accumulator + elapsed_ms, MAX_FRAME_MS)
+            ticks = int(self.tick_accumulator // TICK_MS)
+            self.tick_accumulator -= ticks * TICK_MS
+            tick_ns = TICK_MS * 1_000_000
+            last_tick_time = now - int(self.tick_accumulator * 1_000_000)
+        
+        for done in range(ticks):
+            self.run_tick(last_tick_time - (ticks - 1 - done) * tick_ns)
+            if self.engine.game_over or (self.replay is not None and self.replay.finished(self.engine.ticks)):
+                return done + 1
+        return ticks
+    
+    def toggle_autoplayer(self):
+        """Az automatikus játékos ki- és bekapcsolása (kikapcsoláskor a statisztikája kiíródik)."""
+        if self.autoplayer is None:
+            self.autoplayer = AutoPlayer()
+            return
+        stats = self.autoplayer.stats()
+        print(f"Automatikus játékos: {stats['decisions']} döntés, "
+              f"{stats['placements_per_s']:,.0f} elhelyezés/s, "
+              f"átlag {stats['decision_ms']:.2f} ms, max {stats['worst_decision_ms']:.2f} ms, "
+              f"tábla találat {stats['table_hit_rate']:.1%}")
+        self.autoplayer = None
+    
+    def enable_profiler(self, overlay=True):
+        """
+        A képkockánkénti időmérés bekapcsolása.
+
+        Args:
+            overlay: Megjelenjen-e a mérés a képernyőn
+        """
+        self.profiler.enable(self.ui)
+        self.profiler.overlay_visible = overlay
+        self.ui.show_profiler_keys()
+
+    def toggle_profiler_overlay(self):
+        """A mérés fedőrétegének ki- és bekapcsolása (szükség esetén a méréssel együtt)."""
+        if self.profiler.overlay_visible:
+            self.profiler.overlay_visible = False
+            # A fedőréteg helyét a következő képkocka teljes újrarajzolása tünteti el
+            self.ui.invalidate()
+        else:
+            self.enable_profiler()
+
+    def draw(self):
+        """Játékállapot kirajzolása a képernyőre (rétegekből, csak a változott területek frissítésével)."""
+        dirty = self.ui.render(self.engine, self.paused, self.last_score_increase)
         
-        # Játék vége vagy szüneteltetés képernyő rajzolása, ha szükséges
-        if self.game_over:
-            self.ui.draw_game_over(self.score)
-        elif self.paused:
-            self.ui.draw_pause()
+        if self.profiler.overlay_visible:
+            overlay_rect = self.profiler.draw_overlay(self.screen, self.ui.text_cache)
+            if dirty is not None:
+                dirty.append(overlay_rect)
         
         # Képernyő frissítése
-        pygame.display.update()
+        if dirty is None:
+            pygame.display.update()
+        elif dirty:
+            pygame.display.update(dirty)
+        self.input.presented()
+    
+    def wait_for_frame(self, frame_start):
+        """
+        Várakozás a következő képkocka idejéig (RENDER_FPS). Közben
+        INPUT_POLL_MS-onként kiolvassa a bemenetet, így az események pontos
+        időbélyeget kapnak; ha egy lenyomás már egy ticknyi ideje vár, a
+        várakozás véget ér, hogy az akció minél előbb a képernyőre kerüljön.
+        
+        Args:
+            frame_start: Az aktuális képkocka kezdete (perf_counter_ns)
+        """
+        deadline = frame_start + 1_000_000_000 // RENDER_FPS
+        poll_ns = INPUT_POLL_MS * 1_000_000
+        tick_ns = TICK_MS * 1_000_000
+        handler = self.input
+        while True:
+            handler.pump()
+            now = time.perf_counter_ns()
+            if now >= deadline:
+                return
+            pressed = handler.first_press_time()
+            if pressed is not None and now - pressed >= tick_ns:
+                return
+            time.sleep(min(deadline - now, poll_ns) / 1e9)
+    
+    def print_input_latency(self):
+        """A bemenet-megjelenítés késleltetés statisztikájának kiírása."""
+        stats = self.input.latency_stats()
+        if stats['samples']:
+            print(f"Bemeneti késleltetés ({stats['samples']} lenyomás): "
+                  f"medián {stats['median_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+                  f"p99 {stats['p99_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
     
-    def run(self):
-        """Fő játék ciklus futtatása."""
+    def run(self, trace_path=None):
+        """
+        Fő játék ciklus futtatása.
+
+        A játéklogika a virtuális órán fut (update), a kirajzolás ettől
+        függetlenül normál módban legfeljebb RENDER_FPS képkocka/másodperc,
+        gyorsított módban csak FAST_FORWARD_DRAW_MS időnként történik.
+
+        Args:
+            trace_path: Ha meg van adva, kilépéskor ide mentjük a mérést (Chrome trace)
+        """
         running = True
+        measure = self.profiler.measure
+        previous = last_draw = time.perf_counter_ns()
         
         while running:
-            # Bemenet kezelése
-            running = self.handle_input()
+            # Bemenet kezelése (előbb, hogy a most kiolvasott események ne legyenek a képkocka ideje után)
+            running = measure('input', self.handle_input)
+            
+            now = time.perf_counter_ns()
+            elapsed_ms = (now - previous) / 1_000_000
+            previous = now
             
             # Játék frissítése
-            self.update()
+            measure('update', self.update, elapsed_ms, now)
             
-            # Játék kirajzolása
-            self.draw()
+            # Játék kirajzolása (gyorsított módban ritkítva)
+            if not self.fast_forward or (now - last_draw) / 1_000_000 >= FAST_FORWARD_DRAW_MS:
+                measure('draw', self.draw)
+                last_draw = now
             
-            # Képkocka ráta korlátozása
-            self.clock.tick(60)
+            # Képkocka ráta korlátozása (gyorsított módban nincs várakozás)
+            if not self.fast_forward:
+                measure('tick', self.wait_for_frame, now)
+            self.profiler.end_frame()
+        
+        if trace_path and self.profiler.enabled:
+            self.profiler.export_trace(trace_path)
+        
+        self.save_recording()
+        self.save_game_stats()
+        if self.stats is not None:
+            self.stats.close()
+        if self.autoplayer is not None:
+            self.toggle_autoplayer()
+        if self.profiler.enabled:
+            self.print_input_latency()
         
         # Pygame leállítása, ha kész
-        pygame.quit()
\ No newline at end of file
+        pygame.quit()
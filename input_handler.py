@@ -0,0 +1,185 @@
+"""
+Alacsony késleltetésű bemenetkezelés.
+
+A pygame eseményei nem hordoznak időbélyeget, ezért a sorból való
+kiolvasáskor kapnak egyet (perf_counter_ns). A fő ciklus a képkockák közötti
+várakozás alatt is INPUT_POLL_MS-onként kiolvassa a sort, így az időbélyeg
+pontossága nem a képkockaidő (16,7 ms), hanem ~1 ms.
+
+A játékirányító billentyűk eseményei sorban maradnak, amíg a virtuális óra
+el nem éri az időbélyegüket: egy képkocka tickjei közül az első olyan
+tickben hajtódnak végre, amelynek időpontja nem korábbi a lenyomásnál. A
+lenyomva tartott billentyűk ismétlése tickekben számol: a lenyomás tickjében
+azonnal, DAS_TICKS után először, majd ARR_TICKS-enként ismétlődik.
+
+A lenyomásból keletkezett akciók időbélyegét a kirajzolás utáni presented()
+hívás veti össze a megjelenítés idejével; a bemenet-megjelenítés
+késleltetések körpufferbe kerülnek (latency_stats()).
+"""
+import pygame
+from array import array
+from collections import deque
+from time import perf_counter_ns
+
+from config import DAS_TICKS, ARR_TICKS, SOFT_DROP_TICKS, INPUT_LATENCY_SAMPLES
+from engine import ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_SOFT_DROP, ACTION_HARD_DROP
+from metrics import percentile
+
+# A játékirányító billentyűk akciói
+GAME_KEYS = {
+    pygame.K_LEFT: ACTION_LEFT,
+    pygame.K_RIGHT: ACTION_RIGHT,
+    pygame.K_DOWN: ACTION_SOFT_DROP,
+    pygame.K_UP: ACTION_ROTATE,         # forgatás (fal-rúgásokkal)
+    pygame.K_SPACE: ACTION_HARD_DROP,   # azonnali ejtés
+}
+
+# Az ismétlődő billentyűk: (első ismétlés, további ismétlések) tickekben
+REPEAT_TICKS = {
+    pygame.K_LEFT: (DAS_TICKS, ARR_TICKS),
+    pygame.K_RIGHT: (DAS_TICKS, ARR_TICKS),
+    pygame.K_DOWN: (SOFT_DROP_TICKS, SOFT_DROP_TICKS),
+}
+
+
+class InputHandler:
+    """
+    Időbélyeges billentyűesemények tickenkénti akciókká alakítása,
+    DAS/ARR ismétléssel és bemenet-megjelenítés késleltetésméréssel.
+    """
+    def __init__(self, latency_samples=INPUT_LATENCY_SAMPLES):
+        """
+        Args:
+            latency_samples: A körpufferben tartott késleltetésminták száma
+        """
+        # A játékirányító billentyűk még végre nem hajtott eseményei: (időbélyeg ns, típus, billentyű)
+        self.key_events = deque()
+        # Az egyéb események (kilépés, vezérlőbillentyűk) a következő handle_input()-ig
+        self.other_events = []
+        # Lenyomva tartott ismétlődő billentyűk: billentyű -> a következő ismétlés tickje
+        self.held = {}
+
+        # A már végrehajtott, de még meg nem jelenített lenyomások időbélyegei
+        self.awaiting = []
+        self.latencies = array('q', bytes(8 * latency_samples))
+        self.latency_head = 0
+        self.latency_count = 0
+
+    def pump(self):
+        """A pygame eseménysorának kiolvasása és az események időbélyegezése."""
+        events = pygame.event.get()
+        if not events:
+            return
+        now = perf_counter_ns()
+        for event in events:
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in GAME_KEYS:
+                self.key_events.append((now, event.type, event.key))
+            else:
+                self.other_events.append(event)
+
+    def take_events(self):
+        """
+        A nem játékirányító események átvétele (a fő ciklus dolgozza fel őket).
+
+        Returns:
+            list: pygame események érkezési sorrendben
+        """
+        self.pump()
+        events = self.other_events
+        self.other_events = []
+        return events
+
+    def first_press_time(self):
+        """
+        A legrégebbi végre nem hajtott lenyomás időbélyege.
+
+        Returns:
+            int: perf_counter_ns időbélyeg, vagy None ha nincs ilyen
+        """
+        for timestamp, event_type, _ in self.key_events:
+            if event_type == pygame.KEYDOWN:
+                return timestamp
+        return None
+
+    def actions_for_tick(self, tick, tick_time):
+        """
+        Egy tick akciói: az addig beérkezett lenyomások, majd az esedékes ismétlések.
+
+        Args:
+            tick: A motor tickszámlálója
+            tick_time: A tick időpontja (perf_counter_ns); a későbbi események a sorban maradnak
+
+        Returns:
+            list: (ACTION_* akció, lenyomás-e) párok végrehajtási sorrendben;
+                  az ismétléseknél a második elem False
+        """
+        actions = []
+        key_events = self.key_events
+        held = self.held
+        while key_events and key_events[0][0] <= tick_time:
+            timestamp, event_type, key = key_events.popleft()
+            if event_type == pygame.KEYDOWN:
+                actions.append((GAME_KEYS[key], True))
+                self.awaiting.append(timestamp)
+                if key in REPEAT_TICKS:
+                    held[key] = tick + REPEAT_TICKS[key][0]
+            else:
+                held.pop(key, None)
+
+        for key, due in held.items():
+            if tick >= due:
+                actions.append((GAME_KEYS[key], False))
+                held[key] = tick + REPEAT_TICKS[key][1]
+        return actions
+
+    def discard(self):
+        """
+        A végre nem hajtott lenyomások eldobása (szünetben, visszajátszáskor,
+        automatikus játékosnál); a felengedések érvényesülnek.
+        """
+        for _, event_type, key in self.key_events:
+            if event_type == pygame.KEYUP:
+                self.held.pop(key, None)
+        self.key_events.clear()
+
+    def reset(self):
+        """Új játék: a sorban álló események és a lenyomva tartott billentyűk törlése."""
+        self.key_events.clear()
+        self.held.clear()
+        self.awaiting.clear()
+
+    def presented(self, now=None):
+        """
+        A kirajzolás megjelent: a végrehajtott lenyomások késleltetésének rögzítése.
+
+        Args:
+            now: A megjelenítés ideje (perf_counter_ns, alapértelmezés szerint most)
+        """
+        if not self.awaiting:
+            return
+        if now is None:
+            now = perf_counter_ns()
+        latencies = self.latencies
+        for timestamp in self.awaiting:
+            latencies[self.latency_head] = now - timestamp
+            self.latency_head = (self.latency_head + 1) % len(latencies)
+        self.latency_count = min(self.latency_count + len(self.awaiting), len(latencies))
+        self.awaiting.clear()
+
+    def latency_stats(self):
+        """
+        A bemenet-megjelenítés késleltetés statisztikája az utolsó mintákra.
+
+        Returns:
+            dict: minták száma, medián, p95, p99 és maximum (ms)
+        """
+        samples = sorted(self.latencies[:self.latency_count])
+        if not samples:
+            return {'samples': 0}
+        return {
+            'samples': len(samples),
+            'median_ms': percentile(samples, 0.5) / 1e6,
+            'p95_ms': percentile(samples, 0.95) / 1e6,
+            'p99_ms': percentile(samples, 0.99) / 1e6,
+            'max_ms': samples[-1] / 1e6,
+        }
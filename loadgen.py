@@ -0,0 +1,270 @@
+"""
+Terhelésgenerátor a játékszerverhez (server.py): szimulált kliensek a
+helyi hálózati csatolón (loopback), így a szerver kapacitása valódi hálózat
+nélkül mérhető.
+
+Minden kliens csatlakozik, megvárja a párosítást, majd véletlen akciókat
+küld a megadott ütemben (akció/perc), és méri az állapotüzenetek
+érkezési közét. A szerver SERVER_STATE_INTERVAL tickenként küld állapotot,
+így az üzenetköz a névleges értéktől való eltérése a szerver (és a
+hálózati út) késését mutatja. Meccs végén a kliens újracsatlakozik.
+
+Futtatás a projekt gyökeréből:
+    python loadgen.py --matches 200 --duration 30 --spawn   # saját szerverfolyamattal
+    python loadgen.py --matches 50 --port 7474              # futó szerverhez
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+from array import array
+from time import perf_counter
+
+from config import SERVER_HOST, SERVER_PORT, SERVER_STATE_INTERVAL, TICK_MS
+from engine import ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_SOFT_DROP, ACTION_HARD_DROP
+from server import MSG_START, MSG_STATE, MSG_END, MESSAGE_SIZES, RESULT_DRAW
+from metrics import percentile
+
+# A szimulált játékos akciói és gyakoriságuk
+CLIENT_ACTIONS = bytes((ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_SOFT_DROP, ACTION_HARD_DROP))
+ACTION_WEIGHTS = (3, 3, 2, 1, 1)
+
+DEFAULT_APM = 150  # akció/perc klienseként (gyakorlott emberi játékos)
+STATE_PERIOD = SERVER_STATE_INTERVAL * TICK_MS / 1000
+
+
+class LoadStats:
+    """A szimulált kliensek közös számlálói és az állapotüzenet-közök."""
+    def __init__(self):
+        self.connections = 0
+        self.matches = 0
+        self.finished = 0
+        self.draws = 0
+        self.actions = 0
+        self.states = 0
+        self.intervals = array('d')
+
+
+class SimulatedClient(asyncio.Protocol):
+    """Egy szimulált játékos: véletlen akciók küldése és az üzenetek mérése."""
+    def __init__(self, stats, rng, apm, done):
+        """
+        Args:
+            stats: A közös LoadStats
+            rng: A kliens véletlenszám-generátora
+            apm: Akció/perc
+            done: Future, amely a kapcsolat végén teljesül
+        """
+        self.stats = stats
+        self.rng = rng
+        self.period = 60 / apm
+        self.done = done
+        self.transport = None
+        self.buffer = bytearray()
+        self.sender = None
+        self.last_state = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.stats.connections += 1
+
+    def data_received(self, data):
+        buffer = self.buffer
+        buffer += data
+        while buffer:
+            size = MESSAGE_SIZES.get(buffer[0])
+            if size is None:
+                self.transport.close()
+                return
+            if len(buffer) < size:
+                return
+            self.handle_message(buffer[0], buffer[1:size])
+            del buffer[:size]
+
+    def handle_message(self, message_type, payload):
+        """
+        Egy szerverüzenet feldolgozása.
+
+        Args:
+            message_type: MSG_START, MSG_STATE vagy MSG_END
+            payload: Az üzenet többi része
+        """
+        stats = self.stats
+        if message_type == MSG_START:
+            stats.matches += 1
+            self.sender = asyncio.get_running_loop().call_later(
+                self.rng.random() * self.period, self.send_action)
+        elif message_type == MSG_STATE:
+            now = perf_counter()
+            stats.states += 1
+            if self.last_state is not None:
+                stats.intervals.append(now - self.last_state)
+            self.last_state = now
+        elif message_type == MSG_END:
+            stats.finished += 1
+            if payload[0] == RESULT_DRAW:
+                stats.draws += 1
+
+    def send_action(self):
+        """Egy véletlen akció küldése, majd a következő ütemezése (az ütem körül szórva)."""
+        if self.transport.is_closing():
+            return
+        action = self.rng.choices(CLIENT_ACTIONS, ACTION_WEIGHTS)[0]
+        self.transport.write(bytes((action,)))
+        self.stats.actions += 1
+        self.sender = asyncio.get_running_loop().call_later(
+            self.period * (0.5 + self.rng.random()), self.send_action)
+
+    def connection_lost(self, exc):
+        if self.sender is not None:
+            self.sender.cancel()
+        if not self.done.done():
+            self.done.set_result(None)
+
+
+async def client_loop(stats, host, port, rng, apm, deadline):
+    """
+    Egy kliens: meccsek egymás után a határidőig.
+
+    Args:
+        stats: A közös LoadStats
+        host: A szerver címe
+        port: A szerver portja
+        rng: A kliens véletlenszám-generátora
+        apm: Akció/perc
+        deadline: Eddig (perf_counter) indít új meccset
+    """
+    loop = asyncio.get_running_loop()
+    while perf_counter() < deadline:
+        done = loop.create_future()
+        transport, _ = await loop.create_connection(
+            lambda: SimulatedClient(stats, rng, apm, done), host, port)
+        try:
+            await asyncio.wait_for(done, deadline - perf_counter())
+        except asyncio.TimeoutError:
+            transport.close()
+            return
+
+
+async def wait_for_server(process, timeout=10.0):
+    """
+    Várakozás, amíg az elindított szerver fogadja a kapcsolatokat: a szerver
+    a figyelés megkezdése után kiírja a címét. Próbakapcsolatot nem nyitunk,
+    mert azt a szerver játékosként párba állítaná.
+
+    Args:
+        process: A szerver folyamata (stderr=PIPE)
+        timeout: Legfeljebb ennyi másodperc
+
+    Raises:
+        RuntimeError: Ha a szerver kilépett vagy nem indult el időben
+    """
+    deadline = perf_counter() + timeout
+    while True:
+        line = await asyncio.wait_for(process.stderr.readline(), max(deadline - perf_counter(), 0))
+        if not line:
+            raise RuntimeError("A szerver nem indult el")
+        sys.stderr.write(line.decode())
+        if line.startswith(b'Szerver:'):
+            return
+
+
+async def forward_output(stream):
+    """
+    A szerver kimenetének továbbítása (a statisztikái így a mérés alatt is látszanak).
+
+    Args:
+        stream: A szerver stderr-je
+    """
+    while line := await stream.readline():
+        sys.stderr.write(line.decode())
+
+
+async def run(matches, host=SERVER_HOST, port=SERVER_PORT, duration=10.0, apm=DEFAULT_APM,
+              spawn=False, seed=0):
+    """
+    A terhelésmérés futtatása.
+
+    Args:
+        matches: Az egyszerre futó meccsek száma (a kliensek száma ennek kétszerese)
+        host: A szerver címe
+        port: A szerver portja
+        duration: A mérés hossza (s)
+        apm: Akció/perc kliensenként
+        spawn: Saját szerverfolyamat indítása a mérés idejére
+        seed: A kliensek véletlenszám-generátorainak kezdőértéke
+
+    Returns:
+        LoadStats: A mérés eredménye
+    """
+    process = None
+    forwarder = None
+    if spawn:
+        server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, server_path, '--host', host, '--port', str(port),
+            '--stats-interval', str(max(duration / 2, 1)), stderr=asyncio.subprocess.PIPE)
+    try:
+        if process is not None:
+            await wait_for_server(process)
+            forwarder = asyncio.create_task(forward_output(process.stderr))
+        stats = LoadStats()
+        deadline = perf_counter() + duration
+        clients = [client_loop(stats, host, port, random.Random(seed + i), apm, deadline)
+                   for i in range(2 * matches)]
+        await asyncio.gather(*clients)
+        return stats
+    finally:
+        if process is not None:
+            process.terminate()
+            await process.wait()
+        if forwarder is not None:
+            await forwarder
+
+
+def print_report(stats, duration):
+    """
+    Az eredmény kiírása.
+
+    Args:
+        stats: A LoadStats
+        duration: A mérés hossza (s)
+    """
+    print(f"{stats.connections} kapcsolat, {stats.matches // 2} meccs indult, "
+          f"{stats.finished // 2} véget ért ({stats.draws // 2} döntetlen)")
+    print(f"{stats.actions / duration:,.0f} akció/s, {stats.states / duration:,.0f} állapotüzenet/s")
+    intervals = sorted(stats.intervals)
+    if intervals:
+        print(f"állapotüzenet-köz (névleges {STATE_PERIOD * 1000:.0f} ms): "
+              f"medián {percentile(intervals, 0.5) * 1000:.1f} ms, "
+              f"p99 {percentile(intervals, 0.99) * 1000:.1f} ms, "
+              f"max {intervals[-1] * 1000:.1f} ms")
+
+
+def main(argv=None):
+    """
+    Parancssori belépési pont.
+
+    Returns:
+        int: Kilépési kód
+    """
+    parser = argparse.ArgumentParser(prog='python loadgen.py',
+                                     description='Terhelésgenerátor a játékszerverhez')
+    parser.add_argument('--matches', type=int, default=100, help='egyszerre futó meccsek száma')
+    parser.add_argument('--duration', type=float, default=10.0, help='a mérés hossza (s)')
+    parser.add_argument('--apm', type=float, default=DEFAULT_APM, help='akció/perc kliensenként')
+    parser.add_argument('--host', default=SERVER_HOST, help='a szerver címe')
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help='a szerver portja')
+    parser.add_argument('--spawn', action='store_true', help='saját szerverfolyamat indítása')
+    parser.add_argument('--seed', type=int, default=0, help='a kliensek kezdőértéke')
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(run(args.matches, args.host, args.port, args.duration, args.apm,
+                            args.spawn, args.seed))
+    print_report(stats, args.duration)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Korlátos méretű, LRU kiürítésű gyorsítótár találat/hiány számlálókkal.
+
+A renderelt feliratok (text_cache.TextCache) és a keresés kiértékelt
+állásai (zobrist.TranspositionTable) ugyanerre épülnek.
+"""
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Legfeljebb max_entries bejegyzés; betelt gyorsítótárból a legrégebben
+    használt esik ki.
+    """
+    def __init__(self, max_entries):
+        """
+        Args:
+            max_entries: A tárolt bejegyzések legnagyobb száma
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key, default=None):
+        """
+        Egy bejegyzés lekérdezése (találatkor a bejegyzés frissnek számít).
+
+        Args:
+            key: A kulcs
+            default: Ezt adja vissza, ha a kulcs nincs a gyorsítótárban
+
+        Returns:
+            A tárolt érték, vagy default
+        """
+        entries = self.entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        self.misses += 1
+        return default
+
+    def store(self, key, value):
+        """
+        Egy bejegyzés tárolása; betelt gyorsítótárból a legrégebben használt kiesik.
+
+        Args:
+            key: A kulcs
+            value: Az érték
+        """
+        entries = self.entries
+        entries[key] = value
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Az összes bejegyzés eldobása (a számlálók megmaradnak)."""
+        self.entries.clear()
+
+    def stats(self):
+        """
+        A gyorsítótár statisztikái.
+
+        Returns:
+            dict: bejegyzések száma, találatok, hiányok, kiürítések és találati arány
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -1,4 +1,45 @@
+import time
+
+# Az indulási mérés kezdőpontja (a további importok ideje is beleszámít)
+START_TIME = time.perf_counter()
+
+import argparse
+import pygame
+from config import STATS_DIR, STATS_RECORD_LOCKS
 from game import TetrisGame
+from replay import Recording
+
+
+class StartupProfile:
+    """
+    Indulási időmérés: a main.py betöltésétől az első megjelenített képkockáig.
+    Az egyes szakaszok végét a mark() jelöli.
+    """
+    def __init__(self, start):
+        """
+        Args:
+            start: A mérés kezdete (time.perf_counter() értéke)
+        """
+        self.start = start
+        self.marks = []
+
+    def mark(self, name):
+        """
+        Egy szakasz végének rögzítése.
+
+        Args:
+            name: A szakasz neve
+        """
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self):
+        """Az eltelt idők kiírása szakaszonként és összesítve."""
+        previous = self.start
+        for name, moment in self.marks:
+            print(f"{name:<14} {(moment - previous) * 1000:8.1f} ms  "
+                  f"(összesen {(moment - self.start) * 1000:8.1f} ms)")
+            previous = moment
+
 
 def main():
     """
@@ -6,8 +47,59 @@ def main():
     A moduláris szerkezet lehetővé teszi a különböző komponensek
     elkülönített kezelését és könnyebb karbantartását.
     """
-    game = TetrisGame()
-    game.run()
+    parser = argparse.ArgumentParser(description='Modern Tetris')
+    parser.add_argument('--startup-profile', action='store_true',
+                        help='az indulási idő mérése az első képkockáig, majd kilépés')
+    parser.add_argument('--profile', action='store_true',
+                        help='képkockánkénti időmérés a képernyőn (F3: ki/be, F4: mentés)')
+    parser.add_argument('--profile-trace', metavar='FILE',
+                        help='képkockánkénti időmérés, kilépéskor Chrome trace fájlba mentve')
+    parser.add_argument('--fast-forward', action='store_true',
+                        help='gyorsított mód: a játéklogika a valós időnél gyorsabban fut (F: ki/be)')
+    parser.add_argument('--record', metavar='FILE',
+                        help='a játék akcióinak rögzítése (visszajátszás: --replay vagy python replay.py)')
+    parser.add_argument('--replay', metavar='FILE',
+                        help='egy felvétel lejátszása (F: gyorsított mód)')
+    parser.add_argument('--seed', type=int, metavar='N',
+                        help='rögzített kezdőérték: minden játék (újraindításkor is) ugyanazzal az elemsorrenddel indul')
+    parser.add_argument('--autoplay', action='store_true',
+                        help='az automatikus játékos irányít (A: ki/be)')
+    parser.add_argument('--no-sound', action='store_true',
+                        help='futás hang nélkül (a mixer nem indul el)')
+    parser.add_argument('--stats', metavar='DIR', default=STATS_DIR,
+                        help='a játékok eredményének tárolója (lekérdezés: python stats_store.py)')
+    parser.add_argument('--stats-locks', action='store_true', default=STATS_RECORD_LOCKS,
+                        help='minden elemrögzítés naplózása is a statisztikába')
+    parser.add_argument('--no-stats', action='store_true',
+                        help='a játékok eredménye nem kerül mentésre')
+    args = parser.parse_args()
+
+    if args.startup_profile:
+        profile = StartupProfile(START_TIME)
+        profile.mark('import')
+        game = TetrisGame(profile, sound=not args.no_sound)
+        game.draw()
+        profile.mark('first frame')
+        profile.report()
+        pygame.quit()
+        return
+
+    game = TetrisGame(sound=not args.no_sound)
+    game.fast_forward = args.fast_forward
+    if args.seed is not None:
+        game.seed = args.seed
+        game.reset_game()
+    if not args.no_stats:
+        game.enable_stats(args.stats, args.stats_locks)
+    if args.replay:
+        game.start_replay(Recording.load(args.replay))
+    elif args.record:
+        game.start_recording(args.record)
+    if args.autoplay:
+        game.toggle_autoplayer()
+    if args.profile or args.profile_trace:
+        game.enable_profiler(overlay=args.profile)
+    game.run(trace_path=args.profile_trace)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,22 @@
+"""
+Közös statisztikai segédfüggvények a mérésekhez és a futásidejű
+statisztikákhoz (szerver, terhelésgenerátor, verseny, statisztika-tároló,
+bemeneti késleltetés).
+"""
+
+
+def percentile(ordered, fraction):
+    """
+    Percentilis lineáris interpolációval.
+
+    Args:
+        ordered: Növekvő sorrendbe rendezett minták (lista vagy NumPy tömb)
+        fraction: A kért percentilis 0 és 1 között (pl. 0.95)
+
+    Returns:
+        float: A percentilis értéke
+    """
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
@@ -1,4 +1,5 @@
 from config import SHAPE_COLORS, SHAPES, INITIAL_Y_OFFSET
+from shapes import COMPILED_SHAPES
 
 class Piece:
     """
@@ -30,6 +31,24 @@ class Piece:
         """
         return self.shape[self.rotation % len(self.shape)]
 
+    def get_compiled(self):
+        """
+        Visszaadja az aktuális forgatás előfordított adatait.
+
+        Returns:
+            CompiledShape: Cellák, befoglaló téglalap, sormaszkok és alsó profil
+        """
+        return COMPILED_SHAPES[self.shape_index][self.rotation]
+
+    def get_cells(self):
+        """
+        Visszaadja az elem foglalt celláinak relatív pozícióit.
+
+        Returns:
+            tuple: (oszlop, sor) eltolások az elem x, y pozíciójához képest
+        """
+        return COMPILED_SHAPES[self.shape_index][self.rotation].cells
+
     def rotate(self):
         """
         Elforgatja az elemet az óramutató járásával megegyezően.
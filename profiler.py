@@ -0,0 +1,317 @@
+"""
+Képkockánkénti időmérés: fázisok (bemenet, frissítés, rajzolás, várakozás)
+és az egyes UI.draw_* hívások ideje.
+
+A minták perf_counter_ns időbélyegekkel egy rögzített méretű körpufferbe
+kerülnek, így a mérés memóriája a futás hosszától független. Kikapcsolt
+állapotban a UI metódusai nincsenek becsomagolva, a fázisok mérése pedig
+egyetlen feltételvizsgálat, ezért a költsége elhanyagolható.
+
+A mérés megjeleníthető a képernyőn (FPS, képkockaidő-hisztogram, a
+leglassabb fázis), és kimenthető Chrome trace formátumban
+(chrome://tracing vagy https://ui.perfetto.dev).
+"""
+import json
+import pygame
+from array import array
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter_ns
+
+from config import (PROFILER_SAMPLES, PROFILER_FRAMES, WHITE, LIGHT_GRAY,
+                    MODERN_GREEN, MODERN_YELLOW, MODERN_RED, get_font)
+
+# A minták szintjei
+LEVEL_PHASE = 0  # a fő ciklus fázisai
+LEVEL_UI = 1     # UI.draw_* hívások
+
+# A képkockaidő-hisztogram felső határai (ms); az utolsó vödör a többi
+HISTOGRAM_BOUNDS = (4, 8, 12, 16.7, 25, 33.3, 50)
+FRAME_BUDGET_MS = 1000 / 60
+
+# A fedőréteg ennyi időnként frissül (ns), hogy a feliratokat ne kelljen minden képkockában renderelni
+OVERLAY_REFRESH_NS = 250_000_000
+OVERLAY_POSITION = (10, 10)
+OVERLAY_SIZE = (200, 110)
+
+
+class FrameProfiler:
+    """
+    Fázisok és UI hívások időmérése körpufferrel, képernyős fedőréteggel
+    és Chrome trace exporttal.
+    """
+    def __init__(self, capacity=PROFILER_SAMPLES, frames=PROFILER_FRAMES):
+        """
+        Args:
+            capacity: A körpufferben tartott minták száma
+            frames: A statisztikához megtartott utolsó képkockák száma
+        """
+        self.enabled = False
+        self.overlay_visible = False
+        self.instrumented = []
+
+        # Minták körpuffere (név, kezdet, időtartam, szint, képkocka sorszáma)
+        self.capacity = capacity
+        self.names = [None] * capacity
+        self.starts = array('q', bytes(8 * capacity))
+        self.durations = array('q', bytes(8 * capacity))
+        self.levels = bytearray(capacity)
+        self.sample_frames = array('q', bytes(8 * capacity))
+        self.head = 0
+        self.size = 0
+
+        # Képkockaidők körpuffere
+        self.frame_times = array('q', bytes(8 * frames))
+        self.frame_head = 0
+        self.frame_count = 0
+        self.frame_index = 0
+        self.frame_start = perf_counter_ns()
+
+        self.overlay_surface = None
+        self.overlay_time = 0
+
+    def enable(self, *targets):
+        """
+        A mérés bekapcsolása.
+
+        Args:
+            targets: Objektumok, amelyeknek a draw_* metódusait is mérjük (pl. a UI)
+        """
+        if not self.enabled:
+            for target in targets:
+                self.instrument(target)
+            self.enabled = True
+            self.frame_start = perf_counter_ns()
+
+    def disable(self):
+        """A mérés kikapcsolása és a metódusok becsomagolásának visszavonása."""
+        for target, name in self.instrumented:
+            delattr(target, name)
+        self.instrumented = []
+        self.enabled = False
+        self.overlay_visible = False
+
+    def instrument(self, target, prefix='draw_'):
+        """
+        Egy objektum `prefix`-szel kezdődő metódusainak becsomagolása időméréssel.
+        A csomagolók példányattribútumok, így a disable() egyszerűen törli őket.
+
+        Args:
+            target: A mérendő objektum
+            prefix: A mérendő metódusok névelőtagja
+        """
+        for name in dir(type(target)):
+            if name.startswith(prefix) and callable(getattr(target, name)):
+                setattr(target, name, self.timed(name, getattr(target, name)))
+                self.instrumented.append((target, name))
+
+    def timed(self, name, func, level=LEVEL_UI):
+        """
+        Időmérő csomagoló egy függvény köré.
+
+        Args:
+            name: A minta neve
+            func: A mérendő függvény
+            level: A minta szintje
+
+        Returns:
+            function: A csomagolt függvény
+        """
+        record = self.record
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, start, perf_counter_ns() - start, level)
+        return wrapper
+
+    def measure(self, name, func, *args):
+        """
+        Egy fázis futtatása és mérése (kikapcsolt állapotban csak a futtatás).
+
+        Args:
+            name: A fázis neve
+            func: A fázist végző függvény
+            args: A függvény argumentumai
+
+        Returns:
+            A függvény visszatérési értéke
+        """
+        if not self.enabled:
+            return func(*args)
+        start = perf_counter_ns()
+        result = func(*args)
+        self.record(name, start, perf_counter_ns() - start, LEVEL_PHASE)
+        return result
+
+    def record(self, name, start, duration, level):
+        """
+        Egy minta beírása a körpufferbe.
+
+        Args:
+            name: A minta neve
+            start: A kezdet (perf_counter_ns)
+            duration: Az időtartam nanoszekundumban
+            level: LEVEL_PHASE vagy LEVEL_UI
+        """
+        i = self.head
+        self.names[i] = name
+        self.starts[i] = start
+        self.durations[i] = duration
+        self.levels[i] = level
+        self.sample_frames[i] = self.frame_index
+        self.head = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def end_frame(self):
+        """Egy képkocka lezárása: a képkockaidő rögzítése."""
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        self.frame_times[self.frame_head] = now - self.frame_start
+        self.frame_head = (self.frame_head + 1) % len(self.frame_times)
+        self.frame_count = min(self.frame_count + 1, len(self.frame_times))
+        self.frame_index += 1
+        self.frame_start = now
+
+    def samples(self):
+        """
+        A pufferben lévő minták időrendben.
+
+        Returns:
+            list: (név, kezdet ns, időtartam ns, szint, képkocka) sorok
+        """
+        first = (self.head - self.size) % self.capacity
+        indices = [(first + k) % self.capacity for k in range(self.size)]
+        return [(self.names[i], self.starts[i], self.durations[i], self.levels[i],
+                 self.sample_frames[i]) for i in indices]
+
+    def stats(self):
+        """
+        Összesítés az utolsó képkockákra.
+
+        Returns:
+            dict: fps, átlagos és legrosszabb képkockaidő (ms), hisztogram
+                  (vödrönkénti darabszám), valamint fázisonként és UI hívásonként
+                  (a beágyazott hívások nélküli saját idő) a képkockánkénti átlagidő (ms)
+        """
+        frames = sorted(self.frame_times[:self.frame_count])
+        total = sum(frames)
+        histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        for frame_time in frames:
+            histogram[bisect_left(HISTOGRAM_BOUNDS, frame_time / 1e6)] += 1
+
+        # Csak a statisztikai ablakba eső, lezárt képkockák mintái számítanak.
+        # A UI hívásoknál a saját idő számít: a minták a hívás végén kerülnek
+        # a pufferbe, így egy hívás beágyazott hívásai közvetlenül előtte állnak.
+        oldest_frame = self.frame_index - len(frames)
+        phases = {}
+        calls = {}
+        pending = []
+        for name, start, duration, level, frame in self.samples():
+            if not oldest_frame <= frame < self.frame_index:
+                continue
+            if level == LEVEL_PHASE:
+                phases[name] = phases.get(name, 0) + duration
+                continue
+            own = duration
+            while pending and pending[-1][0] >= start:
+                own -= pending.pop()[1]
+            pending.append((start, duration))
+            calls[name] = calls.get(name, 0) + own
+        count = max(len(frames), 1)
+        return {
+            'fps': len(frames) * 1e9 / total if total else 0.0,
+            'frame_ms': total / count / 1e6,
+            'worst_frame_ms': frames[-1] / 1e6 if frames else 0.0,
+            'histogram': histogram,
+            'phases_ms': {name: value / count / 1e6 for name, value in phases.items()},
+            'calls_ms': {name: value / count / 1e6 for name, value in calls.items()},
+        }
+
+    def export_trace(self, path):
+        """
+        A pufferben lévő minták mentése Chrome trace formátumban.
+
+        Args:
+            path: A kimeneti JSON fájl útvonala
+
+        Returns:
+            int: A kiírt események száma
+        """
+        events = [{
+            'name': name,
+            'cat': 'phase' if level == LEVEL_PHASE else 'ui',
+            'ph': 'X',
+            'ts': start / 1000,
+            'dur': duration / 1000,
+            'pid': 1,
+            'tid': 1,
+            'args': {'frame': frame},
+        } for name, start, duration, level, frame in self.samples()]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+    def draw_overlay(self, surface, text_cache):
+        """
+        A mérés fedőrétegének kirajzolása (negyedmásodpercenként újraépítve).
+
+        Args:
+            surface: A cél felület (a képernyő)
+            text_cache: A renderelt feliratok gyorsítótára
+
+        Returns:
+            Rect: A kirajzolt terület (a képernyőfrissítéshez)
+        """
+        now = perf_counter_ns()
+        if self.overlay_surface is None or now - self.overlay_time > OVERLAY_REFRESH_NS:
+            self.overlay_surface = self.build_overlay(text_cache)
+            self.overlay_time = now
+        return surface.blit(self.overlay_surface, OVERLAY_POSITION)
+
+    def build_overlay(self, text_cache):
+        """
+        A fedőréteg felületének elkészítése az aktuális statisztikából.
+
+        Args:
+            text_cache: A renderelt feliratok gyorsítótára
+
+        Returns:
+            Surface: Az átlátszatlan fedőréteg (a korábbi képkocka tartalmát teljesen eltakarja)
+        """
+        stats = self.stats()
+        width, height = OVERLAY_SIZE
+        overlay = pygame.Surface(OVERLAY_SIZE).convert()
+        overlay.fill((10, 10, 20))
+        pygame.draw.rect(overlay, LIGHT_GRAY, (0, 0, width, height), 1)
+
+        font = get_font(18)
+        phases = {name: ms for name, ms in stats['phases_ms'].items() if name != 'tick'}
+        slowest_phase = max(phases, key=phases.get, default='-')
+        slowest_call = max(stats['calls_ms'], key=stats['calls_ms'].get, default='-')
+        lines = [
+            f"FPS {stats['fps']:5.1f}  {stats['frame_ms']:5.2f} ms  max {stats['worst_frame_ms']:5.1f}",
+            f"fázis: {slowest_phase} {phases.get(slowest_phase, 0):.2f} ms",
+            f"UI: {slowest_call} {stats['calls_ms'].get(slowest_call, 0):.2f} ms",
+        ]
+        for i, line in enumerate(lines):
+            overlay.blit(text_cache.render(line, font, WHITE), (6, 5 + i * 16))
+
+        # Hisztogram: vödrönként egy oszlop, a képkocka-költségvetésen túliak pirosak
+        histogram = stats['histogram']
+        peak = max(histogram) or 1
+        bar_width = (width - 12) // len(histogram)
+        base_y = height - 6
+        for i, count in enumerate(histogram):
+            bound = HISTOGRAM_BOUNDS[i] if i < len(HISTOGRAM_BOUNDS) else float('inf')
+            color = MODERN_GREEN if bound <= FRAME_BUDGET_MS else (
+                MODERN_YELLOW if bound <= 2 * FRAME_BUDGET_MS else MODERN_RED)
+            bar_height = max(1, count * 50 // peak) if count else 0
+            pygame.draw.rect(overlay, color,
+                             (6 + i * bar_width, base_y - bar_height, bar_width - 2, bar_height))
+        return overlay
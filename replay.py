@@ -0,0 +1,375 @@
+"""
+Játékok rögzítése és visszajátszása.
+
+A motor determinisztikus: a kezdőértékkel (seed) együtt a tickenként
+végrehajtott akciók egyértelműen meghatározzák a játékot. A felvétel ezért
+csak a (tick, akció) párokat tárolja tömör bináris formában:
+
+    fejléc:  b'TRPL', verzió (1 bájt), seed (varint), konfiguráció hash (8 bájt)
+    akciók:  darabszám (varint), majd bejegyzésenként varint(tickkülönbség << 3 | akció)
+    lezárás: utolsó tick, pontszám, sorok (varint-ok), játéktér hash (8 bájt)
+
+A visszajátszás ugyanúgy lépteti a motort, mint a TetrisGame.run_tick():
+egy tick akciói a step()-pel, majd engine.tick(). Grafikus felület nélkül
+a valós időnél több ezerszer gyorsabban fut, a végén pedig összeveti a
+pontszámot, a sorok számát és a játéktér hash-ét a felvételben tárolttal.
+
+Futtatás a projekt gyökeréből:
+    python replay.py jatek.trpl            # ellenőrzés és sebesség
+    python main.py --replay jatek.trpl     # megtekintés a játékban
+"""
+import argparse
+import hashlib
+import sys
+from array import array
+from time import perf_counter
+
+from config import (SHAPES, GRID_WIDTH, GRID_HEIGHT, INITIAL_Y_OFFSET, TICK_MS,
+                    INITIAL_SPEED, MIN_SPEED, SPEED_FACTOR,
+                    SOFT_DROP_POINTS, HARD_DROP_POINTS, SINGLE_LINE_POINTS,
+                    DOUBLE_LINE_POINTS, TRIPLE_LINE_POINTS, TETRIS_POINTS,
+                    COMBO_POINTS)
+from engine import TetrisEngine
+
+MAGIC = b'TRPL'
+FORMAT_VERSION = 1
+ACTION_BITS = 3  # az ACTION_* értékek (0-6) ennyi biten férnek el
+HASH_SIZE = 8
+
+
+def write_varint(out, value):
+    """
+    Nemnegatív egész hozzáfűzése 7 bites csoportokban (LEB128).
+
+    Args:
+        out: A cél bytearray
+        value: A kiírandó érték
+    """
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """
+    Egy varint beolvasása.
+
+    Args:
+        data: A bájtsorozat
+        pos: A kezdőpozíció
+
+    Returns:
+        tuple: (érték, a következő pozíció)
+    """
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Csonka felvétel")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def config_hash():
+    """
+    A játékszabályokat meghatározó beállítások hash-e. Ha eltér a felvételben
+    tárolttól, a visszajátszás más szabályokkal futna.
+
+    Returns:
+        bytes: 8 bájtos hash
+    """
+    rules = (SHAPES, GRID_WIDTH, GRID_HEIGHT, INITIAL_Y_OFFSET, TICK_MS,
+             INITIAL_SPEED, MIN_SPEED, SPEED_FACTOR, SOFT_DROP_POINTS, HARD_DROP_POINTS,
+             SINGLE_LINE_POINTS, DOUBLE_LINE_POINTS, TRIPLE_LINE_POINTS, TETRIS_POINTS,
+             COMBO_POINTS)
+    return hashlib.blake2b(repr(rules).encode(), digest_size=HASH_SIZE).digest()
+
+
+def board_hash(board):
+    """
+    A játéktér foglaltságának hash-e (a háttértártól független).
+
+    Args:
+        board: A játéktér
+
+    Returns:
+        bytes: 8 bájtos hash
+    """
+    rows = b''.join(board.row_mask(y).to_bytes(2, 'little') for y in range(GRID_HEIGHT))
+    return hashlib.blake2b(rows, digest_size=HASH_SIZE).digest()
+
+
+def summary(engine):
+    """
+    A játék végállapotának összefoglalója (ezt ellenőrzi a visszajátszás).
+
+    Args:
+        engine: A játékmotor
+
+    Returns:
+        tuple: (tick, pontszám, kitörölt sorok, játéktér hash)
+    """
+    return (engine.ticks, engine.score, engine.lines_cleared, board_hash(engine.board))
+
+
+class Recording:
+    """
+    Egy játék felvétele: a kezdőérték, a konfiguráció hash-e, a (tick, akció)
+    párok és a végállapot összefoglalója.
+    """
+    def __init__(self, seed, rules_hash=None):
+        """
+        Args:
+            seed: A motor kezdőértéke
+            rules_hash: A konfiguráció hash-e (alapértelmezés szerint az aktuálisé)
+        """
+        self.seed = seed
+        self.rules_hash = rules_hash if rules_hash is not None else config_hash()
+        self.ticks = array('L')
+        self.actions = bytearray()
+        self.final = None
+
+    def __len__(self):
+        return len(self.actions)
+
+    def record(self, tick, action):
+        """
+        Egy akció rögzítése.
+
+        Args:
+            tick: A motor tickszámlálója a végrehajtáskor (engine.ticks)
+            action: Az ACTION_* akció
+        """
+        self.ticks.append(tick)
+        self.actions.append(action)
+
+    def finish(self, engine):
+        """
+        A végállapot összefoglalójának rögzítése.
+
+        Args:
+            engine: A játékmotor a játék (vagy a felvétel) végén
+        """
+        self.final = summary(engine)
+
+    def encode(self):
+        """
+        A felvétel bináris alakja.
+
+        Returns:
+            bytes: A kódolt felvétel
+        """
+        if self.final is None:
+            raise ValueError("A felvétel nincs lezárva (finish())")
+        out = bytearray(MAGIC)
+        out.append(FORMAT_VERSION)
+        write_varint(out, self.seed)
+        out += self.rules_hash
+
+        write_varint(out, len(self.actions))
+        previous = 0
+        for tick, action in zip(self.ticks, self.actions):
+            write_varint(out, (tick - previous) << ACTION_BITS | action)
+            previous = tick
+
+        ticks, score, lines, final_board = self.final
+        for value in (ticks, score, lines):
+            write_varint(out, value)
+        out += final_board
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        """
+        Felvétel a bináris alakjából.
+
+        Args:
+            data: A kódolt felvétel
+
+        Returns:
+            Recording: A felvétel
+        """
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Nem felvétel fájl")
+        if data[len(MAGIC)] != FORMAT_VERSION:
+            raise ValueError(f"Ismeretlen felvétel verzió: {data[len(MAGIC)]}")
+        seed, pos = read_varint(data, len(MAGIC) + 1)
+        recording = cls(seed, bytes(data[pos:pos + HASH_SIZE]))
+        pos += HASH_SIZE
+
+        count, pos = read_varint(data, pos)
+        tick = 0
+        mask = (1 << ACTION_BITS) - 1
+        for _ in range(count):
+            value, pos = read_varint(data, pos)
+            tick += value >> ACTION_BITS
+            recording.record(tick, value & mask)
+
+        final = []
+        for _ in range(3):
+            value, pos = read_varint(data, pos)
+            final.append(value)
+        final_board = bytes(data[pos:pos + HASH_SIZE])
+        if len(final_board) != HASH_SIZE:
+            raise ValueError("Csonka felvétel")
+        recording.final = (*final, final_board)
+        return recording
+
+    def save(self, path):
+        """
+        A felvétel mentése.
+
+        Args:
+            path: A fájl útvonala
+
+        Returns:
+            int: A kiírt bájtok száma
+        """
+        data = self.encode()
+        with open(path, 'wb') as f:
+            f.write(data)
+        return len(data)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Felvétel betöltése fájlból.
+
+        Args:
+            path: A fájl útvonala
+
+        Returns:
+            Recording: A felvétel
+        """
+        with open(path, 'rb') as f:
+            return cls.decode(f.read())
+
+
+class ReplayCursor:
+    """
+    Tickenkénti lejátszás a játék fő ciklusához (lásd TetrisGame.run_tick()).
+    """
+    def __init__(self, recording):
+        """
+        Args:
+            recording: A lejátszandó felvétel
+        """
+        self.recording = recording
+        self.index = 0
+
+    def actions_for(self, tick):
+        """
+        Az adott tickben végrehajtandó akciók (a kurzor továbblép rajtuk).
+
+        Args:
+            tick: A motor tickszámlálója
+
+        Returns:
+            bytearray: Az akciók felvételi sorrendben
+        """
+        ticks = self.recording.ticks
+        start = end = self.index
+        while end < len(ticks) and ticks[end] == tick:
+            end += 1
+        self.index = end
+        return self.recording.actions[start:end]
+
+    def finished(self, tick):
+        """
+        Véget ért-e a felvétel.
+
+        Args:
+            tick: A motor tickszámlálója
+
+        Returns:
+            bool: True ha a felvétel minden tickje lefutott
+        """
+        return tick >= self.recording.final[0]
+
+
+def replay(recording, engine=None):
+    """
+    A felvétel lejátszása grafikus felület nélkül, a lehető leggyorsabban.
+
+    Args:
+        recording: A felvétel
+        engine: A használandó motor (alapértelmezés szerint új)
+
+    Returns:
+        TetrisEngine: A motor a felvétel végén
+    """
+    if engine is None:
+        engine = TetrisEngine()
+    engine.reset(recording.seed)
+    step = engine.step
+    advance = engine.advance
+    for tick, action in zip(recording.ticks, recording.actions):
+        if tick > engine.ticks:
+            advance(tick - engine.ticks)
+        step(action)
+    advance(recording.final[0] - engine.ticks)
+    return engine
+
+
+def verify(recording, engine=None):
+    """
+    Visszajátszás és a végállapot összevetése a felvétellel.
+
+    Args:
+        recording: A felvétel
+        engine: A használandó motor (alapértelmezés szerint új)
+
+    Returns:
+        list: (mező, várt, kapott) eltérések; üres lista ha a visszajátszás egyezik
+    """
+    mismatches = []
+    current_rules = config_hash()
+    if recording.rules_hash != current_rules:
+        mismatches.append(('config', recording.rules_hash.hex(), current_rules.hex()))
+    engine = replay(recording, engine)
+    fields = ('ticks', 'score', 'lines', 'board')
+    for field, expected, actual in zip(fields, recording.final, summary(engine)):
+        if expected != actual:
+            if field == 'board':
+                expected, actual = expected.hex(), actual.hex()
+            mismatches.append((field, expected, actual))
+    return mismatches
+
+
+def main(argv=None):
+    """
+    Parancssori belépési pont: felvételek ellenőrzése.
+
+    Returns:
+        int: Kilépési kód (1 ha valamelyik felvétel eltér)
+    """
+    parser = argparse.ArgumentParser(prog='python replay.py',
+                                     description='Felvételek visszajátszása és ellenőrzése')
+    parser.add_argument('paths', nargs='+', metavar='FILE', help='felvétel fájlok')
+    args = parser.parse_args(argv)
+
+    failed = False
+    engine = TetrisEngine()
+    for path in args.paths:
+        recording = Recording.load(path)
+        start = perf_counter()
+        mismatches = verify(recording, engine)
+        elapsed = perf_counter() - start
+        ticks = recording.final[0]
+        speedup = ticks * TICK_MS / 1000 / elapsed if elapsed else float('inf')
+        status = 'OK' if not mismatches else 'ELTÉRÉS'
+        print(f"{path}: {status}  {len(recording)} akció, {ticks} tick, "
+              f"pontszám {engine.score}, {elapsed * 1000:.1f} ms ({speedup:,.0f}x valós idő)")
+        for field, expected, actual in mismatches:
+            print(f"  {field}: várt {expected}, kapott {actual}")
+        failed = failed or bool(mismatches)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""
+Többjátékos (egy az egy elleni) játékszerver asyncio alapon.
+
+A kliensek TCP-n csatlakoznak; a szerver a várakozókat párba állítja, és
+minden meccshez két, azonos kezdőértékű TetrisEngine-t futtat (a szerver a
+hiteles állapot). A többsoros törlések szemétsorokat küldenek az ellenfélnek
+(GARBAGE_LINES); a beérkező szemét előbb a saját küldendőt csökkenti, a
+maradék az ellenfél következő, sortörlés nélküli rögzítésekor kerül be.
+
+Egyetlen ütemező ciklus lépteti az összes meccset rögzített TICK_MS
+lépésközzel; a hálózati bemenet a tickek között érkezik, és a következő
+tickben hajtódik végre. Lemaradáskor egyszerre legfeljebb
+SERVER_MAX_CATCHUP_TICKS tick fut, így egy tick késése korlátos marad.
+
+Protokoll (minden egész little-endian):
+    kliens -> szerver:  akciónként egy bájt (ACTION_LEFT ... ACTION_HARD_DROP)
+    szerver -> kliens:  START  (típus, kezdőérték, játékos sorszáma)
+                        STATE  (típus, tick, pontszám, sorok, ellenfél sorai,
+                                várakozó szemétsorok, vége jelző, játéktér hash)
+                        END    (típus, eredmény)
+
+Futtatás a projekt gyökeréből:
+    python server.py --port 7474
+    python loadgen.py --matches 200 --spawn    # terhelésmérés szimulált kliensekkel
+"""
+import argparse
+import asyncio
+import random
+import struct
+import sys
+from array import array
+from time import perf_counter
+
+from config import (GRID_WIDTH, TICK_MS, GARBAGE_LINES, SERVER_HOST, SERVER_PORT,
+                    SERVER_STATE_INTERVAL, SERVER_MAX_INPUTS_PER_TICK, SERVER_MAX_QUEUED_INPUTS,
+                    SERVER_MAX_CATCHUP_TICKS, SERVER_STATS_INTERVAL)
+from engine import TetrisEngine, ACTION_LEFT, ACTION_HARD_DROP, EVENT_LOCK
+from metrics import percentile
+
+# Üzenetek (szerver -> kliens)
+MSG_START = 1
+MSG_STATE = 2
+MSG_END = 3
+START = struct.Struct('<BIB')
+STATE = struct.Struct('<BIIHHHBQ')
+END = struct.Struct('<BB')
+MESSAGE_SIZES = {MSG_START: START.size, MSG_STATE: STATE.size, MSG_END: END.size}
+
+# Meccs eredménye (END üzenet)
+RESULT_WIN = 0
+RESULT_LOSS = 1
+RESULT_DRAW = 2
+
+# A kliens csak ezeket az akciókat küldheti; a többi bájt eldobódik
+INVALID_INPUTS = bytes(b for b in range(256) if not ACTION_LEFT <= b <= ACTION_HARD_DROP)
+
+# Ennyi tick mérését tartjuk meg a statisztikához
+TICK_SAMPLES = 4096
+
+
+class Player:
+    """Egy csatlakozott kliens: a kapcsolata, a bemeneti sora és a meccsbeli állapota."""
+    def __init__(self, transport):
+        """
+        Args:
+            transport: Az asyncio kapcsolat
+        """
+        self.transport = transport
+        self.inputs = bytearray()
+        self.match = None
+        self.engine = None
+        self.pending_garbage = 0
+
+    def send(self, data):
+        """
+        Üzenet küldése (lezárt kapcsolatnál nem történik semmi).
+
+        Args:
+            data: A kódolt üzenet
+        """
+        if not self.transport.is_closing():
+            self.transport.write(data)
+
+
+class Match:
+    """Egy meccs két játékossal, azonos elemsorrenddel."""
+    def __init__(self, players, seed):
+        """
+        Args:
+            players: A két játékos
+            seed: A motorok és a szemétsor-lyukak kezdőértéke
+        """
+        self.players = players
+        self.rng = random.Random(seed)
+        self.finished = False
+        for index, player in enumerate(players):
+            player.match = self
+            player.engine = TetrisEngine(seed)
+            player.pending_garbage = 0
+            # A várakozás közben küldött bemenet nem számít
+            player.inputs.clear()
+            player.send(START.pack(MSG_START, seed, index))
+
+    def tick(self):
+        """Egy tick mindkét játékosnak: a várakozó akciók, gravitáció, szemétsorok."""
+        first, second = self.players
+        for player, opponent in ((first, second), (second, first)):
+            engine = player.engine
+            inputs = player.inputs
+            # Egy step() vagy tick() legfeljebb egy elemet rögzít: a szemét rögzítésenként számol
+            if inputs:
+                count = min(len(inputs), SERVER_MAX_INPUTS_PER_TICK)
+                for action in inputs[:count]:
+                    lines = engine.lines_cleared
+                    events = engine.step(action)
+                    self.exchange_garbage(player, opponent, engine.lines_cleared - lines, events)
+                del inputs[:count]
+            lines = engine.lines_cleared
+            events = engine.tick()
+            self.exchange_garbage(player, opponent, engine.lines_cleared - lines, events)
+
+        if first.engine.game_over or second.engine.game_over:
+            if first.engine.game_over and second.engine.game_over:
+                self.finish(None)
+            else:
+                self.finish(second if first.engine.game_over else first)
+
+    def exchange_garbage(self, player, opponent, cleared, events):
+        """
+        Egy lépés (legfeljebb egy rögzítés) szemétsor-következményei.
+
+        Args:
+            player: A játékos, akinek a lépése lefutott
+            opponent: Az ellenfele
+            cleared: A lépésben kitörölt sorok száma
+            events: A lépés EVENT_* jelzői
+        """
+        attack = GARBAGE_LINES[min(cleared, len(GARBAGE_LINES) - 1)]
+        if attack:
+            # A küldött szemét előbb a saját várakozót semlegesíti
+            cancelled = min(attack, player.pending_garbage)
+            player.pending_garbage -= cancelled
+            opponent.pending_garbage += attack - cancelled
+        elif events & EVENT_LOCK and not cleared and player.pending_garbage:
+            player.engine.add_garbage(player.pending_garbage, self.rng.randrange(GRID_WIDTH))
+            player.pending_garbage = 0
+
+    def send_state(self, tick):
+        """
+        Állapotüzenet mindkét játékosnak.
+
+        Args:
+            tick: A szerver tickszámlálója
+        """
+        first, second = self.players
+        for player, opponent in ((first, second), (second, first)):
+            engine = player.engine
+            player.send(STATE.pack(MSG_STATE, tick, engine.score, engine.lines_cleared,
+                                   opponent.engine.lines_cleared, player.pending_garbage,
+                                   engine.game_over, engine.board.hash))
+
+    def finish(self, winner):
+        """
+        A meccs lezárása: eredmény küldése és a kapcsolatok bontása.
+
+        Args:
+            winner: A győztes játékos, döntetlennél None
+        """
+        self.finished = True
+        for player in self.players:
+            if winner is None:
+                result = RESULT_DRAW
+            else:
+                result = RESULT_WIN if player is winner else RESULT_LOSS
+            player.send(END.pack(MSG_END, result))
+            player.match = None
+            player.transport.close()
+
+    def forfeit(self, player):
+        """
+        Egy játékos kilépett: az ellenfele nyer.
+
+        Args:
+            player: A kilépett játékos
+        """
+        if not self.finished:
+            first, second = self.players
+            self.finish(second if player is first else first)
+
+
+class PlayerProtocol(asyncio.Protocol):
+    """Egy kliens kapcsolata: a beérkező bájtok a játékos bemeneti sorába kerülnek."""
+    def __init__(self, server):
+        """
+        Args:
+            server: A GameServer
+        """
+        self.server = server
+        self.player = None
+
+    def connection_made(self, transport):
+        self.player = Player(transport)
+        self.server.connect(self.player)
+
+    def data_received(self, data):
+        inputs = self.player.inputs
+        room = SERVER_MAX_QUEUED_INPUTS - len(inputs)
+        if room > 0:
+            inputs += data.translate(None, INVALID_INPUTS)[:room]
+
+    def connection_lost(self, exc):
+        self.server.disconnect(self.player)
+
+
+class GameServer:
+    """
+    Párosítás és a meccsek rögzített lépésközű ütemezése egyetlen
+    eseményhurokban, tickenkénti időméréssel.
+    """
+    def __init__(self, seed=None, stats_interval=SERVER_STATS_INTERVAL):
+        """
+        Args:
+            seed: A meccsek kezdőértékeinek forrása (None esetén véletlen)
+            stats_interval: Ennyi másodpercenként íródik ki a statisztika (0: soha)
+        """
+        self.rng = random.Random(seed)
+        self.stats_interval = stats_interval
+        self.waiting = None
+        self.matches = []
+        self.players = 0
+        self.tick_count = 0
+        self.matches_started = 0
+        self.skipped_ticks = 0
+
+        # Ütemezési körönként a feldolgozás ideje és a késés (s), körpufferben
+        self.durations = array('d', bytes(8 * TICK_SAMPLES))
+        self.lateness = array('d', bytes(8 * TICK_SAMPLES))
+        self.sample_head = 0
+        self.sample_count = 0
+
+    def connect(self, player):
+        """
+        Új kliens: párba állítás a várakozóval, vagy várakozás.
+
+        Args:
+            player: A csatlakozott játékos
+        """
+        self.players += 1
+        if self.waiting is None:
+            self.waiting = player
+            return
+        opponent, self.waiting = self.waiting, None
+        self.matches.append(Match((opponent, player), self.rng.getrandbits(32)))
+        self.matches_started += 1
+
+    def disconnect(self, player):
+        """
+        Egy kliens kapcsolata megszűnt.
+
+        Args:
+            player: A játékos
+        """
+        self.players -= 1
+        if self.waiting is player:
+            self.waiting = None
+        elif player.match is not None:
+            player.match.forfeit(player)
+
+    def tick(self):
+        """Egy szerver tick: minden meccs léptetése, időnként állapotüzenetek."""
+        self.tick_count += 1
+        broadcast = self.tick_count % SERVER_STATE_INTERVAL == 0
+        for match in self.matches:
+            if not match.finished:
+                match.tick()
+            if broadcast and not match.finished:
+                match.send_state(self.tick_count)
+        if any(match.finished for match in self.matches):
+            self.matches = [match for match in self.matches if not match.finished]
+
+    def record(self, duration, lateness):
+        """
+        Egy ütemezési kör mérésének rögzítése.
+
+        Args:
+            duration: A kör tickjeinek feldolgozási ideje (s)
+            lateness: A kör kezdetének késése az ütemezetthez képest (s)
+        """
+        i = self.sample_head
+        self.durations[i] = duration
+        self.lateness[i] = lateness
+        self.sample_head = (i + 1) % TICK_SAMPLES
+        self.sample_count = min(self.sample_count + 1, TICK_SAMPLES)
+
+    def stats(self):
+        """
+        A szerver statisztikája az utolsó ütemezési körökre.
+
+        Returns:
+            dict: meccsek és játékosok száma, tickek, kihagyott tickek, valamint
+                  a körök feldolgozási idejének és késésének mediánja, p99-e és maximuma (ms)
+        """
+        result = {
+            'matches': len(self.matches),
+            'players': self.players,
+            'matches_started': self.matches_started,
+            'ticks': self.tick_count,
+            'skipped_ticks': self.skipped_ticks,
+        }
+        for name, samples in (('tick', self.durations), ('lateness', self.lateness)):
+            ordered = sorted(samples[:self.sample_count])
+            if ordered:
+                result[f'{name}_median_ms'] = percentile(ordered, 0.5) * 1000
+                result[f'{name}_p99_ms'] = percentile(ordered, 0.99) * 1000
+                result[f'{name}_max_ms'] = ordered[-1] * 1000
+        return result
+
+    def print_stats(self):
+        """A statisztika kiírása egy sorban (stderr)."""
+        stats = self.stats()
+        line = (f"{stats['matches']} meccs, {stats['players']} játékos, "
+                f"{stats['skipped_ticks']} kihagyott tick")
+        if 'tick_median_ms' in stats:
+            line += (f", tick medián {stats['tick_median_ms']:.2f} ms, "
+                     f"p99 {stats['tick_p99_ms']:.2f} ms, max {stats['tick_max_ms']:.2f} ms, "
+                     f"késés p99 {stats['lateness_p99_ms']:.2f} ms")
+        print(line, file=sys.stderr, flush=True)
+
+    async def run_ticks(self):
+        """
+        Az ütemező ciklus: TICK_MS-onként egy tick. Lemaradáskor a hiányzó
+        tickek (legfeljebb SERVER_MAX_CATCHUP_TICKS) egymás után futnak, a
+        többi kimarad, így a ciklus nem halmoz fel késést.
+        """
+        tick_s = TICK_MS / 1000
+        next_time = perf_counter()
+        next_stats = next_time + self.stats_interval
+        while True:
+            delay = next_time - perf_counter()
+            # Késésben is átadjuk a vezérlést, hogy a hálózati bemenet feldolgozódjon
+            await asyncio.sleep(max(delay, 0))
+            start = perf_counter()
+            lateness = start - next_time
+            due = int(lateness / tick_s) + 1
+            run = min(due, SERVER_MAX_CATCHUP_TICKS)
+            for _ in range(run):
+                self.tick()
+            self.skipped_ticks += due - run
+            next_time += due * tick_s
+            self.record(perf_counter() - start, max(lateness, 0.0))
+
+            if self.stats_interval and start >= next_stats:
+                self.print_stats()
+                next_stats = start + self.stats_interval
+
+    async def serve(self, host=SERVER_HOST, port=SERVER_PORT):
+        """
+        A szerver futtatása (leállításig).
+
+        Args:
+            host: A figyelt cím
+            port: A figyelt port
+        """
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: PlayerProtocol(self), host, port)
+        print(f"Szerver: {host}:{port}", file=sys.stderr, flush=True)
+        async with server:
+            await self.run_ticks()
+
+
+def main(argv=None):
+    """
+    Parancssori belépési pont.
+
+    Returns:
+        int: Kilépési kód
+    """
+    parser = argparse.ArgumentParser(prog='python server.py', description='Többjátékos játékszerver')
+    parser.add_argument('--host', default=SERVER_HOST, help='a figyelt cím')
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help='a figyelt port')
+    parser.add_argument('--seed', type=int, default=None, help='a meccsek kezdőértékeinek forrása')
+    parser.add_argument('--stats-interval', type=float, default=SERVER_STATS_INTERVAL,
+                        help='a statisztika kiírási ideje másodpercben (0: soha)')
+    args = parser.parse_args(argv)
+
+    server = GameServer(args.seed, args.stats_interval)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        server.print_stats()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Az alakzatok előfordítása.
+
+A config.SHAPES '0'/'.' karakteres 5x5-ös mátrixait importáláskor egyszer
+dolgozzuk fel, így az ütközésvizsgálat, a rögzítés és a kirajzolás már csak
+kész táblázatokat olvas, karakterláncokat nem.
+"""
+from config import SHAPES, GRID_WIDTH
+
+# A vízszintes pozíció eltolása a fit_masks táblázatban (x + X_OFFSET az index)
+X_OFFSET = 5
+
+
+class CompiledShape:
+    """
+    Egy alakzat egy forgatásának előre kiszámolt adatai.
+
+    Attribútumok:
+        cells: (oszlop, sor) eltolások az 5x5-ös mátrixon belül
+        min_x, max_x, min_y, max_y: a foglalt cellák befoglaló téglalapja
+        row_masks: (sor, maszk) párok, a maszk j. bitje a j. oszlopot jelöli
+        bottom: (oszlop, legalsó sor) párok a befoglaló téglalap oszlopaira
+        fit_masks: x + X_OFFSET szerint indexelve a játéktér-oszlopokra eltolt
+                   row_masks, vagy None ha az elem ott kilógna a játéktérből
+    """
+    __slots__ = ('cells', 'min_x', 'max_x', 'min_y', 'max_y', 'row_masks',
+                 'bottom', 'fit_masks')
+
+    def __init__(self, matrix):
+        """
+        Egy forgatás lefordítása.
+
+        Args:
+            matrix: 5x5-ös '0'/'.' karakteres mátrix
+        """
+        self.cells = tuple((j, i) for i, row in enumerate(matrix)
+                           for j, cell in enumerate(row) if cell == '0')
+        xs = [x for x, _ in self.cells]
+        ys = [y for _, y in self.cells]
+        self.min_x, self.max_x = min(xs), max(xs)
+        self.min_y, self.max_y = min(ys), max(ys)
+
+        masks = {}
+        for x, y in self.cells:
+            masks[y] = masks.get(y, 0) | (1 << x)
+        self.row_masks = tuple(sorted(masks.items()))
+
+        self.bottom = tuple((x, max(y for cx, y in self.cells if cx == x))
+                            for x in range(self.min_x, self.max_x + 1))
+
+        self.fit_masks = [
+            tuple((y, mask << x if x >= 0 else mask >> -x) for y, mask in self.row_masks)
+            if 0 <= x + self.min_x and x + self.max_x < GRID_WIDTH else None
+            for x in range(-X_OFFSET, GRID_WIDTH)
+        ]
+
+
+# Alakzatonként és forgatásonként a lefordított adatok
+COMPILED_SHAPES = [[CompiledShape(matrix) for matrix in shape] for shape in SHAPES]
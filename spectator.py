@@ -0,0 +1,565 @@
+"""
+Tömör, delta-kódolt állapotfolyam a nézőknek.
+
+A teljes 20x10-es RGB rács tickenkénti küldése helyett a folyam bináris
+képkockákból áll. A kulcsképkocka a teljes állapotot hordozza (sorok
+bitmaszkja és színindexei, az elemek, pontszám, sorok, szint); a köztes
+delta képkockák csak a változott részeket: a megváltozott sorokat, az elem
+helyzetét és a számlálókat. Ha egy tickben semmi nem változott, nem
+keletkezik képkocka, így egy ejtés vagy mozgás néhány bájt.
+
+Képkocka: hossz (varint), majd a törzs, amelynek első bájtja a fejléc:
+    kulcsképkocka:  FRAME_KEY, tick, pontszám, sorok, szint (varint-ok),
+                    vége jelző, aktuális alakzat, forgatás, x, y, következő alakzat,
+                    majd GRID_HEIGHT sor (ROW_SIZE bájt)
+    delta:          DELTA_* jelzők, tickkülönbség (varint), majd a jelzett részek:
+                    elemek (2 bájt), helyzet (3 bájt), számlálók (3 varint),
+                    sorok (darabszám, majd soronként index + ROW_SIZE bájt)
+Egy sor: bitmaszk (2 bájt), majd a színindexek cellánként 4 biten.
+
+A SpectatorFeed egy játék folyamát egyszer kódolja, és ugyanazt a
+bájtsorozatot írja minden feliratkozónak (bármi, aminek write() metódusa
+van, pl. asyncio transport). Az új feliratkozó az utolsó kulcsképkockát és
+az azóta küldött deltákat kapja meg, így azonnal teljes állapota van.
+
+Futtatás a projekt gyökeréből:
+    python spectator.py --games 20     # bitpontos ellenőrzés és méretek véletlen játékokon
+"""
+import argparse
+import random
+import struct
+import sys
+from time import perf_counter
+
+from config import GRID_WIDTH, GRID_HEIGHT, TICK_MS, SPECTATOR_KEYFRAME_INTERVAL
+from engine import (TetrisEngine, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE,
+                    ACTION_SOFT_DROP, ACTION_HARD_DROP)
+from replay import write_varint, read_varint
+
+# A képkocka fejléce: kulcsképkocka, vagy a delta részeit jelző bitek
+FRAME_KEY = 0x80
+DELTA_PIECES = 0x01
+DELTA_POSE = 0x02
+DELTA_COUNTERS = 0x04
+DELTA_ROWS = 0x08
+DELTA_GAME_OVER = 0x10
+
+POSE = struct.Struct('<Bbb')   # forgatás, x, y (az elem a játéktér felett és balra is lehet)
+ROW_MASK = struct.Struct('<H')
+ROW_SIZE = ROW_MASK.size + (GRID_WIDTH + 1) // 2
+
+
+def pack_row(mask, colors):
+    """
+    Egy sor kódolása: bitmaszk, majd cellánként 4 bites színindex.
+
+    Args:
+        mask: A sor foglaltsága bitmaszkként
+        colors: A cellák színindexei
+
+    Returns:
+        bytes: ROW_SIZE bájt
+    """
+    out = bytearray(ROW_MASK.pack(mask))
+    for x in range(0, GRID_WIDTH, 2):
+        high = colors[x + 1] if x + 1 < GRID_WIDTH else 0
+        out.append(colors[x] | high << 4)
+    return bytes(out)
+
+
+def unpack_row(data, pos):
+    """
+    Egy kódolt sor beolvasása.
+
+    Args:
+        data: A bájtsorozat
+        pos: A sor kezdőpozíciója
+
+    Returns:
+        tuple: (bitmaszk, színindexek bytes)
+    """
+    mask, = ROW_MASK.unpack_from(data, pos)
+    colors = bytearray(GRID_WIDTH)
+    for x in range(GRID_WIDTH):
+        byte = data[pos + ROW_MASK.size + x // 2]
+        colors[x] = byte >> 4 if x & 1 else byte & 0x0F
+    return mask, bytes(colors)
+
+
+class SpectatorState:
+    """A néző által látott állapot: a folyamból visszaállítva, vagy a motorból kiolvasva."""
+    def __init__(self):
+        """Üres állapot (az első kulcsképkocka tölti fel)."""
+        self.tick = 0
+        self.score = 0
+        self.lines = 0
+        self.level = 1
+        self.game_over = False
+        self.shape_index = 0
+        self.rotation = 0
+        self.x = 0
+        self.y = 0
+        self.next_shape = 0
+        self.rows = [0] * GRID_HEIGHT
+        self.colors = [bytes(GRID_WIDTH)] * GRID_HEIGHT
+
+    def fields(self, with_tick=True):
+        """
+        Az állapot mezői összehasonlításhoz.
+
+        Args:
+            with_tick: False esetén a tick kimarad (a változás nélküli tickekben nincs képkocka)
+
+        Returns:
+            tuple: A mezők értékei
+        """
+        values = (self.score, self.lines, self.level, self.game_over, self.shape_index,
+                  self.rotation, self.x, self.y, self.next_shape,
+                  tuple(self.rows), tuple(self.colors))
+        return (self.tick,) + values if with_tick else values
+
+    def __eq__(self, other):
+        return isinstance(other, SpectatorState) and self.fields() == other.fields()
+
+
+def capture(engine):
+    """
+    A motor néző által látható állapotának kiolvasása (ellenőrzéshez).
+
+    Args:
+        engine: A TetrisEngine
+
+    Returns:
+        SpectatorState: Az állapot
+    """
+    state = SpectatorState()
+    piece = engine.current_piece
+    board = engine.board
+    state.tick = engine.ticks
+    state.score = engine.score
+    state.lines = engine.lines_cleared
+    state.level = engine.level
+    state.game_over = engine.game_over
+    state.shape_index = piece.shape_index
+    state.rotation = piece.rotation
+    state.x = piece.x
+    state.y = piece.y
+    state.next_shape = engine.next_piece.shape_index
+    state.rows = [board.row_mask(y) for y in range(GRID_HEIGHT)]
+    state.colors = [board.row_colors(y) for y in range(GRID_HEIGHT)]
+    return state
+
+
+class SpectatorEncoder:
+    """
+    Egy játék képkockáinak előállítása: az utoljára kódolt állapotot
+    megjegyzi, és a következő képkockába csak az attól eltérő részek kerülnek.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Az utoljára kódolt állapot eldobása (a következő képkocka kulcsképkocka lesz)."""
+        self.board = None
+        self.board_version = -1
+        self.tick = 0
+        self.pieces = None
+        self.pose = None
+        self.counters = None
+        self.game_over = False
+        # Soronként az utoljára küldött kódolt sor
+        self.rows = [None] * GRID_HEIGHT
+
+    def needs_keyframe(self, engine):
+        """
+        Kell-e kulcsképkocka: még nem volt, vagy a motor új játékot kezdett.
+
+        Args:
+            engine: A TetrisEngine
+
+        Returns:
+            bool: True ha delta nem küldhető
+        """
+        return engine.board is not self.board or engine.ticks < self.tick
+
+    def changed_rows(self, engine):
+        """
+        A legutóbb küldöttől eltérő sorok (a játéktér verziójának változásakor).
+
+        Args:
+            engine: A TetrisEngine
+
+        Returns:
+            list: (sorindex, kódolt sor) párok
+        """
+        board = engine.board
+        if board is self.board and board.version == self.board_version:
+            return []
+        self.board = board
+        self.board_version = board.version
+        changed = []
+        rows = self.rows
+        for y in range(GRID_HEIGHT):
+            row = pack_row(board.row_mask(y), board.row_colors(y))
+            if row != rows[y]:
+                rows[y] = row
+                changed.append((y, row))
+        return changed
+
+    def keyframe(self, engine):
+        """
+        Kulcsképkocka a teljes állapottal.
+
+        Args:
+            engine: A TetrisEngine
+
+        Returns:
+            bytes: A képkocka (hosszal együtt)
+        """
+        self.changed_rows(engine)
+        piece = engine.current_piece
+        self.tick = engine.ticks
+        self.pieces = (piece.shape_index, engine.next_piece.shape_index)
+        self.pose = (piece.rotation, piece.x, piece.y)
+        self.counters = (engine.score, engine.lines_cleared, engine.level)
+        self.game_over = engine.game_over
+
+        body = bytearray((FRAME_KEY,))
+        write_varint(body, self.tick)
+        for value in self.counters:
+            write_varint(body, value)
+        body.append(self.game_over)
+        body.append(piece.shape_index)
+        body += POSE.pack(*self.pose)
+        body.append(engine.next_piece.shape_index)
+        for row in self.rows:
+            body += row
+        return self.frame(body)
+
+    def delta(self, engine):
+        """
+        Delta képkocka az utoljára kódolt állapothoz képest.
+
+        Args:
+            engine: A TetrisEngine (needs_keyframe() hamis kell legyen)
+
+        Returns:
+            bytes: A képkocka (hosszal együtt), vagy None ha semmi nem változott
+        """
+        piece = engine.current_piece
+        flags = 0
+        pieces = (piece.shape_index, engine.next_piece.shape_index)
+        if pieces != self.pieces:
+            self.pieces = pieces
+            flags |= DELTA_PIECES
+        pose = (piece.rotation, piece.x, piece.y)
+        if pose != self.pose:
+            self.pose = pose
+            flags |= DELTA_POSE
+        counters = (engine.score, engine.lines_cleared, engine.level)
+        if counters != self.counters:
+            self.counters = counters
+            flags |= DELTA_COUNTERS
+        changed = self.changed_rows(engine)
+        if changed:
+            flags |= DELTA_ROWS
+        if engine.game_over and not self.game_over:
+            self.game_over = True
+            flags |= DELTA_GAME_OVER
+        if not flags:
+            return None
+
+        body = bytearray((flags,))
+        write_varint(body, engine.ticks - self.tick)
+        self.tick = engine.ticks
+        if flags & DELTA_PIECES:
+            body += bytes(pieces)
+        if flags & DELTA_POSE:
+            body += POSE.pack(*pose)
+        if flags & DELTA_COUNTERS:
+            for value in counters:
+                write_varint(body, value)
+        if changed:
+            body.append(len(changed))
+            for y, row in changed:
+                body.append(y)
+                body += row
+        return self.frame(body)
+
+    @staticmethod
+    def frame(body):
+        """
+        A törzs elé a hossz kerül, így a folyam képkockákra bontható.
+
+        Args:
+            body: A képkocka törzse
+
+        Returns:
+            bytes: A képkocka
+        """
+        out = bytearray()
+        write_varint(out, len(body))
+        out += body
+        return bytes(out)
+
+
+class SpectatorFeed:
+    """
+    Egy játék folyama sok nézőnek: tickenként egyszeri kódolás, és ugyanaz a
+    bájtsorozat megy minden feliratkozónak.
+    """
+    def __init__(self, keyframe_interval=SPECTATOR_KEYFRAME_INTERVAL):
+        """
+        Args:
+            keyframe_interval: Ennyi tickenként megy kulcsképkocka
+        """
+        self.keyframe_interval = keyframe_interval
+        self.encoder = SpectatorEncoder()
+        self.subscribers = []
+        # Az utolsó kulcsképkocka és az azóta küldött delták (az új feliratkozóknak)
+        self.backlog = bytearray()
+        self.next_keyframe = 0
+        self.frames = 0
+        self.keyframes = 0
+        self.bytes_encoded = 0
+
+    def subscribe(self, writer):
+        """
+        Új néző: megkapja az eddigi folyamot az utolsó kulcsképkockától.
+
+        Args:
+            writer: Bármi, aminek write(bytes) metódusa van (pl. asyncio transport)
+        """
+        if self.backlog:
+            writer.write(bytes(self.backlog))
+        self.subscribers.append(writer)
+
+    def unsubscribe(self, writer):
+        """
+        Egy néző leiratkozása.
+
+        Args:
+            writer: A subscribe()-nak átadott objektum
+        """
+        self.subscribers.remove(writer)
+
+    def publish(self, engine):
+        """
+        A motor aktuális állapotának kiküldése (tickenként hívandó).
+        Néző nélkül nem kódol; az első feliratkozó után kulcsképkockával indul.
+
+        Args:
+            engine: A TetrisEngine
+
+        Returns:
+            bytes: A kiküldött képkocka, vagy None ha nem keletkezett
+        """
+        if not self.subscribers:
+            if self.backlog:
+                self.backlog.clear()
+                self.encoder.reset()
+            return None
+
+        encoder = self.encoder
+        if not self.backlog or engine.ticks >= self.next_keyframe or encoder.needs_keyframe(engine):
+            frame = encoder.keyframe(engine)
+            self.backlog = bytearray(frame)
+            self.next_keyframe = engine.ticks + self.keyframe_interval
+            self.keyframes += 1
+        else:
+            frame = encoder.delta(engine)
+            if frame is None:
+                return None
+            self.backlog += frame
+
+        self.frames += 1
+        self.bytes_encoded += len(frame)
+        for writer in self.subscribers:
+            writer.write(frame)
+        return frame
+
+
+class SpectatorDecoder:
+    """A folyam visszafejtése: a beérkező bájtokból a néző állapota (state)."""
+    def __init__(self):
+        self.state = None
+        self.buffer = bytearray()
+        self.frames = 0
+
+    def write(self, data):
+        """
+        Beérkező bájtok feldolgozása (a decoder így közvetlenül feliratkozhat egy SpectatorFeed-re).
+
+        Args:
+            data: A folyam következő része (tetszőleges határon elvágva)
+
+        Returns:
+            int: A feldolgozott teljes képkockák száma
+        """
+        buffer = self.buffer
+        buffer += data
+        applied = 0
+        pos = 0
+        while pos < len(buffer):
+            try:
+                size, start = read_varint(buffer, pos)
+            except ValueError:
+                break
+            if start + size > len(buffer):
+                break
+            self.apply(bytes(buffer[start:start + size]))
+            pos = start + size
+            applied += 1
+        del buffer[:pos]
+        return applied
+
+    def apply(self, body):
+        """
+        Egy képkocka törzsének alkalmazása az állapotra.
+
+        Args:
+            body: A képkocka törzse (hossz nélkül)
+
+        Raises:
+            ValueError: Delta képkocka kulcsképkocka előtt
+        """
+        header = body[0]
+        if header & FRAME_KEY:
+            state = SpectatorState()
+            state.tick, pos = read_varint(body, 1)
+            state.score, pos = read_varint(body, pos)
+            state.lines, pos = read_varint(body, pos)
+            state.level, pos = read_varint(body, pos)
+            state.game_over = bool(body[pos])
+            state.shape_index = body[pos + 1]
+            state.rotation, state.x, state.y = POSE.unpack_from(body, pos + 2)
+            state.next_shape = body[pos + 2 + POSE.size]
+            pos += 3 + POSE.size
+            for y in range(GRID_HEIGHT):
+                state.rows[y], state.colors[y] = unpack_row(body, pos)
+                pos += ROW_SIZE
+            self.state = state
+        else:
+            state = self.state
+            if state is None:
+                raise ValueError("Delta képkocka kulcsképkocka előtt")
+            ticks, pos = read_varint(body, 1)
+            state.tick += ticks
+            if header & DELTA_PIECES:
+                state.shape_index, state.next_shape = body[pos], body[pos + 1]
+                pos += 2
+            if header & DELTA_POSE:
+                state.rotation, state.x, state.y = POSE.unpack_from(body, pos)
+                pos += POSE.size
+            if header & DELTA_COUNTERS:
+                state.score, pos = read_varint(body, pos)
+                state.lines, pos = read_varint(body, pos)
+                state.level, pos = read_varint(body, pos)
+            if header & DELTA_ROWS:
+                count = body[pos]
+                pos += 1
+                for _ in range(count):
+                    y = body[pos]
+                    state.rows[y], state.colors[y] = unpack_row(body, pos + 1)
+                    pos += 1 + ROW_SIZE
+            if header & DELTA_GAME_OVER:
+                state.game_over = True
+        self.frames += 1
+
+
+class ByteCounter:
+    """Feliratkozó, amely csak számolja a kapott bájtokat (a szétosztás méréséhez)."""
+    def __init__(self):
+        self.received = 0
+
+    def write(self, data):
+        self.received += len(data)
+
+
+def run_check(games, seed=0, apm=150, max_ticks=60000, subscribers=1, board_backend='bitboard'):
+    """
+    Véletlen játékok folyamának visszafejtése és tickenkénti összevetése a motorral.
+
+    Args:
+        games: A játékok száma
+        seed: Az első játék kezdőértéke
+        apm: Akció/perc (a tickenkénti akció valószínűsége ebből adódik)
+        max_ticks: Egy játék legfeljebb ennyi tickig fut
+        subscribers: A feliratkozók száma (az első a visszafejtő, a többi csak számol)
+        board_backend: A motor játéktér háttértára
+
+    Returns:
+        dict: tickek, képkockák, kulcsképkockák, bájtok, eltérések és a kódolási idő (s)
+    """
+    actions = (ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_SOFT_DROP, ACTION_HARD_DROP)
+    weights = (3, 3, 2, 1, 1)
+    action_chance = apm * TICK_MS / 60000
+    result = {'ticks': 0, 'frames': 0, 'keyframes': 0, 'bytes': 0, 'max_frame': 0,
+              'mismatches': 0, 'publish_s': 0.0}
+
+    for game in range(games):
+        rng = random.Random(seed + game)
+        engine = TetrisEngine(seed + game, board_backend)
+        feed = SpectatorFeed()
+        decoder = SpectatorDecoder()
+        feed.subscribe(decoder)
+        for _ in range(subscribers - 1):
+            feed.subscribe(ByteCounter())
+
+        while not engine.game_over and engine.ticks < max_ticks:
+            if rng.random() < action_chance:
+                engine.step(rng.choices(actions, weights)[0])
+            engine.tick()
+            start = perf_counter()
+            frame = feed.publish(engine)
+            result['publish_s'] += perf_counter() - start
+            if frame is not None:
+                result['max_frame'] = max(result['max_frame'], len(frame))
+
+            expected = capture(engine)
+            state = decoder.state
+            if state.fields(with_tick=False) != expected.fields(with_tick=False) or \
+                    (frame is not None and state.tick != expected.tick):
+                result['mismatches'] += 1
+
+        result['ticks'] += engine.ticks
+        result['frames'] += feed.frames
+        result['keyframes'] += feed.keyframes
+        result['bytes'] += feed.bytes_encoded
+    return result
+
+
+def main(argv=None):
+    """
+    Parancssori belépési pont: bitpontos ellenőrzés és méretmérés.
+
+    Returns:
+        int: Kilépési kód (1 ha a visszafejtett állapot eltért)
+    """
+    parser = argparse.ArgumentParser(prog='python spectator.py',
+                                     description='Nézői állapotfolyam ellenőrzése és mérése')
+    parser.add_argument('--games', type=int, default=20, help='a játékok száma')
+    parser.add_argument('--seed', type=int, default=0, help='az első játék kezdőértéke')
+    parser.add_argument('--apm', type=float, default=150, help='akció/perc a véletlen játékosnak')
+    parser.add_argument('--subscribers', type=int, default=1, help='feliratkozók játékonként')
+    parser.add_argument('--backend', choices=('bitboard', 'grid'), default='bitboard',
+                        help='a játéktér háttértára')
+    args = parser.parse_args(argv)
+
+    result = run_check(args.games, args.seed, args.apm, subscribers=args.subscribers,
+                       board_backend=args.backend)
+    ticks = result['ticks']
+    grid_bytes = GRID_WIDTH * GRID_HEIGHT * 3
+    print(f"{args.games} játék, {ticks} tick, {result['frames']} képkocka "
+          f"({result['keyframes']} kulcsképkocka), legnagyobb {result['max_frame']} bájt")
+    print(f"{result['bytes'] / ticks:.2f} bájt/tick nézőnként "
+          f"(teljes RGB rács: {grid_bytes} bájt/tick), "
+          f"{result['bytes'] / max(result['frames'], 1):.1f} bájt/képkocka")
+    print(f"kódolás és szétosztás ({args.subscribers} feliratkozó): "
+          f"{result['publish_s'] / ticks * 1e6:.1f} µs/tick")
+    print(f"visszafejtés: {'OK' if not result['mismatches'] else str(result['mismatches']) + ' ELTÉRÉS'}")
+    return 1 if result['mismatches'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import pygame
+from config import *
+
+
+class BlockAtlas:
+    """
+    Előre megrajzolt blokk-sprite-ok a játéktér, az aktuális elem, a szellem
+    elem és a következő elem előnézete számára.
+
+    Színenként (SHAPE_COLORS sorrendjében) egyszer rajzoljuk meg a 3D hatású
+    blokkot, így kirajzoláskor cellánként egyetlen blit elég. A sprite-ok a
+    képernyő pixelformátumára vannak konvertálva, ezért a blit gyors.
+    """
+    def __init__(self, ui):
+        """
+        Az atlasz elkészítése. A képernyőnek már léteznie kell (convert miatt).
+
+        Args:
+            ui: A UI objektum (a színsötétítő/világosító segédfüggvényekhez)
+        """
+        self.ui = ui
+        self.preview_size = int(BLOCK_SIZE // 1.5)
+        self.color_indices = {color: index for index, color in enumerate(SHAPE_COLORS)}
+
+        # A 2 pixel vastag élek egy pixellel a cellán túl (jobbra és lefelé) is rajzolnak
+        self.blocks = self.build_atlas(BLOCK_SIZE, self.draw_block, bleed=1)
+        self.previews = self.build_atlas(self.preview_size, self.draw_preview_block)
+        self.ghosts = self.build_atlas(BLOCK_SIZE, self.draw_ghost_block, alpha=True)
+
+    def build_atlas(self, size, draw, alpha=False, bleed=0):
+        """
+        Egy sprite-változat elkészítése minden színhez egy közös felületen.
+
+        Args:
+            size: A blokk mérete pixelben
+            draw: A blokkot rajzoló függvény (felület, x, szín)
+            alpha: Pixelenkénti átlátszóság (különben kulcsszínes átlátszóság)
+            bleed: Ennyi pixellel nagyobb a sprite jobbra és lefelé, mint a cella
+
+        Returns:
+            list: Színindexenként a blokk-sprite (az atlasz részfelülete)
+        """
+        cell = size + bleed
+        width = cell * len(SHAPE_COLORS)
+        if alpha:
+            atlas = pygame.Surface((width, cell), pygame.SRCALPHA)
+            atlas.fill((0, 0, 0, 0))
+        else:
+            atlas = pygame.Surface((width, cell))
+            atlas.fill(BOARD_LAYER_KEY)
+
+        for index, color in enumerate(SHAPE_COLORS):
+            # A szomszédos sprite-ba lógó élek levágása
+            atlas.set_clip((index * cell, 0, cell, cell))
+            draw(atlas, index * cell, color)
+        atlas.set_clip(None)
+
+        if alpha:
+            atlas = atlas.convert_alpha()
+        else:
+            atlas = atlas.convert()
+            atlas.set_colorkey(BOARD_LAYER_KEY)
+        return [atlas.subsurface((index * cell, 0, cell, cell)) for index in range(len(SHAPE_COLORS))]
+
+    def draw_block(self, surface, x, color):
+        """Játéktér méretű blokk rajzolása 3D hatással."""
+        ui = self.ui
+        y = 0
+        # Fő blokk rajzolása lekerekített sarkokkal
+        pygame.draw.rect(surface, color, (x, y, BLOCK_SIZE, BLOCK_SIZE), 0, 2)
+
+        # 3D hatás - felső és bal élek világosabbak
+        pygame.draw.line(surface, ui.lighten_color(color), (x, y), (x + BLOCK_SIZE - 1, y), 2)
+        pygame.draw.line(surface, ui.lighten_color(color), (x, y), (x, y + BLOCK_SIZE - 1), 2)
+
+        # 3D hatás - alsó és jobb élek sötétebbek
+        pygame.draw.line(surface, ui.darken_color(color),
+                         (x, y + BLOCK_SIZE - 1), (x + BLOCK_SIZE - 1, y + BLOCK_SIZE - 1), 2)
+        pygame.draw.line(surface, ui.darken_color(color),
+                         (x + BLOCK_SIZE - 1, y), (x + BLOCK_SIZE - 1, y + BLOCK_SIZE - 1), 2)
+
+        # Belső árnyékolás a 3D hatáshoz
+        pygame.draw.rect(surface, ui.lighten_color(color, 0.2),
+                         (x + 4, y + 4, BLOCK_SIZE - 8, BLOCK_SIZE - 8), 0, 1)
+
+    def draw_preview_block(self, surface, x, color):
+        """A következő elem előnézetéhez használt kisebb blokk rajzolása."""
+        ui = self.ui
+        y = 0
+        size = self.preview_size
+        pygame.draw.rect(surface, color, (x, y, size, size), 0, 1)
+
+        # 3D hatás élek
+        pygame.draw.line(surface, ui.lighten_color(color), (x, y), (x + size - 1, y), 1)
+        pygame.draw.line(surface, ui.lighten_color(color), (x, y), (x, y + size - 1), 1)
+        pygame.draw.line(surface, ui.darken_color(color),
+                         (x, y + size - 1), (x + size - 1, y + size - 1), 1)
+        pygame.draw.line(surface, ui.darken_color(color),
+                         (x + size - 1, y), (x + size - 1, y + size - 1), 1)
+
+    def draw_ghost_block(self, surface, x, color):
+        """Félig átlátszó "szellem" blokk rajzolása fehér kerettel."""
+        surface.fill((color[0], color[1], color[2], 70), (x, 0, BLOCK_SIZE, BLOCK_SIZE))
+        # A képernyőn az alfa nem érvényesült, ezért a keret átlátszatlan
+        pygame.draw.rect(surface, (255, 255, 255, 255), (x, 0, BLOCK_SIZE, BLOCK_SIZE), 1, 1)
+
+    def block_for_color(self, color):
+        """
+        A játéktér méretű blokk egy RGB színhez.
+
+        Args:
+            color: A cella színe (SHAPE_COLORS egyike)
+
+        Returns:
+            Surface: A blokk-sprite
+        """
+        return self.blocks[self.color_indices[color]]
@@ -0,0 +1,634 @@
+"""
+Játékstatisztikák oszlopos, csak hozzáfűzhető tárolója.
+
+Két tábla van: games (a lezárt játékok végeredménye) és locks (opcionálisan
+minden elemrögzítés). Egy tábla szegmensfájlokból áll; egy szegmens a
+fejléc után oszloponként egybefüggő, rögzített szélességű értékeket tárol,
+így egy lekérdezés csak a szükséges oszlopokat olvassa be, közvetlenül
+NumPy tömbbe:
+
+    fejléc:   b'TCOL', verzió (1 bájt), sorok száma (8 bájt), oszlopok száma (1 bájt)
+    oszlopok: típuskód (1 bájt, array modul), névhossz (1 bájt), név
+    adatok:   oszloponként sorok száma * elemméret bájt (little-endian)
+
+A StatsWriter a sorokat a memóriában gyűjti (array oszlopok), és a kész
+kötegeket (STATS_FLUSH_ROWS sor, vagy legkésőbb STATS_FLUSH_INTERVAL
+másodperc után, illetve lezáráskor) egy háttérszál írja ki, így a fő ciklus
+nem vár a lemezre. Ha egy táblának STATS_COMPACT_SEGMENTS-nél több
+szegmense lesz, a háttérszál összefűzi őket. Egy szegmens ideiglenes
+fájlba íródik és átnevezéssel jelenik meg, így olvasáskor sosem félkész. A szegmens neve a tartalmazott kulcstartományt
+(írási időpontok, ns) jelzi; a tömörítés (compact) a tábla szegmenseit
+egyetlen, a teljes tartományt lefedő szegmensbe fűzi össze. A más
+szegmens tartományába szigorúan beleeső szegmenseket az olvasás
+figyelmen kívül hagyja, így egy félbeszakadt tömörítés sem duplikál sorokat.
+
+Több folyamat is írhat ugyanabba a könyvtárba: a szegmensek kiírása (a
+kulcs kiosztásával együtt) és a tömörítés a könyvtár zárfájlján
+(LOCK_NAME) kizárólagos zárral történik. Így két tömörítés nem fut egyszerre,
+és egy új szegmens kulcsa mindig nagyobb minden meglévő szegmens
+tartományánál (nem kerülhet egy összefűzött szegmens tartományába).
+
+A lekérdezésekhez NumPy szükséges (pip install numpy); az íráshoz nem.
+Futtatás a projekt gyökeréből:
+    python stats_store.py info                 # táblák, sorok, szegmensek
+    python stats_store.py games                # pontszámeloszlás szint szerint
+    python stats_store.py pieces               # sorok elemenként, alakzat és szint szerint
+    python stats_store.py compact              # szegmensek összefűzése
+"""
+import argparse
+import os
+import queue
+import random
+import struct
+import sys
+import threading
+import time
+from array import array
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from config import (STATS_DIR, STATS_RECORD_LOCKS, STATS_FLUSH_ROWS, STATS_FLUSH_INTERVAL,
+                    STATS_COMPACT_SEGMENTS)
+from metrics import percentile
+
+MAGIC = b'TCOL'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sBQB')
+SEGMENT_SUFFIX = '.seg'
+LOCK_NAME = '.lock'
+
+# A táblák oszlopai: (név, array típuskód)
+GAMES_COLUMNS = (
+    ('game_id', 'Q'),
+    ('ended_at', 'd'),      # a játék vége (Unix idő, s)
+    ('seed', 'Q'),
+    ('score', 'q'),
+    ('lines', 'I'),
+    ('level', 'H'),
+    ('pieces', 'I'),
+    ('ticks', 'I'),
+    ('game_over', 'B'),     # 0: a játék félbeszakadt (új játék vagy kilépés)
+    ('autoplay', 'B'),      # 1: az automatikus játékos fejezte be
+)
+LOCKS_COLUMNS = (
+    ('game_id', 'Q'),
+    ('tick', 'I'),          # a rögzítés időpontja a virtuális órán
+    ('shape', 'B'),
+    ('rotation', 'B'),
+    ('x', 'b'),
+    ('y', 'b'),
+    ('lines', 'B'),         # a rögzítéssel kitörölt sorok
+    ('combo', 'H'),
+    ('level', 'H'),
+    ('score_delta', 'i'),   # az előző rögzítés óta szerzett pontok (ejtésekkel együtt)
+)
+TABLES = {'games': GAMES_COLUMNS, 'locks': LOCKS_COLUMNS}
+
+
+def segment_name(table, first, last):
+    """
+    Egy szegmens fájlneve a kulcstartományával.
+
+    Args:
+        table: A tábla neve
+        first: A tartomány eleje (ns)
+        last: A tartomány vége (ns)
+
+    Returns:
+        str: A fájlnév
+    """
+    return f"{table}-{first:020d}-{last:020d}-{os.getpid()}{SEGMENT_SUFFIX}"
+
+
+def list_segments(directory, table):
+    """
+    Egy tábla érvényes szegmensei kulcssorrendben. A más szegmens
+    tartományába szigorúan beleeső (már összefűzött) szegmensek kimaradnak.
+
+    Args:
+        directory: A tároló könyvtára
+        table: A tábla neve
+
+    Returns:
+        list: (eleje, vége, útvonal) hármasok
+    """
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    prefix = table + '-'
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(SEGMENT_SUFFIX):
+            parts = name[len(prefix):-len(SEGMENT_SUFFIX)].split('-')
+            found.append((int(parts[0]), int(parts[1]), os.path.join(directory, name)))
+    # Tartomány eleje szerint, azonos elejűeknél a bővebb előre
+    found.sort(key=lambda segment: (segment[0], -segment[1]))
+    segments = []
+    cover_first, cover_last = -1, -1
+    for first, last, path in found:
+        if cover_first <= first and last <= cover_last and (first, last) != (cover_first, cover_last):
+            continue
+        if last > cover_last:
+            cover_first, cover_last = first, last
+        segments.append((first, last, path))
+    return segments
+
+
+class DirectoryLock:
+    """
+    Kizárólagos zár a tároló könyvtárára (folyamatok között), with blokkban
+    használva. Egy folyamaton belül nem ágyazható egymásba.
+    """
+    def __init__(self, directory):
+        """
+        Args:
+            directory: A tároló könyvtára
+        """
+        self.path = os.path.join(directory, LOCK_NAME)
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+        self.file = None
+
+
+def next_key(directory, table, previous):
+    """
+    Egy új szegmens kulcsa: az aktuális idő, de nagyobb az előző kulcsnál és
+    a tábla minden meglévő szegmensének tartományánál. A könyvtár zárja
+    alatt kell hívni (az új szegmens kiírásáig).
+
+    Args:
+        directory: A tároló könyvtára
+        table: A tábla neve
+        previous: A folyamat előző kulcsa
+
+    Returns:
+        int: A kulcs (ns)
+    """
+    newest = max((last for _, last, _ in list_segments(directory, table)), default=0)
+    return max(time.time_ns(), previous + 1, newest + 1)
+
+
+def write_segment(path, columns, data):
+    """
+    Egy szegmens kiírása: ideiglenes fájlba, majd átnevezéssel a helyére.
+
+    Args:
+        path: A szegmens útvonala
+        columns: (név, típuskód) párok
+        data: Oszloponként egy array, azonos hosszal
+    """
+    rows = len(data[0])
+    out = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, rows, len(columns)))
+    for name, typecode in columns:
+        encoded = name.encode()
+        out += typecode.encode() + bytes((len(encoded),)) + encoded
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(out)
+        for values in data:
+            if sys.byteorder == 'big':
+                values = array(values.typecode, values)
+                values.byteswap()
+            values.tofile(f)
+    os.replace(temp_path, path)
+
+
+def read_header(f):
+    """
+    Egy szegmens fejlécének beolvasása.
+
+    Args:
+        f: A megnyitott szegmensfájl (az elején)
+
+    Returns:
+        tuple: (sorok száma, oszlopok [(név, típuskód)], az adatok kezdőpozíciója)
+
+    Raises:
+        ValueError: Ha a fájl nem szegmens
+    """
+    magic, version, rows, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Ismeretlen szegmens: {f.name}")
+    columns = []
+    for _ in range(count):
+        typecode, length = f.read(2)
+        columns.append((f.read(length).decode(), chr(typecode)))
+    return rows, columns, f.tell()
+
+
+def read_segment(path):
+    """
+    Egy szegmens összes oszlopának beolvasása (NumPy nélkül, pl. tömörítéshez).
+
+    Args:
+        path: A szegmens útvonala
+
+    Returns:
+        tuple: (oszlopok [(név, típuskód)], oszloponként egy array)
+    """
+    with open(path, 'rb') as f:
+        rows, columns, _ = read_header(f)
+        data = []
+        for _, typecode in columns:
+            values = array(typecode)
+            values.fromfile(f, rows)
+            if sys.byteorder == 'big':
+                values.byteswap()
+            data.append(values)
+    return columns, data
+
+
+def compact(directory, table):
+    """
+    Egy tábla szegmenseinek összefűzése egyetlen szegmensbe, a könyvtár
+    zárja alatt (a többi folyamat közben nem ír és nem tömörít).
+
+    Args:
+        directory: A tároló könyvtára
+        table: A tábla neve
+
+    Returns:
+        int: Az összefűzött szegmensek száma (0 ha nem volt mit)
+    """
+    if not os.path.isdir(directory):
+        return 0
+    with DirectoryLock(directory):
+        return compact_locked(directory, table)
+
+
+def compact_locked(directory, table):
+    """
+    A compact() törzse; a könyvtár zárját a hívó tartja.
+
+    Args:
+        directory: A tároló könyvtára
+        table: A tábla neve
+
+    Returns:
+        int: Az összefűzött szegmensek száma (0 ha nem volt mit)
+    """
+    segments = list_segments(directory, table)
+    if len(segments) < 2:
+        return 0
+    columns = TABLES[table]
+    merged = [array(typecode) for _, typecode in columns]
+    for _, _, path in segments:
+        segment_columns, data = read_segment(path)
+        if segment_columns != list(columns):
+            raise ValueError(f"Eltérő oszlopok: {path}")
+        for target, values in zip(merged, data):
+            target.extend(values)
+
+    first = segments[0][0]
+    last = max(segment[1] for segment in segments)
+    write_segment(os.path.join(directory, segment_name(table, first, last)), columns, merged)
+    # Az új szegmens lefedi a régieket: ha a törlés félbemarad, az olvasás akkor is kihagyja őket
+    for _, _, path in segments:
+        os.remove(path)
+    return len(segments)
+
+
+class TableBuffer:
+    """Egy tábla még ki nem írt sorai, oszloponként egy array-ben."""
+    def __init__(self, columns):
+        """
+        Args:
+            columns: (név, típuskód) párok
+        """
+        self.columns = columns
+        self.data = [array(typecode) for _, typecode in columns]
+
+    def __len__(self):
+        return len(self.data[0])
+
+    def append(self, values):
+        """
+        Egy sor hozzáfűzése.
+
+        Args:
+            values: Az oszlopok értékei a columns sorrendjében
+        """
+        for column, value in zip(self.data, values):
+            column.append(value)
+
+    def take(self):
+        """
+        A gyűjtött sorok átvétele (a puffer kiürül).
+
+        Returns:
+            list: Oszloponként egy array
+        """
+        data = self.data
+        self.data = [array(typecode) for _, typecode in self.columns]
+        return data
+
+
+class StatsWriter:
+    """
+    A játékok és a rögzítések gyűjtése és háttérszálon történő kiírása.
+    A fő szál csak array-ekbe fűz; a kiírandó kötegek egy sorban várnak.
+    """
+    def __init__(self, directory=STATS_DIR, record_locks=STATS_RECORD_LOCKS,
+                 flush_rows=STATS_FLUSH_ROWS, flush_interval=STATS_FLUSH_INTERVAL,
+                 compact_segments=STATS_COMPACT_SEGMENTS):
+        """
+        Args:
+            directory: A tároló könyvtára (szükség esetén létrejön)
+            record_locks: Minden elemrögzítés naplózása is
+            flush_rows: Egy táblában ennyi gyűjtött sor után a köteg kiíródik
+            flush_interval: Legkésőbb ennyi másodperc után a gyűjtött sorok kiíródnak
+            compact_segments: Ennél több szegmensnél a tábla összefűződik (0: soha)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.record_locks = record_locks
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.compact_segments = compact_segments
+        self.flushed_at = time.monotonic()
+        self.games = TableBuffer(GAMES_COLUMNS)
+        self.locks = TableBuffer(LOCKS_COLUMNS)
+        self.last_key = 0
+        self.games_written = 0
+
+        # Az aktuális játék azonosítója és az előző rögzítéskori pontszám, sorok
+        self.game_id = 0
+        self.lock_score = 0
+        self.lock_lines = 0
+
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self.write_loop, daemon=True)
+        self.thread.start()
+
+    def start_game(self, engine):
+        """
+        Új játék kezdődött (a motor reset() után).
+
+        Args:
+            engine: A TetrisEngine
+        """
+        self.game_id = random.getrandbits(64)
+        self.lock_score = engine.score
+        self.lock_lines = engine.lines_cleared
+
+    def record_lock(self, engine):
+        """
+        Egy elemrögzítés naplózása (EVENT_LOCK után; ha a naplózás ki van kapcsolva, nem csinál semmit).
+
+        Args:
+            engine: A TetrisEngine
+        """
+        if not self.record_locks:
+            return
+        piece = engine.locked_piece
+        self.locks.append((self.game_id, engine.ticks, piece.shape_index, piece.rotation,
+                           piece.x, piece.y, engine.lines_cleared - self.lock_lines,
+                           engine.combo, engine.level, engine.score - self.lock_score))
+        self.lock_score = engine.score
+        self.lock_lines = engine.lines_cleared
+        self.flush_if_due(self.locks)
+
+    def finish_game(self, engine, autoplay=False):
+        """
+        Egy játék végeredményének rögzítése (a sor a többivel együtt, kötegben íródik ki).
+
+        Args:
+            engine: A TetrisEngine (a játék végén, a reset() előtt)
+            autoplay: Az automatikus játékos irányított-e
+        """
+        self.games.append((self.game_id, time.time(), engine.seed, engine.score,
+                           engine.lines_cleared, engine.level, engine.pieces, engine.ticks,
+                           engine.game_over, autoplay))
+        self.games_written += 1
+        self.flush_if_due(self.games)
+
+    def flush_if_due(self, buffer):
+        """
+        Kiírás, ha a tábla kötege betelt, vagy a legutóbbi kiírás óta letelt a flush_interval.
+
+        Args:
+            buffer: A most bővült tábla TableBuffer-e
+        """
+        if len(buffer) >= self.flush_rows:
+            self.submit('games' if buffer is self.games else 'locks', buffer)
+        elif time.monotonic() - self.flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """A gyűjtött sorok átadása a háttérszálnak."""
+        if len(self.games):
+            self.submit('games', self.games)
+        if len(self.locks):
+            self.submit('locks', self.locks)
+        self.flushed_at = time.monotonic()
+
+    def submit(self, table, buffer):
+        """
+        Egy tábla gyűjtött sorainak sorba állítása kiírásra.
+
+        Args:
+            table: A tábla neve
+            buffer: A tábla TableBuffer-e
+        """
+        self.pending.put((table, buffer.take()))
+
+    def write_loop(self):
+        """A háttérszál: a sorba állított kötegek kiírása szegmensenként."""
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            table, data = item
+            try:
+                with DirectoryLock(self.directory):
+                    # A kulcs a zár alatt: nagyobb minden meglévő (akár más folyamat által
+                    # összefűzött) szegmens tartományánál
+                    key = next_key(self.directory, table, self.last_key)
+                    self.last_key = key
+                    write_segment(os.path.join(self.directory, segment_name(table, key, key)),
+                                  TABLES[table], data)
+                    if (self.compact_segments
+                            and len(list_segments(self.directory, table)) > self.compact_segments):
+                        compact_locked(self.directory, table)
+            except OSError as e:
+                print(f"A statisztika nem írható ({e}).")
+
+    def close(self):
+        """A maradék sorok kiírása és a háttérszál leállítása (megvárja a kiírást)."""
+        self.flush()
+        self.pending.put(None)
+        self.thread.join()
+
+
+def load_table(directory, table, names=None):
+    """
+    Egy tábla oszlopainak beolvasása NumPy tömbökbe (csak a kért oszlopokat olvassa).
+
+    Args:
+        directory: A tároló könyvtára
+        table: A tábla neve
+        names: A kért oszlopok (None: mind)
+
+    Returns:
+        dict: oszlopnév -> numpy tömb (az összes szegmens egymás után)
+    """
+    import numpy as np
+
+    columns = dict(TABLES[table])
+    names = list(columns) if names is None else names
+    parts = {name: [] for name in names}
+    for _, _, path in list_segments(directory, table):
+        with open(path, 'rb') as f:
+            rows, segment_columns, offset = read_header(f)
+            for name, typecode in segment_columns:
+                dtype = np.dtype(typecode).newbyteorder('<')
+                if name in parts:
+                    f.seek(offset)
+                    parts[name].append(np.fromfile(f, dtype, rows))
+                offset += rows * dtype.itemsize
+    return {name: (np.concatenate(chunks) if chunks else np.zeros(0, np.dtype(columns[name])))
+            for name, chunks in parts.items()}
+
+
+def grouped(keys, values, fractions=(0.5, 0.95)):
+    """
+    Csoportonkénti darabszám, átlag és percentilisek (egyetlen rendezéssel).
+
+    Args:
+        keys: A csoportkulcsok tömbje
+        values: Az értékek tömbje
+        fractions: A kért percentilisek
+
+    Returns:
+        list: (kulcs, darab, átlag, percentilisek...) sorok kulcs szerint növekvő sorrendben
+    """
+    import numpy as np
+
+    order = np.lexsort((values, keys))
+    keys = keys[order]
+    values = values[order].astype(np.float64)
+    unique, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    sums = np.add.reduceat(values, starts) if len(values) else np.zeros(0)
+    rows = []
+    for key, start, count, total in zip(unique, starts, counts, sums):
+        group = values[start:start + count]
+        row = [int(key), int(count), total / count]
+        row.extend(float(percentile(group, fraction)) for fraction in fractions)
+        rows.append(tuple(row))
+    return rows
+
+
+def print_rows(header, rows):
+    """
+    Táblázat kiírása igazított oszlopokkal.
+
+    Args:
+        header: Az oszlopok fejlécei
+        rows: A sorok (számok)
+    """
+    print(''.join(f"{title:>12}" for title in header))
+    for row in rows:
+        print(''.join(f"{value:>12,}" if isinstance(value, int) else f"{value:>12,.2f}"
+                      for value in row))
+
+
+def query_info(directory):
+    """Táblánként a sorok, szegmensek száma és a méret."""
+    for table in TABLES:
+        segments = list_segments(directory, table)
+        rows = 0
+        size = 0
+        for _, _, path in segments:
+            with open(path, 'rb') as f:
+                rows += read_header(f)[0]
+            size += os.path.getsize(path)
+        print(f"{table:<6} {rows:>12,} sor, {len(segments):>6} szegmens, {size / 1e6:10.2f} MB")
+
+
+def query_games(directory, finished_only):
+    """Pontszámeloszlás a végső szint szerint."""
+    import numpy as np
+
+    games = load_table(directory, 'games', ['level', 'score', 'lines', 'pieces', 'game_over'])
+    if finished_only:
+        keep = games['game_over'] == 1
+        games = {name: values[keep] for name, values in games.items()}
+    if not len(games['score']):
+        print("Nincs rögzített játék.")
+        return
+    rows = grouped(games['level'], games['score'])
+    lines = np.bincount(games['level'], weights=games['lines'])
+    pieces = np.bincount(games['level'], weights=games['pieces'])
+    print_rows(('szint', 'játék', 'átlag', 'medián', 'p95', 'sor/elem'),
+               [row + (lines[row[0]] / max(pieces[row[0]], 1),) for row in rows])
+    print(f"összesen {len(games['score']):,} játék, átlagos pontszám {games['score'].mean():,.1f}, "
+          f"legjobb {int(games['score'].max()):,}")
+
+
+def query_pieces(directory):
+    """Sorok elemenként és a pontszám-növekmény alakzat, majd szint szerint."""
+    locks = load_table(directory, 'locks', ['shape', 'level', 'lines', 'score_delta'])
+    if not len(locks['lines']):
+        print("Nincs rögzített elem (a naplózás: python main.py --stats-locks).")
+        return
+    for key, title in (('shape', 'alakzat'), ('level', 'szint')):
+        lines = grouped(locks[key], locks['lines'], ())
+        deltas = grouped(locks[key], locks['score_delta'], (0.5,))
+        print_rows((title, 'elem', 'sor/elem', 'pont/elem', 'medián'),
+                   [line + delta[2:] for line, delta in zip(lines, deltas)])
+        print()
+
+
+def main(argv=None):
+    """
+    Parancssori belépési pont: lekérdezések és tömörítés.
+
+    Returns:
+        int: Kilépési kód
+    """
+    parser = argparse.ArgumentParser(prog='python stats_store.py',
+                                     description='Játékstatisztikák lekérdezése és tömörítése')
+    parser.add_argument('command', choices=('info', 'games', 'pieces', 'compact'),
+                        help='info: méretek, games: pontszámok szint szerint, '
+                             'pieces: rögzítések, compact: szegmensek összefűzése')
+    parser.add_argument('--dir', default=STATS_DIR, help='a tároló könyvtára')
+    parser.add_argument('--finished', action='store_true',
+                        help='csak a véget ért (nem félbeszakadt) játékok')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == 'info':
+        query_info(args.dir)
+    elif args.command == 'games':
+        query_games(args.dir, args.finished)
+    elif args.command == 'pieces':
+        query_pieces(args.dir)
+    else:
+        for table in TABLES:
+            merged = compact(args.dir, table)
+            print(f"{table}: {merged} szegmens összefűzve")
+    print(f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
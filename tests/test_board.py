@@ -0,0 +1,157 @@
+"""
+A játéktér háttértárai (GridBoard, BitBoard) az eredeti játék szabályai
+szerint: véletlen állásokon az ütközésvizsgálat, a rögzítés és a
+sortörlés eredményét egy, az eredeti rács ábrázolásán dolgozó
+referenciával vetjük össze.
+"""
+import random
+
+import pytest
+
+from board import Board, BOARD_BACKENDS, EMPTY
+from config import SHAPES, SHAPE_COLORS, GRID_WIDTH, GRID_HEIGHT
+from piece import Piece
+from zobrist import board_hash
+
+
+class ReferenceGrid:
+    """Az eredeti ábrázolás: 20x10-es RGB rács, cellánkénti összevetéssel."""
+    def __init__(self):
+        self.grid = [[EMPTY] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
+
+    def valid_move(self, piece, x_offset=0, y_offset=0):
+        for i, row in enumerate(piece.get_shape()):
+            for j, cell in enumerate(row):
+                if cell == '0':
+                    x = piece.x + j + x_offset
+                    y = piece.y + i + y_offset
+                    if x < 0 or x >= GRID_WIDTH:
+                        return False
+                    if 0 <= y < GRID_HEIGHT and self.grid[y][x] != EMPTY:
+                        return False
+                    if y >= GRID_HEIGHT:
+                        return False
+        return True
+
+    def place(self, piece):
+        cells = [(piece.x + j, piece.y + i)
+                 for i, row in enumerate(piece.get_shape())
+                 for j, cell in enumerate(row) if cell == '0']
+        if any(y < 0 for _, y in cells):
+            return False
+        for x, y in cells:
+            self.grid[y][x] = piece.color
+        return True
+
+    def clear_lines(self):
+        # A teli sorok eltűnnek, a fölöttük lévők lecsúsznak
+        kept = [row for row in self.grid if any(color == EMPTY for color in row)]
+        cleared = GRID_HEIGHT - len(kept)
+        self.grid = [[EMPTY] * GRID_WIDTH for _ in range(cleared)] + kept
+        return cleared
+
+    def row_mask(self, y):
+        return sum(1 << x for x, color in enumerate(self.grid[y]) if color != EMPTY)
+
+
+def random_piece(rng):
+    piece = Piece(rng.randint(-3, GRID_WIDTH), 0, rng.randrange(len(SHAPES)))
+    piece.rotation = rng.randrange(len(piece.shape))
+    piece.y = rng.randint(-4, GRID_HEIGHT)
+    return piece
+
+
+def drop(reference, shape_index, rng, deepest):
+    """
+    Az elem leejtése a kezdősorból egy véletlen vagy a legmélyebb érvényes
+    (forgatás, x) helyre; None ha sehol sem fér el.
+    """
+    options = []
+    for rotation in range(len(SHAPES[shape_index])):
+        for x in range(-3, GRID_WIDTH):
+            piece = Piece(x, 0, shape_index)
+            piece.rotation = rotation
+            if reference.valid_move(piece):
+                while reference.valid_move(piece, 0, 1):
+                    piece.move_down()
+                options.append(piece)
+    if not options:
+        return None
+    if deepest:
+        return max(options, key=lambda piece: piece.y + len(piece.get_shape()))
+    return rng.choice(options)
+
+
+def assert_same(board, reference):
+    assert [board.row_mask(y) for y in range(GRID_HEIGHT)] == \
+        [reference.row_mask(y) for y in range(GRID_HEIGHT)]
+    assert board.grid == reference.grid
+    heights = [max((GRID_HEIGHT - y for y in range(GRID_HEIGHT) if reference.grid[y][x] != EMPTY),
+                   default=0) for x in range(GRID_WIDTH)]
+    assert board.column_heights == heights
+    assert board.hash == board_hash(board)
+
+
+@pytest.mark.parametrize('backend', sorted(BOARD_BACKENDS))
+@pytest.mark.parametrize('seed', range(5))
+def test_backend_matches_reference(backend, seed):
+    rng = random.Random(seed)
+    board = BOARD_BACKENDS[backend]()
+    reference = ReferenceGrid()
+    cleared_total = 0
+    for _ in range(300):
+        # Ütközésvizsgálat tetszőleges (akár pályán kívüli) pozíciókban
+        for _ in range(20):
+            piece = random_piece(rng)
+            dx, dy = rng.randint(-1, 1), rng.randint(-1, 1)
+            assert board.fits(piece, dx, dy) == reference.valid_move(piece, dx, dy)
+
+        # Egy elem leejtése: többnyire a legmélyebb helyre, hogy sok sor teljen be
+        piece = drop(reference, rng.randrange(len(SHAPES)), rng, deepest=rng.random() < 0.9)
+        if piece is None:
+            board = BOARD_BACKENDS[backend]()
+            reference = ReferenceGrid()
+            continue
+        placed = reference.place(piece)
+        assert board.place(piece) == placed
+        if not placed:
+            board = BOARD_BACKENDS[backend]()
+            reference = ReferenceGrid()
+            continue
+        cleared = reference.clear_lines()
+        assert board.clear_lines() == cleared
+        cleared_total += cleared
+        assert_same(board, reference)
+    assert cleared_total > 0
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_backends_agree_on_garbage_and_copy(seed):
+    rng = random.Random(seed)
+    boards = [BOARD_BACKENDS[backend]() for backend in sorted(BOARD_BACKENDS)]
+    rows = [rng.randrange(1 << GRID_WIDTH) if y > GRID_HEIGHT // 2 else 0 for y in range(GRID_HEIGHT)]
+    for board in boards:
+        board.load_rows(rows)
+    for _ in range(8):
+        count, hole = rng.randint(1, 3), rng.randrange(GRID_WIDTH)
+        results = [board.add_garbage(count, hole) for board in boards]
+        assert results[0] == results[1]
+        grid, bit = boards
+        for y in range(GRID_HEIGHT):
+            assert grid.row_mask(y) == bit.row_mask(y)
+            assert grid.row_colors(y) == bit.row_colors(y)
+        assert grid.column_heights == bit.column_heights
+        assert grid.hash == bit.hash == board_hash(bit)
+
+    for board in boards:
+        copy = type(board)()
+        copy.copy_from(board)
+        assert [copy.row_mask(y) for y in range(GRID_HEIGHT)] == \
+            [board.row_mask(y) for y in range(GRID_HEIGHT)]
+        assert copy.grid == board.grid
+        assert (copy.hash, copy.column_heights) == (board.hash, board.column_heights)
+
+
+def test_board_is_abstract():
+    with pytest.raises(TypeError):
+        Board()
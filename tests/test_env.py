@@ -0,0 +1,55 @@
+"""
+A gym-stílusú környezet: az egyetlen környezet (TetrisEngine alapú)
+ugyanazt adja, mint az egyméretű vektoros környezet (BatchEngine alapú),
+és egy lépése gyorsabb a grid listát bejáró Python-ciklusnál.
+"""
+from statistics import median
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from ai import AutoPlayer
+from env import TetrisEnv, VectorTetrisEnv, encode_action
+from benchmarks.bench_env import bench_env_step, bench_grid_loop
+
+
+@pytest.mark.parametrize('seed, max_pieces, autoplay',
+                         [(1, None, False), (2, None, False), (3, 10, False), (4, None, True)])
+def test_single_env_matches_vector_env(seed, max_pieces, autoplay):
+    # Az automatikus játékos hosszú játékot játszik (sortörlések, combo, szintek)
+    player = AutoPlayer(lookahead=False) if autoplay else None
+    single = TetrisEnv(max_pieces)
+    vector = VectorTetrisEnv(1, max_pieces, autoreset=False)
+    observation, _ = single.reset(seed)
+    vector_observation, _ = vector.reset(seed)
+    generator = np.random.default_rng(seed)
+    for _ in range(200):
+        assert (single.action_mask() == vector.action_masks()[0]).all()
+        for name, values in observation.items():
+            assert (values == vector_observation[name][0]).all(), name
+        action = single.action_space.sample(generator)
+        if player is not None:
+            action = encode_action(*player.choose(single.engine))
+        observation, reward, terminated, truncated, _ = single.step(action)
+        vector_observation, rewards, terminateds, truncateds, _ = vector.step((action,))
+        assert (reward, terminated, truncated) == (rewards[0], terminateds[0], truncateds[0])
+        if terminated or truncated:
+            break
+
+
+def test_observation_is_updated_in_place():
+    env = TetrisEnv()
+    observation, _ = env.reset(5)
+    board = observation['board']
+    for action in range(10):
+        returned, _, _, _, _ = env.step(action)
+        assert returned['board'] is board
+    assert board.any()
+
+
+def test_single_env_step_beats_grid_loop():
+    # Teljesítménykapu: a medián lépésidő a Python-ciklusos csomagolóé alatt marad
+    env_step = median(bench_env_step(15))
+    grid_loop = median(bench_grid_loop(15))
+    assert env_step < grid_loop
@@ -0,0 +1,70 @@
+"""
+Egyezési ellenőrzések: a köteges szimulátor, a visszajátszás és a nézői
+folyam ugyanazt kell adja, mint a TetrisEngine. Kis játék- és lépésszámmal
+futnak, hogy egy motorváltozás ne rontsa el őket észrevétlenül.
+"""
+import random
+
+import pytest
+
+from engine import (TetrisEngine, ACTION_LEFT, ACTION_RIGHT,
+                    ACTION_ROTATE, ACTION_SOFT_DROP, ACTION_HARD_DROP)
+from replay import Recording, verify
+import spectator
+
+
+def test_batch_cross_check():
+    pytest.importorskip('numpy')
+    import batch
+    assert batch.cross_check(range(8), steps=60, policy_seed=1) == []
+
+
+def record_game(seed, ticks, action_seed):
+    """
+    Véletlen akciókkal játszott játék felvétele (mint a TetrisGame.run_tick()).
+
+    Args:
+        seed: A motor kezdőértéke
+        ticks: Legfeljebb ennyi tick
+        action_seed: Az akciókat választó véletlenszám-generátor kezdőértéke
+
+    Returns:
+        Recording: A lezárt felvétel
+    """
+    rng = random.Random(action_seed)
+    actions = (ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_SOFT_DROP, ACTION_HARD_DROP)
+    engine = TetrisEngine()
+    engine.reset(seed)
+    recording = Recording(engine.seed)
+    for _ in range(ticks):
+        if engine.game_over:
+            break
+        if rng.random() < 0.05:
+            action = rng.choice(actions)
+            recording.record(engine.ticks, action)
+            engine.step(action)
+        engine.tick()
+    recording.finish(engine)
+    return recording
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_replay_verify(seed, tmp_path):
+    recording = record_game(seed, 20000, action_seed=seed)
+    path = tmp_path / 'game.trpl'
+    recording.save(path)
+    assert verify(Recording.load(path)) == []
+
+
+def test_replay_detects_mismatch():
+    recording = record_game(4, 5000, action_seed=4)
+    ticks, score, lines, board = recording.final
+    recording.final = (ticks, score + 1, lines, board)
+    assert [field for field, _, _ in verify(recording)] == ['score']
+
+
+@pytest.mark.parametrize('backend', ['bitboard', 'grid'])
+def test_spectator_decode(backend):
+    result = spectator.run_check(2, seed=0, max_ticks=3000, board_backend=backend)
+    assert result['ticks'] > 0
+    assert result['mismatches'] == 0
@@ -0,0 +1,25 @@
+"""Az LRU gyorsítótár (a TextCache és a TranspositionTable alapja)."""
+from lru import LRUCache
+from zobrist import TranspositionTable
+
+
+def test_least_recently_used_is_evicted():
+    cache = LRUCache(2)
+    cache.store('a', 1)
+    cache.store('b', 2)
+    assert cache.lookup('a') == 1
+    cache.store('c', 3)
+    assert cache.lookup('b') is None
+    assert (cache.lookup('a'), cache.lookup('c')) == (1, 3)
+    assert cache.stats() == {'entries': 2, 'hits': 3, 'misses': 1, 'evictions': 1,
+                             'hit_rate': 0.75}
+
+
+def test_clear_keeps_counters():
+    table = TranspositionTable(4)
+    table.store((1, 2), 'x')
+    assert table.lookup((1, 2)) == 'x'
+    table.clear()
+    assert len(table) == 0
+    assert table.lookup((1, 2), 'none') == 'none'
+    assert (table.hits, table.misses) == (1, 1)
@@ -0,0 +1,69 @@
+"""
+A statisztika-tároló párhuzamos írása és tömörítése: több folyamat ír
+ugyanabba a könyvtárba, közben tömörítés is fut; egy sor sem veszhet el
+és nem duplikálódhat.
+"""
+import multiprocessing
+
+from stats_store import (StatsWriter, compact, list_segments, read_segment,
+                         GAMES_COLUMNS)
+from engine import TetrisEngine
+
+WRITERS = 4
+GAMES = 150
+
+
+def write_games(directory, writer_index):
+    """
+    Egy író folyamat: GAMES játék, minden játék külön szegmensbe, gyakori tömörítéssel.
+
+    Args:
+        directory: A tároló könyvtára
+        writer_index: Az író sorszáma (a játékazonosítók ebből adódnak)
+    """
+    engine = TetrisEngine(seed=writer_index)
+    writer = StatsWriter(directory, flush_rows=1, compact_segments=8)
+    for game in range(GAMES):
+        writer.game_id = writer_index * GAMES + game
+        writer.finish_game(engine)
+    writer.close()
+
+
+def compact_loop(directory, rounds):
+    """
+    Egy tömörítő folyamat (mint a python stats_store.py compact).
+
+    Args:
+        directory: A tároló könyvtára
+        rounds: A tömörítések száma
+    """
+    for _ in range(rounds):
+        compact(directory, 'games')
+
+
+def stored_game_ids(directory):
+    """Az olvasás által látott összes game_id (NumPy nélkül)."""
+    index = [name for name, _ in GAMES_COLUMNS].index('game_id')
+    ids = []
+    for _, _, path in list_segments(directory, 'games'):
+        _, data = read_segment(path)
+        ids.extend(data[index])
+    return ids
+
+
+def test_concurrent_writers_and_compaction(tmp_path):
+    directory = str(tmp_path / 'stats')
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=write_games, args=(directory, index))
+                 for index in range(WRITERS)]
+    processes.append(context.Process(target=compact_loop, args=(directory, 200)))
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    assert sorted(stored_game_ids(directory)) == list(range(WRITERS * GAMES))
+    compact(directory, 'games')
+    assert len(list_segments(directory, 'games')) == 1
+    assert sorted(stored_game_ids(directory)) == list(range(WRITERS * GAMES))
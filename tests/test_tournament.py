@@ -0,0 +1,64 @@
+"""
+A verseny folytatása: megszakítás (csonka utolsó sor) után a futás pontosan
+a hiányzó játékokat pótolja, eltérő paraméterekkel pedig nem folytatható.
+"""
+import json
+import os
+
+import pytest
+
+import tournament
+
+SEEDS = range(10)
+
+
+def scores(results):
+    """Kezdőértékenként az eredmény (a futásidő nélkül)."""
+    return {result['seed']: {key: value for key, value in result.items() if key != 'duration_s'}
+            for result in results}
+
+
+def run(output, player='harddrop', max_pieces=30):
+    return tournament.run(SEEDS, str(output), player, max_pieces=max_pieces, workers=1, chunk=3)
+
+
+def test_resume_after_truncation(tmp_path):
+    full = run(tmp_path / 'full.jsonl')
+
+    output = tmp_path / 'resumed.jsonl'
+    run(output)
+    # Megszakítás: az utolsó eredménysor félig íródott ki, előtte két sor teljesen hiányzik
+    lines = output.read_bytes().splitlines(keepends=True)
+    output.write_bytes(b''.join(lines[:-3]) + lines[-3][:15])
+
+    resumed = run(output)
+    assert scores(resumed) == scores(full)
+    params, results, valid = tournament.load_results(str(output))
+    assert params == tournament.run_params('harddrop', None, 30)
+    assert valid == os.path.getsize(output)
+    assert sorted(result['seed'] for result in results) == list(SEEDS)
+
+
+def test_truncated_header_starts_over(tmp_path):
+    output = tmp_path / 'out.jsonl'
+    output.write_bytes(b'{"run": {"pla')
+    results = run(output)
+    assert sorted(result['seed'] for result in results) == list(SEEDS)
+    assert json.loads(output.read_bytes().splitlines()[0])['run']['player'] == 'harddrop'
+
+
+@pytest.mark.parametrize('player, max_pieces', [('autoplay-fast', 30), ('harddrop', 40)])
+def test_resume_with_other_params_is_refused(tmp_path, player, max_pieces):
+    output = tmp_path / 'out.jsonl'
+    run(output)
+    before = output.read_bytes()
+    with pytest.raises(ValueError):
+        run(output, player, max_pieces)
+    assert output.read_bytes() == before
+
+
+def test_file_without_header_is_refused(tmp_path):
+    output = tmp_path / 'old.jsonl'
+    output.write_text(json.dumps({'seed': 0, 'score': 1}) + '\n')
+    with pytest.raises(ValueError):
+        run(output)
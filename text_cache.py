@@ -0,0 +1,64 @@
+"""
+Renderelt feliratok gyorsítótára.
+
+A font.render a képkocka egyik legdrágább hívása, a feliratok többsége
+viszont képkockáról képkockára ugyanaz. A TextCache a (szöveg, betűtípus,
+szín) kulcshoz tartozó kész felületeket tartja meg, legfeljebb
+max_entries darabot, a legrégebben használtat eldobva.
+"""
+from config import TEXT_CACHE_SIZE
+from lru import LRUCache
+
+# Az árnyék színe (a szöveg mögé eltolva rajzoljuk)
+SHADOW_COLOR = (0, 0, 0, 160)
+
+
+class TextCache(LRUCache):
+    """
+    LRU gyorsítótár a renderelt szövegfelületekhez, találat/hiány számlálókkal.
+    """
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        """
+        Args:
+            max_entries: A tárolt feliratok legnagyobb száma
+        """
+        super().__init__(max_entries)
+
+    def get(self, text, font, color, shadow=True):
+        """
+        A felirat felülete(i), szükség esetén rendereléssel.
+
+        Az árnyék külön bejegyzés (SHADOW_COLOR színnel), így ugyanazon szöveg
+        különböző színű változatai közös árnyékfelületet használnak.
+
+        Args:
+            text: A megjelenítendő szöveg
+            font: A használt betűtípus
+            color: A szöveg színe
+            shadow: Kell-e árnyékfelület is
+
+        Returns:
+            tuple: (szövegfelület, árnyékfelület vagy None)
+        """
+        shadow_surface = self.render(text, font, SHADOW_COLOR) if shadow else None
+        return self.render(text, font, color), shadow_surface
+
+    def render(self, text, font, color):
+        """
+        Egy felirat felülete a gyorsítótárból, vagy rendereléssel, ha nincs benne.
+
+        Args:
+            text: A megjelenítendő szöveg
+            font: A használt betűtípus
+            color: A szöveg színe
+
+        Returns:
+            Surface: A renderelt szöveg
+        """
+        # A pygame a színösszetevőket egészre kerekíti, így a kulcs is egész
+        key = (text, font, tuple(int(c) for c in color))
+        surface = self.lookup(key)
+        if surface is None:
+            surface = font.render(text, True, key[2])
+            self.store(key, surface)
+        return surface
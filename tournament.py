@@ -0,0 +1,329 @@
+"""
+Sok rögzített kezdőértékű játék lejátszása több processzormagon, játékos-
+változatok (heurisztikák, súlyok) összehasonlításához.
+
+A kezdőértékek darabokban (--chunk) kerülnek a munkafolyamatokhoz; minden
+munkafolyamat egyetlen motort és játékost használ újra. A kimeneti fájl
+első sora a futás paraméterei (játékos, súlyok, elemkorlát), utána a darabok
+eredményei beérkezésük sorrendjében, játékonként egy JSON sorként íródnak,
+így egy megszakított futás ugyanazzal a paranccsal folytatható: a fájlban
+már szereplő kezdőértékek kimaradnak. Eltérő paraméterekkel a folytatás
+hibát ad (más kimeneti fájl kell).
+
+Futtatás a projekt gyökeréből:
+    python tournament.py --games 100000 --output eredmeny.jsonl
+    python tournament.py --games 1000 --player autoplay-fast --weights '{"holes": -0.5}'
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+from config import AI_WEIGHTS
+from engine import TetrisEngine, ACTION_HARD_DROP
+from ai import AutoPlayer, play
+from metrics import percentile
+
+DEFAULT_CHUNK = 50
+DEFAULT_MAX_PIECES = 500
+
+
+class HardDropPlayer:
+    """Viszonyítási alap: minden elemet azonnal leejt a kezdőpozícióból."""
+    def next_action(self, engine):
+        return ACTION_HARD_DROP
+
+
+def create_player(name, weights=None):
+    """
+    Játékos-változat létrehozása név alapján.
+
+    Args:
+        name: 'autoplay', 'autoplay-fast' (előretekintés nélkül) vagy 'harddrop'
+        weights: A heurisztika súlyai (csak az automatikus játékosnál)
+
+    Returns:
+        A játékos (next_action(engine) metódussal)
+    """
+    if name == 'autoplay':
+        return AutoPlayer(weights, lookahead=True)
+    if name == 'autoplay-fast':
+        return AutoPlayer(weights, lookahead=False)
+    if name == 'harddrop':
+        return HardDropPlayer()
+    raise ValueError(f"Ismeretlen játékos: {name}")
+
+
+PLAYERS = ('autoplay', 'autoplay-fast', 'harddrop')
+
+# A munkafolyamat saját motorja és játékosa (init_worker() hozza létre)
+_worker = None
+
+
+def init_worker(player, weights, max_pieces):
+    """
+    Munkafolyamat inicializálása: egy motor és egy játékos az összes játékhoz.
+
+    Args:
+        player: A játékos-változat neve
+        weights: A heurisztika súlyai
+        max_pieces: Legfeljebb ennyi elem játékonként
+    """
+    global _worker
+    _worker = (TetrisEngine(), create_player(player, weights), max_pieces)
+
+
+def play_game(engine, player, seed, max_pieces):
+    """
+    Egy játék lejátszása.
+
+    Args:
+        engine: A játékmotor
+        player: A játékos
+        seed: A játék kezdőértéke
+        max_pieces: Legfeljebb ennyi elem
+
+    Returns:
+        dict: seed, score, lines, level, pieces, game_over, duration_s
+    """
+    start = perf_counter()
+    engine.reset(seed)
+    play(engine, player, max_pieces)
+    return {
+        'seed': seed,
+        'score': engine.score,
+        'lines': engine.lines_cleared,
+        'level': engine.level,
+        'pieces': engine.pieces,
+        'game_over': engine.game_over,
+        'duration_s': round(perf_counter() - start, 6),
+    }
+
+
+def play_chunk(seeds):
+    """
+    Egy darab kezdőérték lejátszása a munkafolyamat motorjával.
+
+    Args:
+        seeds: A kezdőértékek
+
+    Returns:
+        list: Játékonként az eredmény (lásd play_game())
+    """
+    engine, player, max_pieces = _worker
+    return [play_game(engine, player, seed, max_pieces) for seed in seeds]
+
+
+def chunked(seeds, size):
+    """
+    A kezdőértékek darabolása.
+
+    Args:
+        seeds: A kezdőértékek listája
+        size: A darabok mérete
+
+    Returns:
+        list: A darabok (listák)
+    """
+    return [seeds[i:i + size] for i in range(0, len(seeds), size)]
+
+
+def run_params(player, weights, max_pieces):
+    """
+    A futás eredményeit meghatározó paraméterek (a kimeneti fájl fejléce).
+
+    Args:
+        player: A játékos-változat neve
+        weights: A heurisztika súlyai (None: config.AI_WEIGHTS)
+        max_pieces: Legfeljebb ennyi elem játékonként
+
+    Returns:
+        dict: player, weights (a harddrop játékosnál None), max_pieces
+    """
+    if player == 'harddrop':
+        weights = None
+    elif weights is None:
+        weights = AI_WEIGHTS
+    # JSON oda-vissza: a fájlból beolvasott fejléccel így közvetlenül összevethető
+    return json.loads(json.dumps({'player': player, 'weights': weights, 'max_pieces': max_pieces}))
+
+
+def load_results(path):
+    """
+    Egy korábbi (esetleg megszakított) futás paramétereinek és eredményeinek beolvasása.
+
+    Args:
+        path: A JSONL fájl útvonala
+
+    Returns:
+        tuple: (a fejléc paraméterei vagy None, a beolvasott eredmények,
+               az ép sorok hossza bájtban); a csonka utolsó sor kimarad
+    """
+    params = None
+    results = []
+    valid = 0
+    if not os.path.exists(path):
+        return params, results, valid
+    with open(path, 'rb') as f:
+        for line in f:
+            # A megszakításkor félig kiírt sor: nincs sorvége, vagy nem ép JSON
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if valid == 0 and 'run' in record:
+                params = record['run']
+            else:
+                results.append(record)
+            valid += len(line)
+    return params, results, valid
+
+
+def summarize(results):
+    """
+    Az eredmények összesítése.
+
+    Args:
+        results: Játékonkénti eredmények
+
+    Returns:
+        dict: mezőnként (score, lines, level, pieces, duration_s) átlag, medián, p5, p95 és maximum,
+              valamint a játékok száma és a véget ért játékok aránya
+    """
+    summary = {'games': len(results)}
+    if not results:
+        return summary
+    for field in ('score', 'lines', 'level', 'pieces', 'duration_s'):
+        ordered = sorted(result[field] for result in results)
+        summary[field] = {
+            'mean': sum(ordered) / len(ordered),
+            'median': percentile(ordered, 0.5),
+            'p5': percentile(ordered, 0.05),
+            'p95': percentile(ordered, 0.95),
+            'max': ordered[-1],
+        }
+    summary['game_over_rate'] = sum(result['game_over'] for result in results) / len(results)
+    return summary
+
+
+def print_summary(summary):
+    """Az összesítés táblázatos kiírása."""
+    print(f"{summary['games']} játék, véget ért: {summary.get('game_over_rate', 0):.1%}")
+    print(f"{'':12s}{'átlag':>12s}{'medián':>12s}{'p5':>12s}{'p95':>12s}{'max':>12s}")
+    for field in ('score', 'lines', 'level', 'pieces', 'duration_s'):
+        if field in summary:
+            values = summary[field]
+            print(f"{field:12s}" + ''.join(f"{values[key]:12.2f}" for key in
+                                            ('mean', 'median', 'p5', 'p95', 'max')))
+
+
+def run(seeds, output, player='autoplay', weights=None, max_pieces=DEFAULT_MAX_PIECES,
+        workers=None, chunk=DEFAULT_CHUNK):
+    """
+    A még le nem játszott kezdőértékek lejátszása párhuzamosan, az eredmények
+    folyamatos hozzáfűzése a kimeneti fájlhoz.
+
+    Args:
+        seeds: A kezdőértékek
+        output: A JSONL kimeneti fájl (a benne lévő kezdőértékek kimaradnak)
+        player: A játékos-változat neve
+        weights: A heurisztika súlyai
+        max_pieces: Legfeljebb ennyi elem játékonként
+        workers: A munkafolyamatok száma (alapértelmezés szerint a magok száma)
+        chunk: Ennyi kezdőérték megy egyszerre egy munkafolyamathoz
+
+    Returns:
+        list: Az összes eredmény (a korábbi futásokéval együtt)
+
+    Raises:
+        ValueError: Ha a kimeneti fájl más paraméterekkel készült (vagy nincs fejléce)
+    """
+    params = run_params(player, weights, max_pieces)
+    previous, results, valid = load_results(output)
+    if valid and previous != params:
+        raise ValueError(f"A(z) {output} más paraméterekkel készült ({previous}), "
+                         f"nem folytatható; adjon meg másik --output fájlt")
+    done = {result['seed'] for result in results}
+    pending = [seed for seed in seeds if seed not in done]
+    if done:
+        print(f"Folytatás: {len(done)} játék már kész, {len(pending)} van hátra")
+
+    start = perf_counter()
+    finished = 0
+    executor = ProcessPoolExecutor(workers, initializer=init_worker,
+                                   initargs=(player, weights, max_pieces))
+    try:
+        # Csak a csonka utolsó sort (megszakítás után) vágjuk le; a kész eredmények a helyükön maradnak
+        if os.path.exists(output) and os.path.getsize(output) > valid:
+            os.truncate(output, valid)
+        with open(output, 'a', encoding='utf-8') as f:
+            if not valid:
+                f.write(json.dumps({'run': params}) + '\n')
+            futures = [executor.submit(play_chunk, part) for part in chunked(pending, chunk)]
+            for future in as_completed(futures):
+                part = future.result()
+                f.write(''.join(json.dumps(result) + '\n' for result in part))
+                f.flush()
+                results.extend(part)
+                finished += len(part)
+                elapsed = perf_counter() - start
+                print(f"\r{finished}/{len(pending)} játék, {finished / elapsed:,.0f} játék/s",
+                      end='', file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        print(f"\nMegszakítva; {finished} új eredmény mentve, a futás ugyanazzal a "
+              f"paranccsal folytatható", file=sys.stderr)
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    if pending:
+        print(file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    """
+    Parancssori belépési pont.
+
+    Returns:
+        int: Kilépési kód (130 megszakításkor)
+    """
+    parser = argparse.ArgumentParser(prog='python tournament.py',
+                                     description='Rögzített kezdőértékű játékok párhuzamosan')
+    parser.add_argument('--games', type=int, default=1000, help='a játékok száma')
+    parser.add_argument('--seed', type=int, default=0, help='az első kezdőérték')
+    parser.add_argument('--player', choices=PLAYERS, default='autoplay', help='a játékos-változat')
+    parser.add_argument('--weights', type=json.loads, default=None,
+                        help='a heurisztika súlyai JSON-ként (a hiányzók a config.AI_WEIGHTS szerint)')
+    parser.add_argument('--max-pieces', type=int, default=DEFAULT_MAX_PIECES,
+                        help='legfeljebb ennyi elem játékonként')
+    parser.add_argument('--workers', type=int, default=None, help='munkafolyamatok száma (alapérték: magok száma)')
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK, help='kezdőértékek darabonként')
+    parser.add_argument('--output', default='tournament.jsonl', help='JSONL kimenet (folytatáshoz is)')
+    parser.add_argument('--summary', help='az összesítés mentése JSON fájlba')
+    args = parser.parse_args(argv)
+
+    weights = {**AI_WEIGHTS, **args.weights} if args.weights else None
+    seeds = range(args.seed, args.seed + args.games)
+    try:
+        results = run(seeds, args.output, args.player, weights, args.max_pieces,
+                      args.workers, args.chunk)
+    except KeyboardInterrupt:
+        return 130
+    except ValueError as e:
+        parser.error(str(e))
+
+    wanted = set(seeds)
+    summary = summarize([result for result in results if result['seed'] in wanted])
+    print_summary(summary)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,6 +2,9 @@ import pygame
 import math
 import time
 from config import *
+from sprites import BlockAtlas
+from text_cache import TextCache
+from animation import Animations
 
 class UI:
     """
@@ -18,7 +21,13 @@ class UI:
         self.screen = screen
         self.animation_time = 0
         self.score_flash = 0
+        # Bekapcsolt időmérésnél a mentés billentyűje (F4) is az irányítás között szerepel
+        self.profiler_keys = False
+        self.text_cache = TextCache()
+        self.animations = Animations(self.text_cache)
         self.create_ui_panels()
+        self.atlas = BlockAtlas(self)
+        self.create_layers()
         
     def create_ui_panels(self):
         """Létrehozza az UI panel háttereket."""
@@ -26,8 +35,77 @@ class UI:
         # Csökkentett méret a következő elem panelhez
         self.panel_next = self.create_panel(200, 130, 5)  # 160x160 méret elegendő a következő elemnek
         self.panel_score = self.create_panel(200, 80, 5)
-        self.panel_controls = self.create_panel(200, 220, 5)
+        self.panel_controls = self.create_panel(200, 298, 5)
+        self.panel_controls_profiler = self.create_panel(200, 324, 5)
         
+    def create_layers(self):
+        """
+        Létrehozza a rétegzett megjelenítéshez használt felületeket és területeket.
+
+        Rétegek alulról felfelé:
+        - alap: háttér + statikus elemek (cím, panelek, feliratok, irányítás);
+          a háttér egy fázisára egyszer készül el, és ebből állítjuk vissza
+          a megváltozott területeket. Animált háttérnél csak a fázis
+          váltásakor (BACKGROUND_FRAMES lépés egy periódusra, ~0,2 s-onként)
+          épül újra, ilyenkor a teljes képernyő frissül
+        - játéktér: a zárolt blokkok és a rácsvonalak, csak a játéktér
+          verziójának változásakor rajzoljuk újra
+        - dinamikus: aktuális és szellem elem, következő elem, pontszámok
+        """
+        self.background_cache = {}
+        self.background_animated = BACKGROUND_QUALITY == 'high'
+        self.base_surface = None
+        self.base_frame = None
+
+        # Kulcsszínnel átlátszó felület, így a rajzolás pontosan olyan, mint a képernyőn
+        self.board_layer = pygame.Surface((PLAY_WIDTH + 1, PLAY_HEIGHT + 1))
+        self.board_layer.set_colorkey(BOARD_LAYER_KEY)
+        self.board_layer_key = None
+
+        panel_x = TOP_LEFT_X + PLAY_WIDTH + 50
+        # Az elemek a játéktér felett is megjelenhetnek (negatív y), ezért a terület a képernyő tetejéig ér
+        self.play_rect = pygame.Rect(TOP_LEFT_X, 0, PLAY_WIDTH + 1, TOP_LEFT_Y + PLAY_HEIGHT + 1)
+        self.next_rect = pygame.Rect(panel_x - 20, TOP_LEFT_Y + 30, 200, 130)
+        self.score_rect = pygame.Rect(panel_x - 20, TOP_LEFT_Y + 180, 200, 320)
+
+        self.invalidate()
+
+    def show_profiler_keys(self):
+        """Az időmérés mentésének billentyűje (F4) megjelenik az irányítás között."""
+        self.profiler_keys = True
+        # Az irányítás az alapréteg része: a következő képkocka újraépíti
+        self.base_frame = None
+        self.invalidate()
+
+    def invalidate(self):
+        """A következő képkocka teljes újrarajzolását kéri."""
+        self.full_redraw = True
+        self.region_keys = {}
+        self.overlay_key = None
+        self.overlay_snapshot = None
+
+    def set_background_quality(self, quality):
+        """
+        A háttér minőségének beállítása.
+
+        Args:
+            quality: 'high' - animált háttér, a fázis váltásakor teljes újrarajzolás;
+                     'low' - álló háttér; a többi képkockában csak a megváltozott területek frissülnek
+        """
+        self.set_background_animated(quality == 'high')
+
+    def set_background_animated(self, animated):
+        """
+        A háttér animációjának be- vagy kikapcsolása.
+
+        Args:
+            animated: True esetén a háttér fázisának váltásakor teljes újrarajzolás;
+                      egyébként csak a megváltozott területek frissülnek
+        """
+        self.background_animated = animated
+        self.base_frame = None
+        self.invalidate()
+
     def create_panel(self, width, height, border_radius):
         """
         Létrehoz egy panelt lekerekített sarkokkal és színátmenettel.
@@ -42,15 +120,16 @@ class UI:
         """
         panel = pygame.Surface((width, height), pygame.SRCALPHA)
         
-        # Gradiens háttér
+        # Gradiens háttér: soronként egy pixel egy 1 pixel széles csíkon,
+        # amelyet egyetlen nyújtással terítünk a panel szélességére
+        strip = pygame.Surface((1, height), pygame.SRCALPHA)
         for y in range(height):
             gradient_factor = y / height
             r = int(DARK_GRAY[0] * (1 - gradient_factor) + BG_COLOR_1[0] * gradient_factor)
             g = int(DARK_GRAY[1] * (1 - gradient_factor) + BG_COLOR_1[1] * gradient_factor)
             b = int(DARK_GRAY[2] * (1 - gradient_factor) + BG_COLOR_1[2] * gradient_factor)
-            color = (r, g, b, 180)  # Félig átlátszó
-            
-            pygame.draw.line(panel, color, (0, y), (width, y))
+            strip.set_at((0, y), (r, g, b, 180))  # Félig átlátszó
+        pygame.transform.scale(strip, (width, height), panel)
         
         # Lekerekített téglalap keret
         pygame.draw.rect(panel, WHITE, (0, 0, width, height), 2, border_radius)
@@ -69,20 +148,13 @@ class UI:
             center: Középre igazítás (True) vagy balra igazítás (False)
             shadow: Árnyék hozzáadása
         """
-        if shadow:
-            shadow_surface = font.render(text, True, (0, 0, 0, 160))
-            if center:
-                self.screen.blit(shadow_surface, (x - shadow_surface.get_width() // 2 + 2, 
-                                                 y - shadow_surface.get_height() // 2 + 2))
-            else:
-                self.screen.blit(shadow_surface, (x + 2, y + 2))
-        
-        text_surface = font.render(text, True, color)
+        text_surface, shadow_surface = self.text_cache.get(text, font, color, shadow)
         if center:
-            self.screen.blit(text_surface, (x - text_surface.get_width() // 2, 
-                                           y - text_surface.get_height() // 2))
-        else:
-            self.screen.blit(text_surface, (x, y))
+            x -= text_surface.get_width() // 2
+            y -= text_surface.get_height() // 2
+        if shadow_surface is not None:
+            self.screen.blit(shadow_surface, (x + 2, y + 2))
+        self.screen.blit(text_surface, (x, y))
     
     def darken_color(self, color, factor=0.7):
         """
@@ -99,6 +171,20 @@ class UI:
                 max(0, int(color[1] * factor)), 
                 max(0, int(color[2] * factor)))
 
+    def blend_color(self, color, overlay_color, alpha):
+        """
+        Egy szín keverése egy fedőszínnel (mint egy félig átlátszó rajzolásnál).
+        
+        Args:
+            color: Az alapszín
+            overlay_color: A fedőszín
+            alpha: A fedőszín átlátszatlansága (0-255)
+            
+        Returns:
+            A kevert szín
+        """
+        return tuple(c + (o - c) * alpha // 255 for c, o in zip(color[:3], overlay_color[:3]))
+
     def lighten_color(self, color, factor=0.3):
         """
         Egy szín világosítása a 3D hatáshoz.
@@ -114,92 +200,138 @@ class UI:
                 min(255, int(color[1] + (255 - color[1]) * factor)), 
                 min(255, int(color[2] + (255 - color[2]) * factor)))
                 
-    def draw_background(self):
-        """Animált háttér rajzolása."""
-        for y in range(0, SCREEN_HEIGHT, 2):
-            # Színátmenet számítása időalapú hullámzással
-            gradient_factor = y / SCREEN_HEIGHT
-            wave = math.sin(time.time() * 0.5 + y * 0.01) * 0.1
-            gradient_factor = max(0, min(1, gradient_factor + wave))
+    def background_row_color(self, y, phase):
+        """
+        A háttér színátmenetének színe egy adott sorban.
+        
+        Args:
+            y: A képernyősor
+            phase: A hullámzás fázisa (radián)
             
-            r = int(BG_COLOR_1[0] * (1 - gradient_factor) + BG_COLOR_2[0] * gradient_factor)
-            g = int(BG_COLOR_1[1] * (1 - gradient_factor) + BG_COLOR_2[1] * gradient_factor)
-            b = int(BG_COLOR_1[2] * (1 - gradient_factor) + BG_COLOR_2[2] * gradient_factor)
-            color = (r, g, b)
+        Returns:
+            tuple: RGB szín
+        """
+        # Színátmenet számítása hullámzással (a sorokat páronként rajzoljuk)
+        y -= y % 2
+        gradient_factor = y / SCREEN_HEIGHT
+        wave = math.sin(phase + y * 0.01) * 0.1
+        gradient_factor = max(0, min(1, gradient_factor + wave))
+        
+        r = int(BG_COLOR_1[0] * (1 - gradient_factor) + BG_COLOR_2[0] * gradient_factor)
+        g = int(BG_COLOR_1[1] * (1 - gradient_factor) + BG_COLOR_2[1] * gradient_factor)
+        b = int(BG_COLOR_1[2] * (1 - gradient_factor) + BG_COLOR_2[2] * gradient_factor)
+        return (r, g, b)
+        
+    def background_strips(self, frame):
+        """
+        Egy háttérfázis előre kiszámolt, 1 pixel széles csíkjai (gyorsítótárazva).
+        
+        A színátmenet csak a sortól függ, ezért egy képkockához elég egy
+        függőleges csík, amelyet a képernyő szélességére nyújtunk. A rácsminta
+        vízszintes vonalai a csíkba vannak sütve, a függőleges vonalakhoz egy
+        második, a rácsszínnel kevert csík tartozik.
+        
+        Args:
+            frame: A fázis sorszáma (0 .. BACKGROUND_FRAMES - 1)
             
-            pygame.draw.line(self.screen, color, (0, y), (SCREEN_WIDTH, y))
+        Returns:
+            tuple: (háttércsík, rácsvonal-csík)
+        """
+        strips = self.background_cache.get(frame)
+        if strips is None:
+            phase = 2 * math.pi * frame / BACKGROUND_FRAMES
+            strip = pygame.Surface((1, SCREEN_HEIGHT)).convert()
+            line_strip = pygame.Surface((1, SCREEN_HEIGHT)).convert()
+            for y in range(SCREEN_HEIGHT):
+                color = self.background_row_color(y, phase)
+                line_color = self.blend_color(color, WHITE, BACKGROUND_GRID_ALPHA)
+                strip.set_at((0, y), line_color if y % 40 == 0 else color)
+                line_strip.set_at((0, y), line_color)
+            strips = (strip, line_strip)
+            self.background_cache[frame] = strips
+        return strips
+        
+    def background_frame(self):
+        """
+        A háttér aktuális fázisa.
+        
+        Returns:
+            int: A fázis sorszáma (álló háttérnél 0)
+        """
+        if not self.background_animated:
+            return 0
+        # A hullám fázisa (time * 0.5) BACKGROUND_FRAMES lépésre kvantálva
+        cycle = (time.time() * 0.5) / (2 * math.pi)
+        return int(cycle * BACKGROUND_FRAMES) % BACKGROUND_FRAMES
+        
+    def draw_background(self, frame=None):
+        """
+        Háttér rajzolása előre kiszámolt csíkokból: egy nyújtás és a
+        függőleges rácsvonalak csíkjai.
         
-        # Finom rácsminta az átlátszó háttérre
-        grid_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        grid_overlay.fill((0, 0, 0, 0))
+        Args:
+            frame: A háttér fázisa (alapértelmezés szerint az aktuális)
+        """
+        if frame is None:
+            frame = self.background_frame()
+        strip, line_strip = self.background_strips(frame)
         
+        pygame.transform.scale(strip, (SCREEN_WIDTH, SCREEN_HEIGHT), self.screen)
+        
+        # Finom rácsminta: függőleges vonalak
         for x in range(0, SCREEN_WIDTH, 40):
-            pygame.draw.line(grid_overlay, (255, 255, 255, 10), (x, 0), (x, SCREEN_HEIGHT))
-        for y in range(0, SCREEN_HEIGHT, 40):
-            pygame.draw.line(grid_overlay, (255, 255, 255, 10), (0, y), (SCREEN_WIDTH, y))
-            
-        self.screen.blit(grid_overlay, (0, 0))
+            self.screen.blit(line_strip, (x, 0))
         
     def draw_title(self):
         """3D-s hatású cím rajzolása."""
         title_y = 20
         text = "MODERN TETRIS"
         # Árnyék
-        self.draw_text(text, FONT_LARGE, (0, 0, 0), SCREEN_WIDTH // 2 + 3, title_y + 3)
+        self.draw_text(text, get_font(FONT_SIZE_LARGE), (0, 0, 0), SCREEN_WIDTH // 2 + 3, title_y + 3)
         # Világos highlight
-        self.draw_text(text, FONT_LARGE, (255, 255, 255), SCREEN_WIDTH // 2 - 2, title_y - 2)
+        self.draw_text(text, get_font(FONT_SIZE_LARGE), (255, 255, 255), SCREEN_WIDTH // 2 - 2, title_y - 2)
         # Fő szöveg
-        self.draw_text(text, FONT_LARGE, MODERN_YELLOW, SCREEN_WIDTH // 2, title_y)
+        self.draw_text(text, get_font(FONT_SIZE_LARGE), MODERN_YELLOW, SCREEN_WIDTH // 2, title_y)
+        
+    def draw_grid_lines(self, surface=None, origin=(TOP_LEFT_X, TOP_LEFT_Y)):
+        """
+        Játéktér rácsvonalainak rajzolása halvány effekttel.
         
-    def draw_grid_lines(self):
-        """Játéktér rácsvonalainak rajzolása halvány effekttel."""
+        Args:
+            surface: A cél felület (alapértelmezés szerint a képernyő)
+            origin: A játéktér bal felső sarka a cél felületen
+        """
+        surface = surface or self.screen
+        left, top = origin
         line_color = GRAY
         for i in range(21):  # vízszintes vonalak (21 a legalsó vonalnak)
             line_opacity = min(255, 100 + i * 8)  # A vonalak láthatóbbak lesznek lefelé haladva
             current_color = (line_color[0], line_color[1], line_color[2], line_opacity)
-            pygame.draw.line(self.screen, current_color, 
-                            (TOP_LEFT_X, TOP_LEFT_Y + i * BLOCK_SIZE),
-                            (TOP_LEFT_X + PLAY_WIDTH, TOP_LEFT_Y + i * BLOCK_SIZE))
+            pygame.draw.line(surface, current_color, 
+                            (left, top + i * BLOCK_SIZE),
+                            (left + PLAY_WIDTH, top + i * BLOCK_SIZE))
         
         for j in range(11):  # függőleges vonalak (11 a jobb oldali vonalnak)
-            pygame.draw.line(self.screen, line_color, 
-                            (TOP_LEFT_X + j * BLOCK_SIZE, TOP_LEFT_Y),
-                            (TOP_LEFT_X + j * BLOCK_SIZE, TOP_LEFT_Y + PLAY_HEIGHT))
+            pygame.draw.line(surface, line_color, 
+                            (left + j * BLOCK_SIZE, top),
+                            (left + j * BLOCK_SIZE, top + PLAY_HEIGHT))
     
-    def draw_grid_blocks(self, grid):
+    def draw_grid_blocks(self, grid, surface=None, origin=(TOP_LEFT_X, TOP_LEFT_Y)):
         """
         A rögzített blokkok rajzolása a játéktérre.
         
         Args:
             grid: A játéktér rácsa, amely tartalmazza a blokkok színeit
+            surface: A cél felület (alapértelmezés szerint a képernyő)
+            origin: A játéktér bal felső sarka a cél felületen
         """
-        for i in range(len(grid)):
-            for j in range(len(grid[i])):
-                color = grid[i][j]
-                if color != (0, 0, 0):  # Ha nem fekete (üres)
-                    x = TOP_LEFT_X + j * BLOCK_SIZE
-                    y = TOP_LEFT_Y + i * BLOCK_SIZE
-                    
-                    # Fő blokk rajzolása lekerekített sarkokkal
-                    pygame.draw.rect(self.screen, color, 
-                                   (x, y, BLOCK_SIZE, BLOCK_SIZE), 0, 2)
-                    
-                    # 3D hatás - felső és bal élek világosabbak
-                    pygame.draw.line(self.screen, self.lighten_color(color), 
-                                   (x, y), (x + BLOCK_SIZE - 1, y), 2)
-                    pygame.draw.line(self.screen, self.lighten_color(color), 
-                                   (x, y), (x, y + BLOCK_SIZE - 1), 2)
-                    
-                    # 3D hatás - alsó és jobb élek sötétebbek
-                    pygame.draw.line(self.screen, self.darken_color(color), 
-                                   (x, y + BLOCK_SIZE - 1), (x + BLOCK_SIZE - 1, y + BLOCK_SIZE - 1), 2)
-                    pygame.draw.line(self.screen, self.darken_color(color), 
-                                   (x + BLOCK_SIZE - 1, y), (x + BLOCK_SIZE - 1, y + BLOCK_SIZE - 1), 2)
-                    
-                    # Belső árnyékolás a 3D hatáshoz
-                    inner_color = self.lighten_color(color, 0.2)
-                    pygame.draw.rect(self.screen, inner_color, 
-                                  (x + 4, y + 4, BLOCK_SIZE - 8, BLOCK_SIZE - 8), 0, 1)
+        surface = surface or self.screen
+        left, top = origin
+        block_for_color = self.atlas.block_for_color
+        surface.blits([(block_for_color(color), (left + j * BLOCK_SIZE, top + i * BLOCK_SIZE))
+                       for i, row in enumerate(grid)
+                       for j, color in enumerate(row) if color != (0, 0, 0)],
+                      doreturn=False)
                     
     def draw_piece(self, piece, ghost=False):
         """
@@ -209,47 +341,26 @@ class UI:
             piece: A rajzolandó Piece objektum
             ghost: Ha True, akkor átlátszó "szellem" előnézetet rajzol
         """
-        shape = piece.get_shape()
+        sprite = (self.atlas.ghosts if ghost else self.atlas.blocks)[piece.shape_index]
+        self.screen.blits([(sprite, (TOP_LEFT_X + (piece.x + j) * BLOCK_SIZE,
+                                     TOP_LEFT_Y + (piece.y + i) * BLOCK_SIZE))
+                           for j, i in piece.get_cells()],
+                          doreturn=False)
+              
+    def draw_next_panel(self):
+        """A következő elem panelének és fejlécének rajzolása (statikus réteg)."""
+        panel_x = TOP_LEFT_X + PLAY_WIDTH + 50
+        panel_y = TOP_LEFT_Y + 50
+        
+        # Panel háttér rajzolása
+        self.screen.blit(self.panel_next, (panel_x - 20, panel_y - 20))
+        
+        # Fejléc rajzolása
+        self.draw_text("KÖVETKEZŐ", get_font(FONT_SIZE_MEDIUM), WHITE, panel_x + 80, panel_y)  # Középre igazítva
         
-        for i, row in enumerate(shape):
-            for j, cell in enumerate(row):
-                if cell == '0':
-                    x = TOP_LEFT_X + (piece.x + j) * BLOCK_SIZE
-                    y = TOP_LEFT_Y + (piece.y + i) * BLOCK_SIZE
-                    
-                    if not ghost:
-                        # Elem rajzolása továbbfejlesztett 3D hatással
-                        pygame.draw.rect(self.screen, piece.color, 
-                                       (x, y, BLOCK_SIZE, BLOCK_SIZE), 0, 2)
-                        
-                        # 3D hatás - felső és bal élek világosabbak
-                        pygame.draw.line(self.screen, self.lighten_color(piece.color), 
-                                       (x, y), (x + BLOCK_SIZE - 1, y), 2)
-                        pygame.draw.line(self.screen, self.lighten_color(piece.color), 
-                                       (x, y), (x, y + BLOCK_SIZE - 1), 2)
-                        
-                        # 3D hatás - alsó és jobb élek sötétebbek
-                        pygame.draw.line(self.screen, self.darken_color(piece.color), 
-                                       (x, y + BLOCK_SIZE - 1), (x + BLOCK_SIZE - 1, y + BLOCK_SIZE - 1), 2)
-                        pygame.draw.line(self.screen, self.darken_color(piece.color), 
-                                       (x + BLOCK_SIZE - 1, y), (x + BLOCK_SIZE - 1, y + BLOCK_SIZE - 1), 2)
-                        
-                        # Belső árnyékolás a 3D hatáshoz
-                        inner_color = self.lighten_color(piece.color, 0.2)
-                        pygame.draw.rect(self.screen, inner_color, 
-                                      (x + 4, y + 4, BLOCK_SIZE - 8, BLOCK_SIZE - 8), 0, 1)
-                    else:
-                        # "Szellem" elem rajzolása félig átlátszó hatással
-                        ghost_color = (piece.color[0], piece.color[1], piece.color[2], 70)
-                        s = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
-                        s.fill(ghost_color)
-                        self.screen.blit(s, (x, y))
-                        pygame.draw.rect(self.screen, (255, 255, 255, 180), 
-                                       (x, y, BLOCK_SIZE, BLOCK_SIZE), 1, 1)
-                      
     def draw_next_piece(self, next_piece):
         """
-        A következő elem előnézetének rajzolása
+        A következő elem előnézetének rajzolása (a panel a statikus rétegen van)
         
         Args:
             next_piece: A következő Piece objektum
@@ -257,44 +368,32 @@ class UI:
         panel_x = TOP_LEFT_X + PLAY_WIDTH + 50
         panel_y = TOP_LEFT_Y + 50
         
-        # Panel háttér rajzolása
-        self.screen.blit(self.panel_next, (panel_x - 20, panel_y - 20))
-        
-        # Fejléc rajzolása
-        self.draw_text("KÖVETKEZŐ", FONT_MEDIUM, WHITE, panel_x + 80, panel_y)  # Középre igazítva
-        
         # Következő elem rajzolása továbbfejlesztett 3D hatással
-        shape = next_piece.get_shape()
-        # Központosítás számítása
-        shape_width = len(shape[0]) * (BLOCK_SIZE // 1.5)
-        shape_height = len(shape) * (BLOCK_SIZE // 1.5)
+        # Központosítás számítása (az alakzatmátrix 5x5-ös)
+        block_size = BLOCK_SIZE // 1.5
+        shape_width = 5 * block_size
+        shape_height = 5 * block_size
         start_x = panel_x + (120 - shape_width) // 2  # Középre igazítás
         start_y = panel_y + (120 - shape_height) // 2  # Középre igazítás
         
-        for i, row in enumerate(shape):
-            for j, cell in enumerate(row):
-                if cell == '0':
-                    x = start_x + j * (BLOCK_SIZE // 1.5)
-                    y = start_y + i * (BLOCK_SIZE // 1.5)
-                    block_size = BLOCK_SIZE // 1.5
-                    
-                    # Blokk rajzolása 3D hatással
-                    pygame.draw.rect(self.screen, next_piece.color, 
-                                   (x, y, block_size, block_size), 0, 1)
-                    
-                    # 3D hatás élek
-                    pygame.draw.line(self.screen, self.lighten_color(next_piece.color), 
-                                   (x, y), (x + block_size - 1, y), 1)
-                    pygame.draw.line(self.screen, self.lighten_color(next_piece.color), 
-                                   (x, y), (x, y + block_size - 1), 1)
-                    pygame.draw.line(self.screen, self.darken_color(next_piece.color), 
-                                   (x, y + block_size - 1), (x + block_size - 1, y + block_size - 1), 1)
-                    pygame.draw.line(self.screen, self.darken_color(next_piece.color), 
-                                   (x + block_size - 1, y), (x + block_size - 1, y + block_size - 1), 1)
+        sprite = self.atlas.previews[next_piece.shape_index]
+        self.screen.blits([(sprite, (start_x + j * block_size, start_y + i * block_size))
+                           for j, i in next_piece.get_cells()],
+                          doreturn=False)
+
+    def draw_score_panels(self):
+        """A pontszám, szint és sorok paneljeinek és feliratainak rajzolása (statikus réteg)."""
+        panel_x = TOP_LEFT_X + PLAY_WIDTH + 50
+        for label, panel_y in (("PONTSZÁM", TOP_LEFT_Y + 200),
+                               ("SZINT", TOP_LEFT_Y + 290),
+                               ("SOROK", TOP_LEFT_Y + 380)):
+            self.screen.blit(self.panel_score, (panel_x - 20, panel_y - 20))
+            self.draw_text(label, get_font(FONT_SIZE_MEDIUM), WHITE, panel_x + 80, panel_y)
 
     def draw_score(self, score, level, lines_cleared, combo, last_score_increase):
         """
-        A pontszám, szint és kitörölt sorok számának megjelenítése.
+        A pontszám, szint és kitörölt sorok számának megjelenítése
+        (a panelek és feliratok a statikus rétegen vannak).
         
         Args:
             score: Játékos pontszáma
@@ -314,29 +413,15 @@ class UI:
             pulse = abs(math.sin(time.time() * 10)) 
             score_color = (255, 255 * (1-pulse), 255 * (1-pulse))
         
-        # Pontszám panel
-        self.screen.blit(self.panel_score, (panel_x - 20, score_y - 20))
-        self.draw_text("PONTSZÁM", FONT_MEDIUM, WHITE, panel_x + 80, score_y)
-        self.draw_text(str(score), FONT_MEDIUM, score_color, panel_x + 80, score_y + 30)
-        
-        # Szint panel
-        self.screen.blit(self.panel_score, (panel_x - 20, level_y - 20))
-        self.draw_text("SZINT", FONT_MEDIUM, WHITE, panel_x + 80, level_y)
-        self.draw_text(str(level), FONT_MEDIUM, MODERN_GREEN, panel_x + 80, level_y + 30)
-        
-        # Sorok panel
-        self.screen.blit(self.panel_score, (panel_x - 20, lines_y - 20))
-        self.draw_text("SOROK", FONT_MEDIUM, WHITE, panel_x + 80, lines_y)
-        self.draw_text(str(lines_cleared), FONT_MEDIUM, MODERN_BLUE, panel_x + 80, lines_y + 30)
+        self.draw_text(str(score), get_font(FONT_SIZE_MEDIUM), score_color, panel_x + 80, score_y + 30)
+        self.draw_text(str(level), get_font(FONT_SIZE_MEDIUM), MODERN_GREEN, panel_x + 80, level_y + 30)
+        self.draw_text(str(lines_cleared), get_font(FONT_SIZE_MEDIUM), MODERN_BLUE, panel_x + 80, lines_y + 30)
         
         # Combo megjelenítése, ha van
         if combo > 1:
             combo_y = TOP_LEFT_Y + 470
-            combo_color = MODERN_YELLOW
-            pulse = abs(math.sin(time.time() * 5))
-            combo_scale = 1 + pulse * 0.2
-            combo_font = pygame.font.Font(None, int(36 * combo_scale))
-            self.draw_text(f"COMBO x{combo}", combo_font, combo_color, panel_x + 80, combo_y)
+            combo_text = self.animations.pulse_text(f"COMBO x{combo}", 36, 0.2, 5, MODERN_YELLOW)
+            combo_text.draw(self.screen, panel_x + 80, combo_y, time.time())
 
     def draw_controls(self):
         """Irányítási útmutató megjelenítése."""
@@ -344,7 +429,8 @@ class UI:
         panel_y = TOP_LEFT_Y + 100
         
         # Panel háttér
-        self.screen.blit(self.panel_controls, (panel_x - 20, panel_y - 20))
+        panel = self.panel_controls_profiler if self.profiler_keys else self.panel_controls
+        self.screen.blit(panel, (panel_x - 20, panel_y - 20))
         
         # Irányítási utasítások
         controls = [
@@ -354,45 +440,225 @@ class UI:
             "↑ : Forgatás",
             "SPACE : Azonnali esés",
             "P : Szünet",
-            "R : Újraindítás"
+            "R : Újraindítás",
+            "F : Gyorsított mód",
+            "A : Automatikus játék",
+            "F3 : Időmérés"
         ]
+        if self.profiler_keys:
+            controls.append("F4 : Mérés mentése")
         
         for i, text in enumerate(controls):
             color = WHITE if i == 0 else LIGHT_GRAY
-            self.draw_text(text, FONT_SMALL, color, panel_x + 80, panel_y + 20 + i * 26, center=True, shadow=True)
+            self.draw_text(text, get_font(FONT_SIZE_SMALL), color, panel_x + 80, panel_y + 20 + i * 26, center=True, shadow=True)
 
     def draw_game_over(self, score):
         """
-        Játék vége képernyő megjelenítése.
+        Játék vége képernyő megjelenítése (a pulzáló címet az overlay_title adja).
         
         Args:
             score: Végső pontszám
         """
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))  # Félig átlátszó fekete fedőréteg
-        self.screen.blit(overlay, (0, 0))
-        
-        # Animált pulzáló effektus létrehozása
-        pulse = abs(math.sin(time.time() * 2)) 
-        pulse_scale = 1 + pulse * 0.1
-        game_over_font = pygame.font.Font(None, int(60 * pulse_scale))
+        self.screen.blit(self.animations.dim_overlay(), (0, 0))  # Félig átlátszó fekete fedőréteg
         
-        # Játék vége szöveg
-        self.draw_text("JÁTÉK VÉGE", game_over_font, MODERN_RED, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)
-        self.draw_text(f"Végső pontszám: {score}", FONT_MEDIUM, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20)
-        self.draw_text("Nyomd meg az R billentyűt az újraindításhoz", FONT_MEDIUM, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 70)
+        self.draw_text(f"Végső pontszám: {score}", get_font(FONT_SIZE_MEDIUM), WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20)
+        self.draw_text("Nyomd meg az R billentyűt az újraindításhoz", get_font(FONT_SIZE_MEDIUM), WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 70)
 
     def draw_pause(self):
-        """Szüneteltetés képernyő megjelenítése."""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))  # Félig átlátszó fekete fedőréteg
-        self.screen.blit(overlay, (0, 0))
-        
-        # Animált pulzáló effektus létrehozása
-        pulse = abs(math.sin(time.time() * 2)) 
-        pulse_scale = 1 + pulse * 0.1
-        pause_font = pygame.font.Font(None, int(60 * pulse_scale))
-        
-        # Szüneteltetés szöveg
-        self.draw_text("SZÜNETELTETVE", pause_font, MODERN_YELLOW, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-        self.draw_text("Nyomd meg a P billentyűt a folytatáshoz", FONT_MEDIUM, WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 70)
\ No newline at end of file
+        """Szüneteltetés képernyő megjelenítése (a pulzáló címet az overlay_title adja)."""
+        self.screen.blit(self.animations.dim_overlay(), (0, 0))  # Félig átlátszó fekete fedőréteg
+        
+        self.draw_text("Nyomd meg a P billentyűt a folytatáshoz", get_font(FONT_SIZE_MEDIUM), WHITE, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 70)
+
+    def overlay_title(self, game_over):
+        """
+        A fedőképernyő pulzáló címe.
+
+        Args:
+            game_over: True a játék vége, False a szünet képernyőhöz
+
+        Returns:
+            tuple: (PulseText, a cím középpontja)
+        """
+        if game_over:
+            return (self.animations.pulse_text("JÁTÉK VÉGE", 60, 0.1, 2, MODERN_RED),
+                    (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+        return (self.animations.pulse_text("SZÜNETELTETVE", 60, 0.1, 2, MODERN_YELLOW),
+                (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+
+    def draw_static(self):
+        """A statikus réteg rajzolása: cím, panelek, feliratok és irányítás."""
+        self.draw_title()
+        self.screen.blit(self.panel_main, (TOP_LEFT_X - 20, TOP_LEFT_Y - 20))
+        self.draw_next_panel()
+        self.draw_score_panels()
+        self.draw_controls()
+
+    def build_base_surface(self, frame=0):
+        """
+        Az alapréteg (háttér + statikus elemek) elkészítése a háttér egy fázisára.
+        
+        Args:
+            frame: A háttér fázisa
+        """
+        if self.base_surface is None:
+            self.base_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        screen, self.screen = self.screen, self.base_surface
+        try:
+            self.draw_background(frame)
+            self.draw_static()
+        finally:
+            self.screen = screen
+        self.base_frame = frame
+
+    def update_board_layer(self, board):
+        """
+        A játéktér réteg újrarajzolása, ha a játéktér változott.
+
+        Args:
+            board: A motor játéktere (Board)
+
+        Returns:
+            bool: True ha a réteg újra lett rajzolva
+        """
+        key = (id(board), board.version)
+        if key == self.board_layer_key:
+            return False
+
+        self.board_layer.fill(BOARD_LAYER_KEY)
+        self.draw_grid_blocks(board.grid, self.board_layer, (0, 0))
+        self.draw_grid_lines(self.board_layer, (0, 0))
+        self.board_layer_key = key
+        return True
+
+    def draw_play_area(self, engine):
+        """
+        A játéktér réteg, a szellem elem és az aktuális elem kirajzolása.
+
+        Args:
+            engine: A játékmotor
+        """
+        self.screen.blit(self.board_layer, (TOP_LEFT_X, TOP_LEFT_Y))
+        if not engine.game_over:
+            ghost_piece = engine.update_ghost_piece()
+            if ghost_piece:
+                self.draw_piece(ghost_piece, ghost=True)
+            self.draw_piece(engine.current_piece)
+
+    def region_keys_for(self, engine, last_score_increase):
+        """
+        A dinamikus területek tartalmát meghatározó kulcsok.
+        Ha egy terület kulcsa nem változott az előző képkocka óta, nem kell újrarajzolni.
+
+        Returns:
+            dict: terület neve -> kulcs
+        """
+        piece = engine.current_piece
+        now = time.time() * 1000
+        animating = now - last_score_increase < 500 or engine.combo > 1
+        return {
+            'play': (self.board_layer_key, piece.shape_index, piece.rotation,
+                     piece.x, piece.y, engine.game_over),
+            'next': engine.next_piece.shape_index,
+            'score': (engine.score, engine.level, engine.lines_cleared, engine.combo,
+                      now if animating else None),
+        }
+
+    def draw_scene(self, engine, last_score_increase):
+        """
+        A teljes játékképernyő kirajzolása (háttér, statikus elemek és a játék állapota).
+
+        Args:
+            engine: A játékmotor
+            last_score_increase: Utolsó pontszám növekedés időpontja (ms)
+        """
+        frame = self.background_frame()
+        if self.base_surface is None or frame != self.base_frame:
+            self.build_base_surface(frame)
+        self.screen.blit(self.base_surface, (0, 0))
+
+        self.draw_play_area(engine)
+        self.draw_next_piece(engine.next_piece)
+        self.draw_score(engine.score, engine.level, engine.lines_cleared,
+                        engine.combo, last_score_increase)
+
+    def render_overlay(self, engine, paused, last_score_increase):
+        """
+        Fedőképernyő (játék vége vagy szünet) kirajzolása.
+
+        A fedőképernyő alatt a játék nem változik, ezért az első képkockát
+        (a sötétítéssel és a statikus feliratokkal együtt) elmentjük, utána
+        képkockánként csak a pulzáló cím területét állítjuk vissza és rajzoljuk újra.
+
+        Args:
+            engine: A játékmotor
+            paused: Szüneteltetve van-e a játék
+            last_score_increase: Utolsó pontszám növekedés időpontja (ms)
+
+        Returns:
+            list: A frissítendő képernyőterületek, vagy None ha az egész képernyő változott
+        """
+        title, (x, y) = self.overlay_title(engine.game_over)
+        key = (engine.game_over, engine.score, self.board_layer_key)
+        if key != self.overlay_key:
+            self.draw_scene(engine, last_score_increase)
+            if engine.game_over:
+                self.draw_game_over(engine.score)
+            else:
+                self.draw_pause()
+            self.overlay_snapshot = self.screen.copy()
+            self.overlay_key = key
+            title.draw(self.screen, x, y, time.time())
+            # A fedőképernyő eltűnése után mindent újra kell rajzolni
+            self.full_redraw = True
+            return None
+
+        rect = title.bounds(x, y)
+        self.screen.blit(self.overlay_snapshot, rect.topleft, rect)
+        title.draw(self.screen, x, y, time.time())
+        return [rect]
+
+    def render(self, engine, paused, last_score_increase):
+        """
+        Egy képkocka kirajzolása a rétegekből.
+
+        Csak a megváltozott területeket állítjuk vissza az alaprétegből és
+        rajzoljuk újra; a teljes képernyő csak érvénytelenítés után és az
+        animált háttér fázisának váltásakor frissül. A fedőképernyőket (szünet, játék vége) a render_overlay rajzolja.
+
+        Args:
+            engine: A játékmotor
+            paused: Szüneteltetve van-e a játék
+            last_score_increase: Utolsó pontszám növekedés időpontja (ms)
+
+        Returns:
+            list: A frissítendő képernyőterületek, vagy None ha az egész képernyő változott
+        """
+        self.update_board_layer(engine.board)
+        if engine.game_over or paused:
+            return self.render_overlay(engine, paused, last_score_increase)
+
+        self.overlay_key = None
+        self.overlay_snapshot = None
+        keys = self.region_keys_for(engine, last_score_increase)
+
+        if self.full_redraw or self.background_frame() != self.base_frame:
+            self.draw_scene(engine, last_score_increase)
+            self.full_redraw = False
+            self.region_keys = keys
+            return None
+
+        dirty = []
+        for name, rect, draw in (
+                ('play', self.play_rect, lambda: self.draw_play_area(engine)),
+                ('next', self.next_rect, lambda: self.draw_next_piece(engine.next_piece)),
+                ('score', self.score_rect, lambda: self.draw_score(
+                    engine.score, engine.level, engine.lines_cleared,
+                    engine.combo, last_score_increase))):
+            if keys[name] != self.region_keys.get(name):
+                self.screen.blit(self.base_surface, rect.topleft, rect)
+                draw()
+                dirty.append(rect)
+
+        self.region_keys = keys
+        return dirty
@@ -0,0 +1,82 @@
+"""
+Zobrist hash a játéktér foglaltságához, és transzpozíciós tábla a
+keresésekhez.
+
+Minden (x, y) cellához egy rögzített, véletlen 64 bites kulcs tartozik; a
+játéktér hash-e a foglalt cellák kulcsainak XOR-ja. Mivel az XOR a saját
+inverze, a hash a változó cellák kulcsaival helyben frissíthető: rögzítéskor
+az elem cellái, sortörléskor a kitörölt és az elmozduló sorok cellái
+számítanak (lásd board.py). A ROW_KEYS[y][maszk] tábla egy sor tetszőleges
+cellahalmazának kulcsát adja meg egyetlen indexeléssel.
+
+A hash csak a foglaltságot fedi le (a színeket nem), így a két háttértáron
+azonos állásnak azonos a hash-e.
+"""
+import random
+
+from config import GRID_WIDTH, GRID_HEIGHT, AI_TRANSPOSITION_SIZE
+from lru import LRUCache
+
+# Rögzített kezdőérték: a hash-ek futásról futásra (és folyamatok között) egyeznek
+ZOBRIST_SEED = 0x7E7215
+KEY_BITS = 64
+
+
+def build_keys(seed=ZOBRIST_SEED):
+    """
+    A cellakulcsok és a soronkénti maszk-táblák előállítása.
+
+    Args:
+        seed: A véletlenszám-generátor kezdőértéke
+
+    Returns:
+        tuple: (cellakulcsok [y][x], sortáblák [y][maszk])
+    """
+    rng = random.Random(seed)
+    cell_keys = [[rng.getrandbits(KEY_BITS) for _ in range(GRID_WIDTH)]
+                 for _ in range(GRID_HEIGHT)]
+    row_keys = []
+    for keys in cell_keys:
+        table = [0] * (1 << GRID_WIDTH)
+        for mask in range(1, 1 << GRID_WIDTH):
+            # A legalsó bit nélküli maszk kulcsa már megvan
+            low = mask & -mask
+            table[mask] = table[mask ^ low] ^ keys[low.bit_length() - 1]
+        row_keys.append(table)
+    return cell_keys, row_keys
+
+
+CELL_KEYS, ROW_KEYS = build_keys()
+
+
+def board_hash(board):
+    """
+    A játéktér hash-e a sorok alapján újraszámolva (ellenőrzéshez; a
+    játéktér a saját hash attribútumát helyben frissíti).
+
+    Args:
+        board: A játéktér
+
+    Returns:
+        int: 64 bites hash
+    """
+    value = 0
+    for y in range(GRID_HEIGHT):
+        value ^= ROW_KEYS[y][board.row_mask(y)]
+    return value
+
+
+class TranspositionTable(LRUCache):
+    """
+    Korlátos méretű tábla a keresés már kiértékelt állásaihoz. A kulcs
+    jellemzően (játéktér hash, alakzat, forgatás, x), az érték tetszőleges.
+    Betelt táblából a legrégebben használt bejegyzés esik ki (LRU), mert egy
+    játékban a friss állások ismétlődnek (az előretekintés lépésről lépésre
+    ugyanazokat az állásokat járja be).
+    """
+    def __init__(self, max_entries=AI_TRANSPOSITION_SIZE):
+        """
+        Args:
+            max_entries: A tárolt bejegyzések legnagyobb száma
+        """
+        super().__init__(max_entries)